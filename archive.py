@@ -0,0 +1,116 @@
+import os
+import glob
+import calendar
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import bundle
+from journal import HISTORY_DIR, history_path
+from storage import read_json
+
+# Puzzles read ahead on either side of the selected day
+PREFETCH_DAYS = 2
+# Loaded puzzles kept in memory; enough for a few screens of browsing back and forth
+KEEP_PUZZLES = 32
+
+_reader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="archive")
+
+
+def month_prefix(year, month):
+    return f"{year:04d}-{month:02d}"
+
+
+def add_months(year, month, months):
+    year, month = divmod(year * 12 + month - 1 + months, 12)
+    return year, month + 1
+
+
+def list_month(game, year, month) -> list[str]:
+    """The dates in a month with a stored puzzle for game, from history/ and installed bundles."""
+    prefix = month_prefix(year, month)
+    dates = {
+        os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(HISTORY_DIR, game, f"{prefix}-*.json"))
+    }
+    for installed in bundle.installed_bundles():
+        dates.update(installed.dates(game, prefix))
+    return sorted(dates)
+
+
+def load_puzzle(game, date) -> dict | None:
+    """A stored puzzle, preferring the history snapshot, which has the moves played on it."""
+    snapshot = read_json(history_path(game, date))
+    if snapshot is not None:
+        return snapshot
+    return bundle.find_puzzle(game, date)
+
+
+class PuzzleArchive:
+    """
+    The stored puzzles of one game, read in the background.
+
+    Month listings and puzzles are Futures, created the first time they're asked for, so a
+    browser can request whatever it's about to show and draw what's ready without waiting.
+    Selecting a day also reads ahead the puzzles either side of it and lists the
+    neighbouring months.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self._lock = threading.Lock()
+        self._months: dict[tuple[int, int], Future] = {}
+        self._puzzles: OrderedDict[str, Future] = OrderedDict()
+
+    def month(self, year, month) -> Future:
+        with self._lock:
+            future = self._months.get((year, month))
+            if future is None:
+                future = self._months[year, month] = _reader.submit(list_month, self.game, year, month)
+            return future
+
+    def puzzle(self, date) -> Future:
+        with self._lock:
+            future = self._puzzles.get(date)
+            if future is None:
+                future = self._puzzles[date] = _reader.submit(load_puzzle, self.game, date)
+                while len(self._puzzles) > KEEP_PUZZLES:
+                    self._puzzles.popitem(last=False)
+            else:
+                self._puzzles.move_to_end(date)
+            return future
+
+    def forget(self, date):
+        """Drop a loaded puzzle, e.g. after it's been played and its snapshot rewritten."""
+        with self._lock:
+            self._puzzles.pop(date, None)
+
+    def ready_dates(self, year, month) -> list[str] | None:
+        """A month's dates if they've been listed, otherwise None (and they're being listed)."""
+        future = self.month(year, month)
+        return future.result() if future.done() and future.exception() is None else None
+
+    def neighbours(self, date) -> list[str]:
+        """Up to PREFETCH_DAYS stored dates on each side of date, among the listed months."""
+        year, month = int(date[:4]), int(date[5:7])
+        dates = []
+        for offset in (-1, 0, 1):
+            dates += self.ready_dates(*add_months(year, month, offset)) or []
+        before = [d for d in dates if d < date][-PREFETCH_DAYS:]
+        after = [d for d in dates if d > date][:PREFETCH_DAYS]
+        return before + after
+
+    def select(self, date) -> Future:
+        """The Future for date's puzzle, with its neighbours and months either side read ahead."""
+        year, month = int(date[:4]), int(date[5:7])
+        for offset in (-1, 1):
+            self.month(*add_months(year, month, offset))
+        selected = self.puzzle(date)
+        for neighbour in self.neighbours(date):
+            self.puzzle(neighbour)
+        return selected
+
+
+def month_weeks(year, month) -> list[list[int]]:
+    """The month's days as weeks from Monday, with 0 for days outside it."""
+    return calendar.Calendar().monthdayscalendar(year, month)
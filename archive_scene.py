@@ -0,0 +1,151 @@
+import curses
+import asyncio
+from datetime import date as Date, timedelta
+
+from archive import PuzzleArchive, add_months, month_weeks
+from puzzle_cache import today
+from utils import Palette, display_cols, display_rows, hide_cursor
+
+WEEKDAYS = "Mo Tu We Th Fr Sa Su"
+CONTROLS = "[h/l] day [j/k] week [p/n] month [enter] play [q]uit"
+
+
+def progress(puzzle):
+    moves = len(puzzle.get("moves", [])) + len(puzzle.get("guesses", []))
+    return f"{moves} move{'' if moves == 1 else 's'} played" if moves else "Not played yet"
+
+
+class ArchiveBrowser:
+    def __init__(self, stdscr, game, color):
+        self.stdscr = stdscr
+        self.game = game
+        self.color = color
+        self.archive = PuzzleArchive(game)
+        # Today is played from the menu, where its moves go to the daily journal
+        self.last = Date.fromisoformat(today()) - timedelta(days=1)
+        self.selected = self.last
+        self._watched = set()
+        # Cleared while a puzzle is being played and once the browser closes
+        self.active = True
+
+    def move(self, days=0, months=0):
+        if months:
+            year, month = add_months(self.selected.year, self.selected.month, months)
+            day = min(self.selected.day, max(d for week in month_weeks(year, month) for d in week))
+            selected = Date(year, month, day)
+        else:
+            selected = self.selected + timedelta(days=days)
+        self.selected = min(selected, self.last)
+
+    def watch(self, future):
+        # Redraw once a background read this screen is showing finishes
+        if not future.done() and future not in self._watched:
+            self._watched.add(future)
+            asyncio.wrap_future(future).add_done_callback(lambda _: self.finished(future))
+
+    def finished(self, future):
+        self._watched.discard(future)
+        if self.active:
+            self.draw()
+
+    def status(self):
+        dates = self.archive.ready_dates(self.selected.year, self.selected.month)
+        if dates is None:
+            self.watch(self.archive.month(self.selected.year, self.selected.month))
+            return "Listing...", Palette.gray()
+        date = self.selected.isoformat()
+        if date not in dates:
+            return "No puzzle stored", Palette.gray()
+        future = self.archive.select(date)
+        if not future.done():
+            self.watch(future)
+            return "Loading...", Palette.gray()
+        if future.exception() is not None or future.result() is None:
+            return "Couldn't read this puzzle", Palette.red()
+        return progress(future.result()), Palette.white()
+
+    def draw(self):
+        stdscr = self.stdscr
+        year, month = self.selected.year, self.selected.month
+        weeks = month_weeks(year, month)
+        last = self.last.isoformat()
+        dates = {date for date in self.archive.ready_dates(year, month) or [] if date <= last}
+        status, status_color = self.status()
+
+        width = max(len(CONTROLS), len(WEEKDAYS))
+        region = stdscr.layout.centered(len(weeks) + 8, width)
+        rows, cols = display_rows(stdscr), display_cols(stdscr)
+        stdscr.clear()
+
+        def line(y, text, attr, x=None):
+            x = region.x + (width - len(text)) // 2 if x is None else x
+            if region.y + y < rows and x < cols - 1:
+                stdscr.addstr(region.y + y, x, text[:cols - x - 1], attr)
+
+        line(0, f"{self.game.upper()} ARCHIVE", self.color | curses.A_BOLD)
+        line(2, self.selected.strftime("%B %Y"), Palette.white())
+        left = region.x + (width - len(WEEKDAYS)) // 2
+        line(3, WEEKDAYS, Palette.gray(), left)
+        for i, week in enumerate(weeks):
+            for j, day in enumerate(week):
+                if not day:
+                    continue
+                date = f"{year:04d}-{month:02d}-{day:02d}"
+                attr = Palette.white() | curses.A_BOLD if date in dates else Palette.gray()
+                if day == self.selected.day:
+                    attr |= curses.A_REVERSE
+                line(4 + i, f"{day:2d}", attr, left + 3 * j)
+        line(len(weeks) + 5, status, status_color)
+        line(len(weeks) + 7, CONTROLS, Palette.gray())
+        stdscr.refresh()
+
+    async def open_selected(self):
+        """The selected day's puzzle, waiting for it if it's still being read, or None."""
+        date = self.selected.isoformat()
+        if date not in (self.archive.ready_dates(self.selected.year, self.selected.month) or []):
+            return None
+        try:
+            return await asyncio.wrap_future(self.archive.select(date))
+        except Exception:
+            return None
+
+
+async def archive_scene(stdscr, game, play, color=0):
+    """Browse the stored puzzles of game by month and play one with play(stdscr, archived=puzzle)."""
+    hide_cursor()
+    browser = ArchiveBrowser(stdscr, game, color)
+    browser.draw()
+    while True:
+        key = await stdscr.read_key()
+        if key == curses.KEY_RESIZE:
+            pass
+        elif key in (curses.KEY_LEFT, ord('h')):
+            browser.move(days=-1)
+        elif key in (curses.KEY_RIGHT, ord('l')):
+            browser.move(days=1)
+        elif key in (curses.KEY_UP, ord('k')):
+            browser.move(days=-7)
+        elif key in (curses.KEY_DOWN, ord('j')):
+            browser.move(days=7)
+        elif key in (curses.KEY_PPAGE, ord('p')):
+            browser.move(months=-1)
+        elif key in (curses.KEY_NPAGE, ord('n')):
+            browser.move(months=1)
+        elif key == curses.KEY_ENTER or key in [10, 13]:
+            puzzle = await browser.open_selected()
+            if puzzle is None:
+                continue
+            stdscr.clear()
+            stdscr.refresh()
+            browser.active = False
+            await play(stdscr, archived=puzzle)
+            browser.archive.forget(puzzle["date"])
+            browser.active = True
+            hide_cursor()
+        elif key == ord('q'):
+            browser.active = False
+            stdscr.clear()
+            break
+        else:
+            continue
+        browser.draw()
@@ -0,0 +1,236 @@
+import os
+import sys
+import glob
+import json
+import mmap
+import zlib
+import shutil
+import struct
+import argparse
+import tempfile
+import threading
+
+from journal import HISTORY_DIR
+
+BUNDLE_DIR = os.path.expanduser("~/.wordgames/bundles")
+CACHE_DIR = os.path.expanduser("~/.wordgames")
+GAMES = ("wordle", "connections", "mini", "spellingbee")
+
+# A bundle is a header, a fixed-size index sorted by (game, date), then one zlib-compressed
+# JSON record per puzzle. The index is read in place through mmap, so finding a puzzle is a
+# binary search over it and loading one decompresses only that record.
+MAGIC = b"WGBUNDLE"
+VERSION = 1
+HEADER = struct.Struct("<8sHHI")  # magic, version, index entry size, entry count
+ENTRY = struct.Struct("<16s10s6xQI4x")  # game, date, record offset, record length
+GAME_BYTES = 16
+
+# What a freshly fetched puzzle has in place of the player's progress
+FRESH_PROGRESS = {"guesses": [], "is_finished": False}
+
+_open_bundles = {}
+_open_lock = threading.Lock()
+
+
+def puzzle_record(snapshot: dict) -> dict:
+    """A cached or archived puzzle without the player's moves and progress."""
+    record = {key: value for key, value in snapshot.items() if key not in ("moves", "fetched_at")}
+    for key, fresh in FRESH_PROGRESS.items():
+        if key in record:
+            record[key] = fresh
+    return record
+
+
+def _key(game: str, date: str) -> tuple[bytes, bytes]:
+    return game.encode().ljust(GAME_BYTES, b"\0"), date.encode()
+
+
+def write_bundle(path: str, puzzles: dict[tuple[str, str], dict]):
+    """Write puzzles, keyed by (game, date), to a bundle at path."""
+    entries = sorted(puzzles)
+    records = [zlib.compress(json.dumps(puzzles[key], separators=(",", ":")).encode(), 9) for key in entries]
+    offset = HEADER.size + ENTRY.size * len(entries)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, ENTRY.size, len(entries)))
+        for (game, date), record in zip(entries, records):
+            f.write(ENTRY.pack(*_key(game, date), offset, len(record)))
+            offset += len(record)
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+
+
+class Bundle:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._map[:HEADER.size]
+        magic, version, entry_size, self.count = HEADER.unpack(header) if len(header) == HEADER.size else (b"", 0, 0, 0)
+        if magic != MAGIC or version != VERSION or entry_size != ENTRY.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} puzzle bundle")
+        # A truncated or damaged file must fail here, not as a struct.error in a later lookup
+        records_start = HEADER.size + self.count * ENTRY.size
+        if len(self._map) < records_start or any(
+            offset < records_start or offset + length > len(self._map)
+            for _, _, offset, length in (self._entry(index) for index in range(self.count))
+        ):
+            self._map.close()
+            raise ValueError(f"{path} is truncated or damaged")
+
+    def _entry(self, index: int):
+        return ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+
+    def __iter__(self):
+        """(game, date) of every puzzle, in index order."""
+        for index in range(self.count):
+            game, date, _, _ = self._entry(index)
+            yield game.rstrip(b"\0").decode(), date.decode()
+
+    def _bisect(self, key: tuple[bytes, bytes]) -> int:
+        """Index of the first entry not before key."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[:2] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def dates(self, game: str, prefix: str = "") -> list[str]:
+        """The dates of game's puzzles starting with prefix, e.g. "2025-01" for a month."""
+        game_key, prefix_key = _key(game, prefix)
+        dates = []
+        for index in range(self._bisect((game_key, prefix_key)), self.count):
+            entry_game, entry_date, _, _ = self._entry(index)
+            if entry_game != game_key or not entry_date.startswith(prefix_key):
+                break
+            dates.append(entry_date.decode())
+        return dates
+
+    def get(self, game: str, date: str) -> dict | None:
+        key = _key(game, date)
+        lo = self._bisect(key)
+        if lo == self.count:
+            return None
+        entry_game, entry_date, offset, length = self._entry(lo)
+        if (entry_game, entry_date) != key:
+            return None
+        return json.loads(zlib.decompress(self._map[offset:offset + length]))
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _installed_bundle(path: str) -> Bundle:
+    mtime = os.path.getmtime(path)
+    with _open_lock:
+        opened = _open_bundles.get(path)
+        if opened is None or opened[0] != mtime:
+            if opened is not None:
+                # Reinstalled: unmap the old copy (a read still using it sees a ValueError and skips it)
+                _open_bundles.pop(path)[1].close()
+            opened = (mtime, Bundle(path))
+            _open_bundles[path] = opened
+        return opened[1]
+
+
+def _close_removed(paths):
+    with _open_lock:
+        for path in set(_open_bundles) - set(paths):
+            _open_bundles.pop(path)[1].close()
+
+
+def installed_bundles() -> list[Bundle]:
+    """The readable bundles in BUNDLE_DIR, newest first."""
+    bundles = []
+    paths = glob.glob(os.path.join(BUNDLE_DIR, "*.wgb"))
+    _close_removed(paths)
+    for path in sorted(paths, key=os.path.getmtime, reverse=True):
+        try:
+            bundles.append(_installed_bundle(path))
+        except (OSError, ValueError):
+            continue
+    return bundles
+
+
+def find_puzzle(game: str, date: str) -> dict | None:
+    """The puzzle for game on date from the installed bundles, newest bundle first."""
+    for installed in installed_bundles():
+        try:
+            puzzle = installed.get(game, date)
+        except (ValueError, zlib.error):
+            continue
+        if puzzle is not None:
+            return puzzle
+    return None
+
+
+def collect_puzzles(games=GAMES) -> dict[tuple[str, str], dict]:
+    """Every archived and cached puzzle of games in ~/.wordgames, keyed by (game, date)."""
+    from storage import read_json
+    puzzles = {}
+    for game in games:
+        for path in glob.glob(os.path.join(HISTORY_DIR, game, "*.json")) + [os.path.join(CACHE_DIR, f"{game}.json")]:
+            snapshot = read_json(path)
+            if snapshot and snapshot.get("date"):
+                puzzles[game, snapshot["date"]] = puzzle_record(snapshot)
+    return puzzles
+
+
+def install(path: str) -> str:
+    """Copy a bundle into BUNDLE_DIR, where the puzzle loaders look for it."""
+    with Bundle(path):
+        pass
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    destination = os.path.join(BUNDLE_DIR, os.path.basename(path))
+    # Running games have the installed copy mapped, so swap in a new file rather than overwrite it
+    fd, tmp_path = tempfile.mkstemp(dir=BUNDLE_DIR, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return destination
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and import offline bundles of daily puzzles.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Bundle every archived and cached puzzle")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--games", nargs="+", choices=GAMES, default=GAMES)
+    import_parser = commands.add_parser("import", help="Install a bundle for the games to load from")
+    import_parser.add_argument("path")
+    list_parser = commands.add_parser("list", help="Show what a bundle holds")
+    list_parser.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        puzzles = collect_puzzles(args.games)
+        write_bundle(args.path, puzzles)
+        print(f"Wrote {len(puzzles)} puzzles to {args.path} ({os.path.getsize(args.path) / 1024:.1f} KiB)")
+    elif args.command == "import":
+        print(f"Installed {install(args.path)}")
+    else:
+        try:
+            bundle = Bundle(args.path)
+        except ValueError as e:
+            sys.exit(str(e))
+        with bundle:
+            dates = {}
+            for game, date in bundle:
+                dates.setdefault(game, []).append(date)
+            for game, game_dates in dates.items():
+                print(f"{game:<12} {len(game_dates):>5} days  {game_dates[0]} to {game_dates[-1]}")
@@ -0,0 +1,79 @@
+import curses
+from typing import Callable
+
+from layout import Layout, Region
+
+
+class Compositor:
+    """
+    A scene's screen split into named regions, each a sub-window drawn on its own.
+
+    Drawing into a region only marks it for the next frame. show() copies the marked
+    regions to the virtual screen with noutrefresh and sends the changes to the terminal
+    with a single doupdate, so e.g. a timer tick touches the timer's region and nothing
+    else. The sub-windows are made once per screen size, with the layout's other regions.
+    """
+
+    def __init__(self, stdscr, key, regions: Callable[[Layout], dict[str, Region]]):
+        self.stdscr = stdscr
+        self.key = key
+        self.regions = regions
+        self.dirty = set()
+        self.cleared = False
+
+    def _make_windows(self, layout):
+        windows = {}
+        for name, region in self.regions(layout).items():
+            height = min(region.height, layout.rows - region.y)
+            width = min(region.width, layout.cols - region.x)
+            # Regions that fall off a small screen are left out rather than drawn partly
+            if height > 0 and width > 0 and region.y >= 0 and region.x >= 0:
+                windows[name] = self.stdscr.derwin(height, width, region.y, region.x)
+        return windows
+
+    def windows(self) -> dict:
+        return self.stdscr.layout.region(("windows", self.key), self._make_windows)
+
+    def region(self, name) -> Region:
+        return self.regions(self.stdscr.layout)[name]
+
+    def addstr(self, name, y, x, text, attr=0):
+        """Write text at y, x in region name, clipped to the region."""
+        window = self.windows().get(name)
+        if window is None:
+            return
+        height, width = window.getmaxyx()
+        if not (0 <= y < height and 0 <= x < width):
+            return
+        text = text[:width - x]
+        self.dirty.add(name)
+        if y == height - 1 and x + len(text) == width:
+            # curses can't move the cursor past a window's last cell, so insert that one
+            window.addstr(y, x, text[:-1], attr)
+            window.insstr(y, width - 1, text[-1], attr)
+        else:
+            window.addstr(y, x, text, attr)
+
+    def erase(self, name):
+        window = self.windows().get(name)
+        if window is not None:
+            window.erase()
+            self.dirty.add(name)
+
+    def clear(self):
+        """Blank the whole screen; the next show repaints it."""
+        self.stdscr.clear()
+        self.dirty.clear()
+        self.cleared = True
+
+    def show(self):
+        """Put every region drawn since the last frame on the terminal with one doupdate."""
+        windows = self.windows()
+        if self.cleared:
+            self.stdscr.noutrefresh()
+            self.cleared = False
+        for name in self.dirty:
+            if name in windows:
+                windows[name].noutrefresh()
+        self.dirty.clear()
+        self.stdscr.doupdate()
@@ -0,0 +1,57 @@
+import os
+import json
+
+CONFIG_FILE = os.path.expanduser("~/.wordgames/config.json")
+
+DEFAULTS = {
+    # Origin to fetch puzzle pages from instead of the production sites,
+    # e.g. the fixture server started by `python fixture_server.py`.
+    "provider_url": None,
+    # Wordle guesses must use every hint revealed so far.
+    "wordle_hard_mode": False,
+    # Headless Chrome scrapes skip images, media and fonts, and only resolve these hosts
+    # (and their subdomains); everything else on the page is never requested.
+    "scrape_block_resources": True,
+    "scrape_allowed_hosts": ["nytimes.com", "nyt.com"],
+    # Never start Chrome: pages come over plain HTTP, else from the cache and bundles.
+    # Redraws are throttled and loading animations skipped. None turns it on under Termux.
+    "low_power": None,
+}
+
+_config = None
+
+
+def load_config():
+    global _config
+    if _config is None:
+        _config = dict(DEFAULTS)
+        try:
+            with open(CONFIG_FILE, "r") as f:
+                _config.update(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+    return _config
+
+
+def get(key):
+    """Look up a setting: WORDGAMES_<KEY> in the environment, then config.json, then DEFAULTS."""
+    value = os.environ.get(f"WORDGAMES_{key.upper()}")
+    if value is not None:
+        return value
+    return load_config().get(key)
+
+
+def get_flag(key):
+    """A boolean setting; environment values like 1/true/yes turn it on."""
+    value = get(key)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def get_list(key):
+    """A list setting; environment values are comma-separated."""
+    value = get(key)
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value or [])
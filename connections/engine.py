@@ -0,0 +1,136 @@
+import random
+from enum import StrEnum
+from itertools import combinations
+
+
+class Guess(StrEnum):
+    CORRECT = "correct"
+    ONE_AWAY = "one away"
+    WRONG = "wrong"
+    REPEATED = "repeated"
+    INCOMPLETE = "incomplete"
+
+
+def lowest_bit(mask: int) -> int:
+    """Index of the lowest set bit of mask."""
+    return (mask & -mask).bit_length() - 1
+
+
+class Board:
+    """
+    A Connections board as bitmasks: bit i stands for word i of the puzzle.
+
+    Selections, categories, solved words and past guesses are all masks, so scoring a
+    guess, "one away" feedback and hints are set lookups and bitwise operations.
+    """
+
+    GROUP_SIZE = 4
+
+    def __init__(self, word_categories: list[int]):
+        # word_categories[i] is the category of word i, easiest first
+        self.size = len(word_categories)
+        self.full = (1 << self.size) - 1
+        self.category_masks = [0] * (max(word_categories) + 1)
+        for i, category in enumerate(word_categories):
+            self.category_masks[category] |= 1 << i
+        self.categories = set(self.category_masks)
+        # Every group of four that shares exactly three words with a category
+        self.one_away = set()
+        for category_mask in self.category_masks:
+            members = [1 << i for i in range(self.size) if category_mask >> i & 1]
+            others = [1 << i for i in range(self.size) if not category_mask >> i & 1]
+            for three in combinations(members, self.GROUP_SIZE - 1):
+                for other in others:
+                    self.one_away.add(sum(three) | other)
+        self.reset()
+
+    def reset(self):
+        """Start the same puzzle over; the category tables are kept."""
+        self.selected = 0
+        self.solved = 0
+        self.hinted = 0
+        self.guesses: set[int] = set()
+
+    @property
+    def unsolved(self) -> int:
+        return self.full & ~self.solved
+
+    @property
+    def is_won(self) -> bool:
+        return self.solved == self.full
+
+    def is_selected(self, i: int) -> bool:
+        return bool(self.selected >> i & 1)
+
+    def is_solved(self, i: int) -> bool:
+        return bool(self.solved >> i & 1)
+
+    def toggle(self, i: int):
+        bit = 1 << i
+        if self.selected & bit or self.selected.bit_count() < self.GROUP_SIZE:
+            self.selected ^= bit
+
+    def select(self, indices):
+        self.selected = 0
+        for i in indices:
+            self.selected |= 1 << i
+
+    def guess(self) -> Guess:
+        mask = self.selected
+        if mask in self.guesses:
+            return Guess.REPEATED
+        if mask.bit_count() != self.GROUP_SIZE:
+            return Guess.INCOMPLETE
+        self.guesses.add(mask)
+        self.selected = 0
+        if mask in self.categories:
+            self.solved |= mask
+            return Guess.CORRECT
+        return Guess.ONE_AWAY if mask in self.one_away else Guess.WRONG
+
+    def solve_all(self):
+        self.solved = self.full
+        self.selected = 0
+
+    def hint(self) -> int:
+        """A word from the easiest unsolved category, preferring ones not hinted yet; -1 if solved."""
+        for category_mask in self.category_masks:
+            remaining = category_mask & self.unsolved
+            if remaining:
+                word = lowest_bit(remaining & ~self.hinted or remaining)
+                self.hinted |= 1 << word
+                return word
+        return -1
+
+
+def random_strategy(board: Board, rng: random.Random) -> list[int]:
+    """Guess four random unsolved words."""
+    unsolved = [i for i in range(board.size) if not board.solved >> i & 1]
+    return rng.sample(unsolved, Board.GROUP_SIZE)
+
+
+def simulate(word_categories: list[int], games=1000, strategy=random_strategy, max_mistakes=4, seed=None) -> dict:
+    """Play games with strategy and report how often it wins and how many mistakes it makes."""
+    rng = random.Random(seed)
+    wins = 0
+    mistakes_made = 0
+    one_aways = 0
+    board = Board(word_categories)
+    for _ in range(games):
+        board.reset()
+        mistakes = 0
+        while mistakes < max_mistakes and not board.is_won:
+            board.select(strategy(board, rng))
+            result = board.guess()
+            if result == Guess.ONE_AWAY:
+                one_aways += 1
+            if result in (Guess.ONE_AWAY, Guess.WRONG):
+                mistakes += 1
+        wins += board.is_won
+        mistakes_made += mistakes
+    return {
+        "games": games,
+        "win_rate": wins / games,
+        "mean_mistakes": mistakes_made / games,
+        "one_aways": one_aways,
+    }
@@ -0,0 +1,106 @@
+import os
+import argparse
+from collections import Counter
+
+import journal
+from storage import read_json, write_json, file_lock
+
+INDEX_FILE = os.path.expanduser("~/.wordgames/connections_index.json")
+GAME = "connections"
+
+
+class WordIndex:
+    """
+    Inverted index from each word to the past Connections puzzles and categories it appeared in.
+
+    Stored in INDEX_FILE as {"dates": [...], "words": {word: [[date, color, category], ...]}}.
+    Archived puzzles are added as they're compacted into history/, and load() picks up any
+    history files the index hasn't seen, so the archive is never rescanned in full.
+    """
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.dates: set[str] = set(data.get("dates", []))
+        self.words: dict[str, list[list[str]]] = data.get("words", {})
+
+    @classmethod
+    def load(cls, filename=INDEX_FILE):
+        with file_lock(filename):
+            index = cls(read_json(filename))
+            if index.catch_up():
+                index.save(filename)
+        return index
+
+    def save(self, filename=INDEX_FILE):
+        write_json(filename, {"dates": sorted(self.dates), "words": self.words}, indent=None)
+
+    def add_puzzle(self, puzzle) -> bool:
+        date = puzzle.get("date")
+        if date is None or date in self.dates:
+            return False
+        for color, words in puzzle["words"].items():
+            category = puzzle["categories"][color]
+            for word in words:
+                self.words.setdefault(word.lower(), []).append([date, color, category])
+        self.dates.add(date)
+        return True
+
+    def catch_up(self) -> bool:
+        """Add archived puzzles missing from the index; True if any were added."""
+        history_dir = os.path.join(journal.HISTORY_DIR, GAME)
+        try:
+            filenames = os.listdir(history_dir)
+        except FileNotFoundError:
+            return False
+        added = False
+        for filename in sorted(filenames):
+            date, ext = os.path.splitext(filename)
+            if ext != ".json" or date in self.dates:
+                continue
+            puzzle = read_json(os.path.join(history_dir, filename))
+            if puzzle is not None and "words" in puzzle:
+                added |= self.add_puzzle(puzzle)
+        return added
+
+    def lookup(self, word, before=None) -> list[list[str]]:
+        """Past appearances of word as [date, color, category], oldest first, optionally only before a date."""
+        appearances = self.words.get(word.lower(), [])
+        if before is not None:
+            appearances = [a for a in appearances if a[0] < before]
+        return sorted(appearances)
+
+    def red_herrings(self, min_categories=2) -> list[tuple[str, int, Counter]]:
+        """
+        Words that have been used in at least min_categories differently named categories,
+        most reused first, as (word, appearances, Counter of category names).
+        """
+        stats = []
+        for word, appearances in self.words.items():
+            categories = Counter(category.lower() for _, _, category in appearances)
+            if len(categories) >= min_categories:
+                stats.append((word, len(appearances), categories))
+        return sorted(stats, key=lambda s: (-len(s[2]), -s[1], s[0]))
+
+
+@journal.on_archive(GAME)
+def index_archived_puzzle(snapshot):
+    with file_lock(INDEX_FILE):
+        index = WordIndex(read_json(INDEX_FILE))
+        if index.add_puzzle(snapshot):
+            index.save()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show words reused across archived Connections puzzles.")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--word", help="List the past puzzles for one word")
+    args = parser.parse_args()
+
+    index = WordIndex.load()
+    print(f"{len(index.dates)} puzzles, {len(index.words)} words indexed")
+    if args.word:
+        for date, color, category in index.lookup(args.word):
+            print(f"{date}  {color:<6}  {category}")
+    else:
+        for word, count, categories in index.red_herrings()[:args.top]:
+            print(f"{word.upper():<12} {count:>3}  " + ", ".join(f"{name} ({n})" for name, n in categories.most_common()))
@@ -1,14 +1,21 @@
 import curses.ascii
-import os
-import json
 import curses
-import threading
 from random import randint
-from datetime import datetime
-from textwrap import TextWrapper, wrap
 
-from utils import Palette, justify, display_cols, display_rows, vertical_buffer, horizontal_buffer
-from connections.scrape import PUZZLE_FILE, fetch_latest_connections_puzzle
+import stats
+from layout import Region
+from compositor import Compositor
+from utils import Palette, justify, wrap, hide_cursor
+from loading_scene import loading_waiter
+from journal import ArchiveJournal, MoveJournal
+from puzzle_cache import PUZZLE_CACHE
+from connections.scrape import PUZZLE_FILE, get_latest_connections_puzzle
+from connections.engine import Board, Guess
+from connections.index import WordIndex
+
+# The board is centred and kept narrow enough to read on wide terminals
+MAX_WIDTH = 80
+
 
 class CategoryColor:
     def __init__(self, name, value):
@@ -45,22 +52,21 @@ class Category:
     
 
 class Word:
-    def __init__(self, word, category, is_selected=False):
+    def __init__(self, word, category):
         self.word = word
         self.category = category
-        self.is_selected = is_selected
         self.flag: chr = None
+        # Set by ConnectionsGame: this word's bit on the board
+        self.board: Board = None
+        self.index: int = None
 
     @property
-    def is_solved(self):
-        return self.category.is_solved
+    def is_selected(self):
+        return self.board.is_selected(self.index)
 
-    def selected(self, value=None):
-        return Word(
-            self.word,
-            self.category,
-            value if value is not None else not self.is_selected
-        )
+    @property
+    def is_solved(self):
+        return self.board.is_solved(self.index)
     
     def format(self, is_cursor=False, max_width=70):
         if self.is_solved:
@@ -74,8 +80,7 @@ class Word:
         else:
             prefix = "  "
         
-        w = TextWrapper(width=max_width)
-        text = w.fill(prefix + self.word.upper())
+        text = "\n".join(wrap(prefix + self.word.upper(), max_width))
         return text
 
     def solved_color(self):
@@ -97,81 +102,102 @@ class Word:
 
 
 class ConnectionsGame:
-    def __init__(self, words, categories, stdscr):
+    def __init__(self, words, categories, stdscr, index: WordIndex = None, date: str = None):
         self.words: list[Word] = words
         self.categories: list[Category] = categories
-        self.guesses: list[set[str]] = []
+        self.board = Board([w.category.color.value for w in words])
+        for i, word in enumerate(words):
+            word.board, word.index = self.board, i
         self.mistakes_remaining = 4
         self.cursor = 0
         self.order_seed = randint(4, 100)
         self.message = "Welcome to Connections!"
         self.stdscr = stdscr
+        self.screen = Compositor(stdscr, ("connections", len(words)), self.regions)
+        self.shown_history = None
+        self.index = index
+        self.date = date
+        self.records_stats = True
     
+    @property
+    def guesses(self) -> set[int]:
+        return self.board.guesses
+
     def selected_words(self):
         return [word for word in self.words if word.is_selected]
-    
-    def score_guess(self):
-        categories = [w.category for w in self.selected_words()]
-        return max(categories.count(c) for c in categories)
+
+    @property
+    def first_unsolved(self):
+        # sort() keeps solved words at the top
+        return self.board.solved.bit_count()
 
     def up(self):
-        unsolved = [i for i in range(len(self.words)) if not self.words[i].is_solved]
-        if unsolved:
-            self.cursor = max(
-                0,
-                self.cursor - 1,
-                min(unsolved)
-            )
+        if self.board.unsolved:
+            self.cursor = max(0, self.cursor - 1, self.first_unsolved)
 
     def down(self):
-        unsolved = [i for i in range(len(self.words)) if not self.words[i].is_solved]
-        if unsolved:
-            self.cursor = max(
-                min(
-                    self.cursor + 1,
-                    len(self.words) - 1
-                ),
-                min(unsolved),
-            )
+        if self.board.unsolved:
+            self.cursor = max(min(self.cursor + 1, len(self.words) - 1), self.first_unsolved)
 
     def select(self):
-        if self.words[self.cursor].is_selected or len(self.selected_words()) < 4:
-            self.words[self.cursor] = self.words[self.cursor].selected()
+        self.board.toggle(self.words[self.cursor].index)
+
+    def select_words(self, words):
+        self.board.select(w.index for w in self.words if w.word in words)
+
+    def clear_selection(self):
+        self.board.selected = 0
+
+    def solve_all(self):
+        self.board.solve_all()
+        self.update_categories()
+        self.sort()
+
+    def update_categories(self):
+        for c in self.categories:
+            c.is_solved = not self.board.category_masks[c.color.value] & self.board.unsolved
+
+    def hint(self):
+        index = self.board.hint()
+        if index < 0:
+            return
+        word = next(w for w in self.words if w.index == index)
+        self.message = "Hint: {} is in the easiest group left.".format(word.word.upper())
     
     def guess(self):
-        guess = set(w.word for w in self.selected_words())
-        if guess in self.guesses:
+        result = self.board.guess()
+        if result == Guess.REPEATED:
             self.message = "Already guessed."
             return
-        if len(self.selected_words()) == 4:
-            score = self.score_guess()
-            if score == 4:
-                self.selected_words()[0].category.solved()
-                self.sort()
-            self.words = [w.selected(False) for w in self.words]
-            self.guesses.append(guess)
-        else:
+        if result == Guess.INCOMPLETE:
             self.message = "Select 4 words to guess."
             return
+        if result == Guess.CORRECT:
+            self.update_categories()
+            self.sort()
         
-        if all(w.is_solved for w in self.words):
+        if self.board.is_won:
             self.message = "You win!"
+            self.record_result(True)
             self.update_display()
         elif self.mistakes_remaining == 0:
-            for c in self.categories:
-                c.solved()
             self.message = "Out of guesses!"
-            self.sort()
+            self.record_result(False)
+            self.solve_all()
             self.update_display()
-        elif score == 4:
+        elif result == Guess.CORRECT:
             self.message = "Correct! Mistakes remaining: {}".format(self.mistakes_remaining)
-        elif score == 3:
+        elif result == Guess.ONE_AWAY:
             self.mistakes_remaining -= 1
             self.message = "One away! Mistakes remaining: {}".format(self.mistakes_remaining)
         else:
             self.mistakes_remaining -= 1
             self.message = "Incorrect. Mistakes remaining: {}".format(self.mistakes_remaining)
 
+    def record_result(self, won):
+        if self.date is not None and self.records_stats:
+            stats.record_connections(self.date, won, 4 - self.mistakes_remaining)
+
     def shuffle(self):
         self.order_seed = randint(4, 100)
         self.sort()
@@ -189,29 +215,41 @@ class ConnectionsGame:
             next((i for i, word in enumerate(self.words) if not word.is_solved), 0)
         )
 
+    def _region(self, layout):
+        # One row per word, then the history line, the message and up to two rows of controls
+        return layout.centered(len(self.words) + 5, min(layout.cols - 1, MAX_WIDTH))
+
     @property
-    def display_rows(self):
-        return display_rows(self.stdscr)
-    
-    @property
-    def display_cols(self):
-        return display_cols(self.stdscr)
+    def region(self):
+        return self._region(self.stdscr.layout)
+
+    def regions(self, layout):
+        region = self._region(layout)
+        rows = len(self.words)
+        return {
+            # A word's description and text can run one past the region's even width
+            "board": Region(region.y + 1, region.x, rows, region.width + 1),
+            "history": Region(region.y + rows + 1, region.x, 1, region.width),
+            "message": Region(region.y + rows + 2, region.x, 1, region.width),
+            "controls": Region(region.y + rows + 3, region.x, 2, region.width),
+        }
 
     def update_display(self, full_update=True):
 
-        column_width = self.display_cols // 2
-        vertical_padding = (self.display_rows - (len(self.words) + 5)) // 2
+        region = self.region
+        column_width = region.width // 2
         description_column = [""] * len(self.words)
         if full_update:
             for i in range(4):
                 index = i * 4
                 category = self.words[index].category
                 if category.is_solved:
-                    wrapped = wrap(text=category.description, width=column_width)
+                    wrapped = wrap(category.description, column_width)
                     for j in range(min(len(wrapped), 4)):
                         description_column[i*4+j] = wrapped[j]
         if full_update:
-            self.stdscr.clear()
+            self.screen.clear()
+            self.shown_history = None
 
         start_index = 0 if full_update else max(0, self.cursor - 1)
         end_index = len(self.words) if full_update else min(len(self.words), self.cursor + 2)
@@ -231,33 +269,31 @@ class ConnectionsGame:
                 is_cursor=is_cursor,
                 max_width=column_width
             ).upper()
-            self.stdscr.addstr(
-                i + 1 + vertical_padding,
+            self.screen.addstr(
+                "board",
+                i,
                 0,
                 formatted_desc,
                 (solved_color_pair or Palette.white())
             )
-            self.stdscr.addstr(
-                i + 1 + vertical_padding,
+            self.screen.addstr(
+                "board",
+                i,
                 len(formatted_desc),
                 formatted_word,
                 (solved_color_pair or unsolved_color_pair) | word.attributes()
             )
         
         if full_update:
-            self.stdscr.addstr(
-                len(self.words) + 2 + vertical_padding,
-                0,
-                justify(self.message, block=column_width*2, width=column_width*2, justify="center"),
-                Palette.white()
-            )
+            self.draw_message()
 
-            controls1 = "[k]up [j]down [s]elect"
+            controls1 = "[k]up [j]down [s]elect [h]int"
             controls2 = "[g]uess [r]eshuffle [q]uit"
             # controls3 = "[f]lag [c]lear"
-            is_control_message_split = len(controls1) + len(controls2) > self.display_cols - 2
-            self.stdscr.addstr(
-                len(self.words) + 3 + vertical_padding,
+            is_control_message_split = len(controls1) + len(controls2) > region.width - 2
+            self.screen.addstr(
+                "controls",
+                0,
                 0,
                 justify(
                     controls1 if is_control_message_split else "{} {}".format(controls1, controls2),
@@ -268,8 +304,9 @@ class ConnectionsGame:
                 Palette.gray()
             )
             if is_control_message_split:
-                self.stdscr.addstr(
-                    len(self.words) + 4 + vertical_padding,
+                self.screen.addstr(
+                    "controls",
+                    1,
                     0,
                     justify(
                         controls2,
@@ -279,19 +316,65 @@ class ConnectionsGame:
                     ),
                     Palette.gray()
                 )
-        
-        self.stdscr.refresh()
 
+        self.draw_history()
+        self.screen.show()
+
+    def draw_message(self):
+        column_width = self.region.width // 2
+        self.screen.addstr(
+            "message",
+            0,
+            0,
+            justify(self.message, block=column_width*2, width=column_width*2, justify="center"),
+            Palette.white()
+        )
 
-def connections_controller(words, categories, stdscr):
-    state = ConnectionsGame(words, categories, stdscr)
+    def draw_history(self):
+        """Where the word under the cursor appeared in past puzzles."""
+        if self.index is None:
+            return
+        word = self.words[self.cursor]
+        appearances = self.index.lookup(word.word, before=self.date)
+        text = ""
+        if appearances and not word.is_solved:
+            date, _, category = appearances[-1]
+            text = "Seen before in {}: {}".format(date, category)
+            if len(appearances) > 1:
+                text += " (+{} more)".format(len(appearances) - 1)
+        width = (self.region.width // 2) * 2
+        if text != self.shown_history:
+            self.screen.addstr(
+                "history",
+                0,
+                0,
+                justify(text[:width], block=width, width=width, justify="center"),
+                Palette.gray()
+            )
+            self.shown_history = text
+
+    def show_message(self, message):
+        self.message = message
+        self.draw_message()
+        self.screen.show()
+
+
+async def connections_controller(words, categories, stdscr, journal, index=None):
+    state = ConnectionsGame(words, categories, stdscr, index, journal.date)
+    state.records_stats = journal.records_stats
     state.sort()
+    for move in journal.replay():
+        if move["type"] == "guess":
+            state.select_words(move["words"])
+            state.guess()
     state.update_display(full_update=True)
     try:
         while True:
-            key = stdscr.getch()
+            key = await stdscr.read_key()
 
-            if key == ord('k'):
+            if key == curses.KEY_RESIZE:
+                state.update_display(full_update=True)
+            elif key == ord('k'):
                 state.up()
                 state.update_display(full_update=False)
             elif key == ord('j'):
@@ -301,7 +384,11 @@ def connections_controller(words, categories, stdscr):
                 state.select()
                 state.update_display(full_update=False)
             elif key == ord('g'):
+                guess_count = len(state.guesses)
+                guess = [w.word for w in state.selected_words()]
                 state.guess()
+                if len(state.guesses) > guess_count:
+                    journal.append("guess", words=guess)
                 state.update_display(full_update=True)
             elif key == ord('r'):
                 state.shuffle()
@@ -313,13 +400,14 @@ def connections_controller(words, categories, stdscr):
             elif key == ord('c'):
                 for w in state.words:
                     w.flag = None
-                    w.is_selected = False
+                state.clear_selection()
                 state.update_display()
+            elif key == ord('h'):
+                state.hint()
+                state.update_display(full_update=True)
             elif key == ord('1'):
                 state.message = "Cheat code activated."
-                for w in state.words:
-                    w.category.solved()
-                state.sort()
+                state.solve_all()
                 state.update_display(full_update=True)
             elif key == ord('q'):
                 stdscr.clear()
@@ -330,75 +418,30 @@ def connections_controller(words, categories, stdscr):
         stdscr.clear()
         stdscr.refresh()
         exit
-
-
-def load_puzzle():
-    try:
-        with open(PUZZLE_FILE, 'r') as f:
-            puzzle = json.load(f)
-    except:
-        print("Failed to load puzzle file.")
-        exit()
-    return puzzle
-
-def fetch_puzzle():
-    if not os.path.exists(PUZZLE_FILE):
-        fetch_latest_connections_puzzle()
-        puzzle = load_puzzle()
-    else:
-        puzzle = load_puzzle()
-    
-    if puzzle['date'] != datetime.now().strftime('%Y-%m-%d'):
-        fetch_latest_connections_puzzle()
-        puzzle = load_puzzle()
-
-    return puzzle
-
-def loading_animation(stdscr, fetch_puzzle_event):
-        stdscr.nodelay(True)
-        animation = ["|", "/", "-", "\\"]
-        content = "Fetching puzzle... "
-        idx = 0
-        start_time = datetime.now()
-        while True:
-            vbuffer = vertical_buffer(1, display_rows(stdscr))
-            hbuffer = horizontal_buffer(len(content) + 1, display_cols(stdscr))
-            is_time_buffer_elapsed = (datetime.now() - start_time).total_seconds() >= 0.5
-            stdscr.clear()
-            stdscr.addstr(vbuffer, hbuffer, content + animation[idx % len(animation)])
-            stdscr.refresh()
-            idx += 1
-            if not fetch_puzzle_event.is_set() and is_time_buffer_elapsed:
-                break
-            curses.napms(100)
-
-def puzzle_loading_screen(stdscr):
-
-    fetch_puzzle_event = threading.Event()
-    puzzle = None
-
-    def fetch_puzzle_in_background():
-        nonlocal puzzle
-        puzzle = fetch_puzzle()
-        fetch_puzzle_event.clear()
-
-    fetch_puzzle_event.set()
-    fetch_thread = threading.Thread(target=fetch_puzzle_in_background)
-    fetch_thread.start()
-
-    loading_animation(stdscr, fetch_puzzle_event)
-    fetch_thread.join()
-
-    return puzzle
-
-def connections_scene(stdscr):
-    curses.use_default_colors()
-    curses.curs_set(0)
-    
-    for i in range(0, curses.COLORS-1):
-        curses.init_pair(i + 1, i, -1)
-
-    puzzle = puzzle_loading_screen(stdscr)
+    finally:
+        journal.close()
+
+
+async def puzzle_loading_screen(stdscr):
+    # Draw an empty board straight away if the puzzle has to be fetched
+    blank = Category(CategoryColor.YELLOW, "")
+    placeholder = ConnectionsGame([Word("", blank) for _ in range(16)], [blank], stdscr)
+    placeholder.message = ""
+    return await PUZZLE_CACHE.get(
+        PUZZLE_FILE,
+        get_latest_connections_puzzle,
+        loading_waiter(
+            stdscr,
+            "Fetching puzzle... ",
+            layout=placeholder.update_display,
+            show=placeholder.show_message,
+        ),
+    )
+
+async def connections_scene(stdscr, archived=None):
+    hide_cursor()
+
+    puzzle = await puzzle_loading_screen(stdscr) if archived is None else archived
 
     categories, category_words = puzzle["categories"], puzzle["words"]
     categories = {
@@ -413,4 +456,5 @@ def connections_scene(stdscr):
         for word in word_list:
             words.append(Word(word, categories[color]))
 
-    connections_controller(words, categories.values(), stdscr)
\ No newline at end of file
+    journal = MoveJournal("connections", puzzle["date"]) if archived is None else ArchiveJournal("connections", archived)
+    await connections_controller(words, categories.values(), stdscr, journal, WordIndex.load())
\ No newline at end of file
@@ -1,20 +1,14 @@
 import os
-import json
 from datetime import datetime
 import logging
 
+from storage import write_json
+from providers import PuzzleProvider, get_provider, register_provider
 
-PUZZLE_FILE = os.path.expanduser('~/.wordgames/connections.json')
-LOG_FILE = os.path.expanduser('~/.wordgames/connections.log')
 
-# Ensure the directory exists before configuring logging
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+PUZZLE_FILE = os.path.expanduser('~/.wordgames/connections.json')
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+logger = logging.getLogger(__name__)
 
 
 def parse_word_list(s):
@@ -36,68 +30,73 @@ def is_word_category_list(ul):
     is_valid = all([count == 4 for count in word_counts])
     any_valid = any([count == 4 for count in word_counts])
     if any_valid and not is_valid:
-        logging.info(f"Raw HTML list: {ul}")
-        logging.info(f"Possible false positive. Word counts: {word_counts} Word lists: {parsed_word_lists}")
+        logger.info("Raw HTML list: %s", ul)
+        logger.info("Possible false positive. Word counts: %s Word lists: %s", word_counts, parsed_word_lists)
     
     return is_valid
 
 
-def get_connections_puzzle(url):
-    from bs4 import BeautifulSoup
-    from requests import get
-    logging.info(f"Fetching puzzle from {url}")
-    response = get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
-    
-    html_lists = soup.find_all("ul")
-    
-    word_lists = [l for l in html_lists if is_word_category_list(l)]
-    if not word_lists:
-        logging.error("No valid word category lists found in the page")
-        raise ValueError("Could not find word categories in the page")
-    word_list = word_lists[0].find_all('li')
-
-    category_names = {
-        'yellow': word_list[0].p.strong.text.replace(":", ""),
-        'green': word_list[1].p.strong.text.replace(":", ""),
-        'blue': word_list[2].p.strong.text.replace(":", ""),
-        'purple': word_list[3].p.strong.text.replace(":", "")
-    }
-
-    category_words = {
-        'yellow': parse_word_list(word_list[0].p.text),
-        'green': parse_word_list(word_list[1].p.text),
-        'blue': parse_word_list(word_list[2].p.text),
-        'purple': parse_word_list(word_list[3].p.text)
-    }
-    try:
-        assert all(category_names.values()), "Each category must have a name."
-        assert all(category_words.values()), "Each category must have words."
-        for category, words in category_words.items():
-            assert len(words) == 4, f"Category must have exactly 4 words, not {len(words)}. ({category}: {words})"
-    except Exception as e:
-        print(f"Error parsing puzzle for {url}: {e}")
-        raise e
-    
-    return category_names, category_words
-
-def fetch_latest_connections_puzzle(dt=None):
-    if dt is None:
-        dt = datetime.now()
-
-    month = dt.strftime("%B").lower()
-    day = int(dt.strftime("%d"))
-    year = int(dt.strftime("%Y"))
-    connections_url = 'https://mashable.com/article/nyt-connections-hint-answer-today-{}-{}'.format(
-        month,
-        day
-    )
-    if year >= 2025:
-        connections_url += f'-{year}'
-
-    scraped_categories, scraped_words = get_connections_puzzle(connections_url)
+@register_provider
+class ConnectionsProvider(PuzzleProvider):
+    name = "connections"
+    base_url = "https://mashable.com"
+
+    def path(self, date):
+        month = date.strftime("%B").lower()
+        day = int(date.strftime("%d"))
+        year = int(date.strftime("%Y"))
+        path = '/article/nyt-connections-hint-answer-today-{}-{}'.format(
+            month,
+            day
+        )
+        if year >= 2025:
+            path += f'-{year}'
+        return path
+
+    def fetch_html(self, url):
+        logger.info("Fetching puzzle from %s", url)
+        return super().fetch_html(url)
+
+    def parse(self, html, date):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        
+        html_lists = soup.find_all("ul")
+        
+        word_lists = [l for l in html_lists if is_word_category_list(l)]
+        if not word_lists:
+            logger.error("No valid word category lists found in the page")
+            raise ValueError("Could not find word categories in the page")
+        word_list = word_lists[0].find_all('li')
+
+        category_names = {
+            'yellow': word_list[0].p.strong.text.replace(":", ""),
+            'green': word_list[1].p.strong.text.replace(":", ""),
+            'blue': word_list[2].p.strong.text.replace(":", ""),
+            'purple': word_list[3].p.strong.text.replace(":", "")
+        }
+
+        category_words = {
+            'yellow': parse_word_list(word_list[0].p.text),
+            'green': parse_word_list(word_list[1].p.text),
+            'blue': parse_word_list(word_list[2].p.text),
+            'purple': parse_word_list(word_list[3].p.text)
+        }
+        try:
+            assert all(category_names.values()), "Each category must have a name."
+            assert all(category_words.values()), "Each category must have words."
+            for category, words in category_words.items():
+                assert len(words) == 4, f"Category must have exactly 4 words, not {len(words)}. ({category}: {words})"
+        except Exception:
+            logger.exception("Error parsing puzzle for %s", self.url(date))
+            raise
+        
+        return category_names, category_words
+
+def get_latest_connections_puzzle(dt=None):
+    scraped_categories, scraped_words = get_provider("connections").get(dt)
     
-    puzzle_data = {
+    return {
         'date': datetime.now().strftime('%Y-%m-%d'),
         'categories': scraped_categories,
         'words': scraped_words,
@@ -105,11 +104,9 @@ def fetch_latest_connections_puzzle(dt=None):
         'is_finished': False,
     }
 
-    if not os.path.exists(os.path.dirname(PUZZLE_FILE)):
-        os.makedirs(os.path.dirname(PUZZLE_FILE))
-
-    with open(PUZZLE_FILE, 'w') as f:
-        json.dump(puzzle_data, f, indent=4)
+def fetch_latest_connections_puzzle(dt=None):
+    puzzle_data = get_latest_connections_puzzle(dt)
+    write_json(PUZZLE_FILE, puzzle_data)
     print("Puzzle data saved to {}".format(PUZZLE_FILE))
     
     return puzzle_data
@@ -0,0 +1,122 @@
+import os
+import sys
+import curses
+import signal
+import asyncio
+
+from layout import Layout
+
+# At most this many keys are taken as one burst, so a long paste is still drawn as it goes
+MAX_BURST = 256
+
+
+async def read_burst(screen, limit=MAX_BURST) -> list[int]:
+    """
+    Wait for a key, then take every key already queued behind it, in order, so a scene can
+    apply a burst of typing (or a paste) and draw once. A resize ends the burst, and a
+    Ctrl-C inside one is raised by the next read rather than dropping the keys before it.
+    """
+    keys = [await screen.read_key()]
+    while keys[-1] != curses.KEY_RESIZE and len(keys) < limit and screen.key_pending():
+        try:
+            keys.append(await screen.read_key())
+        except KeyboardInterrupt:
+            screen.interrupted = True
+            break
+    return keys
+
+
+class CursesScreen:
+    """
+    A curses window whose input can be awaited, so scenes run as coroutines on one event loop.
+
+    Everything except reading keys, doupdate and layout is passed through to the wrapped window.
+    """
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self.layout = Layout(*stdscr.getmaxyx())
+        self.interrupted = False
+        self.resized = False
+        self.input_ready = asyncio.Event()
+        stdscr.nodelay(True)
+
+    def __getattr__(self, name):
+        return getattr(self.stdscr, name)
+
+    def doupdate(self):
+        # Module-level in curses; a method here so scenes can finish a frame on any screen
+        curses.doupdate()
+
+    def interrupt(self):
+        self.interrupted = True
+        self.input_ready.set()
+
+    def resize(self):
+        # Our SIGWINCH handler replaces curses' own, so resize the screen here
+        try:
+            cols, rows = os.get_terminal_size(sys.__stdout__.fileno())
+        except OSError:
+            return
+        curses.resizeterm(rows, cols)
+        self.resized = True
+        self.input_ready.set()
+
+    def key_pending(self) -> bool:
+        if self.interrupted or self.resized:
+            return True
+        key = self.stdscr.getch()
+        if key == -1:
+            return False
+        curses.ungetch(key)
+        return True
+
+    async def read_keys(self) -> list[int]:
+        return await read_burst(self)
+
+    async def read_key(self, timeout=None) -> int:
+        """Wait for the next key, or return -1 after timeout seconds. Ctrl-C raises KeyboardInterrupt."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            if self.interrupted:
+                self.interrupted = False
+                raise KeyboardInterrupt()
+            key = self.stdscr.getch()
+            if self.resized or key == curses.KEY_RESIZE:
+                # Any number of resize signals become one relayout
+                self.resized = False
+                self.layout = Layout(*self.stdscr.getmaxyx())
+                if key not in (-1, curses.KEY_RESIZE):
+                    curses.ungetch(key)
+                return curses.KEY_RESIZE
+            if key != -1:
+                return key
+            self.input_ready.clear()
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return -1
+            try:
+                await asyncio.wait_for(self.input_ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                return -1
+
+
+async def _run_scene(scene, stdscr):
+    loop = asyncio.get_running_loop()
+    screen = CursesScreen(stdscr)
+    stdin = sys.stdin.fileno()
+    loop.add_reader(stdin, screen.input_ready.set)
+    loop.add_signal_handler(signal.SIGWINCH, screen.resize)
+    loop.add_signal_handler(signal.SIGINT, screen.interrupt)
+    try:
+        return await scene(screen)
+    finally:
+        loop.remove_reader(stdin)
+        loop.remove_signal_handler(signal.SIGWINCH)
+        loop.remove_signal_handler(signal.SIGINT)
+
+
+def run(scene):
+    """Run the coroutine function scene(screen) in curses on the process-wide event loop."""
+    return curses.wrapper(lambda stdscr: asyncio.run(_run_scene(scene, stdscr)))
@@ -0,0 +1,94 @@
+import os
+import re
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Request path prefix -> page served for it, mirroring the production URLs each provider builds
+ROUTES = [
+    (re.compile(r"^/article/wordle-today-answer-"), "wordle.html"),
+    (re.compile(r"^/article/nyt-connections-hint-answer-today-"), "connections.html"),
+    (re.compile(r"^/puzzles/spelling-bee"), "spellingbee.html"),
+    (re.compile(r"^/crosswords/game/mini"), "mini.html"),
+]
+
+
+def load_pages(fixtures_dir=FIXTURES_DIR):
+    pages = {}
+    for _, filename in ROUTES:
+        with open(os.path.join(fixtures_dir, filename), "rb") as f:
+            pages[filename] = f.read()
+    return pages
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        for pattern, filename in ROUTES:
+            if pattern.match(self.path):
+                body = self.server.pages[filename]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                break
+        else:
+            body = b"Not found"
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Local stand-in for the puzzle sites, serving the pages in fixtures/ from memory.
+
+    with FixtureServer() as server:
+        get_provider("wordle", server.url).get()
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, fixtures_dir=FIXTURES_DIR):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.pages = load_pages(fixtures_dir)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded puzzle pages locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port)
+    print(f"Serving fixtures on {server.url}")
+    print(f"Play against them with WORDGAMES_PROVIDER_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import logging
+from contextvars import ContextVar
+
+from storage import write_json
+
+JOURNAL_DIR = os.path.expanduser("~/.wordgames/journal")
+HISTORY_DIR = os.path.expanduser("~/.wordgames/history")
+
+# Cleared for sessions whose progress shouldn't be persisted, e.g. anonymous server sessions.
+JOURNALING = ContextVar("journaling", default=True)
+
+# Callbacks run with each puzzle snapshot archived by compact, keyed by game
+_archive_hooks: dict[str, list] = {}
+
+# Appends are flushed to the OS immediately but only fsynced in batches.
+FSYNC_EVERY = 16
+FSYNC_INTERVAL = 1.0
+
+
+def journal_path(game):
+    return os.path.join(JOURNAL_DIR, f"{game}.jsonl")
+
+
+def history_path(game, date):
+    return os.path.join(HISTORY_DIR, game, f"{date}.json")
+
+
+def archive_journal_path(game, date):
+    return os.path.join(JOURNAL_DIR, "archive", game, f"{date}.jsonl")
+
+
+def read_moves(game, path=None):
+    moves = []
+    try:
+        with open(path or journal_path(game), "r") as f:
+            for line in f:
+                try:
+                    moves.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; everything before it is intact.
+                    break
+    except FileNotFoundError:
+        pass
+    return moves
+
+
+class MoveJournal:
+    """
+    Append-only, per-game log of the moves made on one day's puzzle.
+
+    Each move is one JSON line tagged with the puzzle date. Replaying the journal rebuilds
+    the player's progress; `compact` folds a finished day into history/<game>/<date>.json.
+    """
+
+    records_stats = True
+
+    def __init__(self, game, date):
+        self.game = game
+        self.date = date
+        self.enabled = JOURNALING.get()
+        self.path = journal_path(game)
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def replay(self) -> list[dict]:
+        if not self.enabled:
+            return []
+        return [move for move in read_moves(self.game) if move.get("date") == self.date]
+
+    def append(self, move_type, **fields):
+        if not self.enabled:
+            return
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps({"date": self.date, "type": move_type, **fields}) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_EVERY or time.monotonic() - self._last_sync >= FSYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+class ArchiveJournal(MoveJournal):
+    """
+    Moves on a past day's puzzle opened from the archive. They end up in the puzzle's
+    history/<game>/<date>.json snapshot rather than the daily journal, which only ever holds
+    today's puzzle. While playing they're appended to a journal of their own, synced like the
+    daily one, and merged into the snapshot on close (or on the next open, after a crash).
+    """
+
+    # A replayed day isn't a live result, and counting it would move last_date and break streaks
+    records_stats = False
+
+    def __init__(self, game, snapshot):
+        super().__init__(game, snapshot["date"])
+        self.path = archive_journal_path(game, self.date)
+        self.snapshot = snapshot
+
+    def replay(self) -> list[dict]:
+        if not self.enabled:
+            return []
+        return list(self.snapshot.get("moves", [])) + read_moves(self.game, self.path)
+
+    def close(self):
+        super().close()
+        moves = read_moves(self.game, self.path) if self.enabled else []
+        if moves:
+            snapshot = {key: value for key, value in self.snapshot.items() if key != "fetched_at"}
+            snapshot["moves"] = list(self.snapshot.get("moves", [])) + moves
+            write_json(history_path(self.game, self.date), snapshot, indent=None)
+            os.remove(self.path)
+
+
+def on_archive(game):
+    """Decorator registering fn(snapshot) to run whenever a puzzle of game is archived."""
+    def register(fn):
+        _archive_hooks.setdefault(game, []).append(fn)
+        return fn
+    return register
+
+
+def compact(game, puzzle):
+    """Archive puzzle with its journaled moves in history/<game>/<date>.json and clear the journal."""
+    moves = read_moves(game)
+    day_moves = [move for move in moves if move.get("date") == puzzle.get("date")]
+    if len(day_moves) != len(moves):
+        logging.info("Dropping %d %s moves without a puzzle snapshot", len(moves) - len(day_moves), game)
+
+    _archive(game, puzzle, day_moves)
+    if moves:
+        os.remove(journal_path(game))
+
+
+def compact_before(game, date, puzzle_for):
+    """
+    Archive every earlier day still in game's journal, as compact does, and keep only date's moves.
+
+    For games without a cached puzzle file, whose journal nothing else compacts;
+    puzzle_for(day) gives the snapshot for a day.
+    """
+    moves = read_moves(game)
+    days = sorted({move["date"] for move in moves if move.get("date") not in (date, None)})
+    if not days:
+        return
+    for day in days:
+        _archive(game, {**puzzle_for(day), "date": day}, [move for move in moves if move.get("date") == day])
+
+    kept = [move for move in moves if move.get("date") == date]
+    if not kept:
+        os.remove(journal_path(game))
+        return
+    tmp_path = journal_path(game) + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(json.dumps(move) + "\n" for move in kept)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, journal_path(game))
+
+
+def _archive(game, puzzle, moves):
+    snapshot = {key: value for key, value in puzzle.items() if key != "fetched_at"}
+    snapshot["moves"] = moves
+    write_json(history_path(game, puzzle["date"]), snapshot, indent=None)
+
+    for hook in _archive_hooks.get(game, []):
+        try:
+            hook(snapshot)
+        except Exception as e:
+            logging.warning("Archive hook %s for %s failed: %r", hook.__name__, game, e)
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Region:
+    y: int
+    x: int
+    height: int
+    width: int
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+
+class Layout:
+    """
+    Screen geometry for one terminal size.
+
+    The screens (eventloop.CursesScreen, server.RemoteScreen) build a new Layout when
+    they return KEY_RESIZE. Scenes look their regions up here, so each region is
+    computed once per size instead of on every draw.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self._regions = {}
+
+    def region(self, key, compute: Callable[["Layout"], object]):
+        """compute(layout), cached under key until the next resize."""
+        if key not in self._regions:
+            self._regions[key] = compute(self)
+        return self._regions[key]
+
+    def centered(self, height: int, width: int) -> Region:
+        return self.region(("centered", height, width), lambda layout: Region(
+            max(0, (layout.rows - height) // 2),
+            max(0, (layout.cols - width) // 2),
+            height,
+            width,
+        ))
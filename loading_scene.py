@@ -1,43 +1,48 @@
 import asyncio
-from datetime import datetime, timedelta
-from utils import vertical_buffer, horizontal_buffer, display_rows, display_cols
-from concurrent.futures import ThreadPoolExecutor
 
-async def loading_animation(stdscr, fetch_fn, message, min_time=1):
+from utils import low_power
+
+ANIMATION = ["|", "/", "-", "\\"]
+FRAME_INTERVAL = 0.1
+
+def show_centered(stdscr, text):
+    region = stdscr.layout.centered(1, len(text))
+    stdscr.addstr(region.y, region.x, text)
+    stdscr.refresh()
+
+async def loading_animation(stdscr, awaitable, message, layout=None, show=None):
     """
-    Display a loading animation while waiting for fetch_fn to complete.
-    
+    Display a loading animation while waiting for awaitable to complete.
+
     Args:
         stdscr: Curses window object
-        fetch_fn: Function that performs the data fetching
+        awaitable: Future or coroutine producing the data, e.g. from PUZZLE_CACHE.get
         message: Message to display during loading
-    
+        layout: Draws the scene's layout before the first frame (default: clear the screen)
+        show: Draws one frame of the status text (default: centred on the screen)
+
     Returns:
-        The result from fetch_fn
+        The result of awaitable, as soon as it's ready
     """
-    stdscr.nodelay(True)
-    animation = ["|", "/", "-", "\\"]
-    idx = 0
-    stdscr.clear()
-    start_time = datetime.now()
-
-    with ThreadPoolExecutor() as executor:
-        future = executor.submit(fetch_fn)
-        # Wait for both minimum time AND future completion
-        while not future.done() or (datetime.now() - start_time) < timedelta(seconds=min_time):
-            vbuffer = vertical_buffer(1, display_rows(stdscr))
-            hbuffer = horizontal_buffer(len(message) + 1, display_cols(stdscr))
-            stdscr.addstr(vbuffer, hbuffer, message + animation[idx % len(animation)])
-            stdscr.refresh()
-            
-            idx += 1
-            await asyncio.sleep(0.1)
-        
+    future = asyncio.ensure_future(awaitable)
+    if future.done():
         return future.result()
 
-# Helper function to run the animation in the event loop
-def run_loading_animation(stdscr, fetch_fn, message, min_time=1):
-    """
-    Wrapper function to run the loading animation in the event loop.
-    """
-    return asyncio.run(loading_animation(stdscr, fetch_fn, message, min_time))
+    (layout or stdscr.clear)()
+    show = show or (lambda text: show_centered(stdscr, text))
+    if low_power():
+        # One still frame, then sleep until the data is in
+        show(message)
+        return await future
+
+    idx = 0
+    while not future.done():
+        show(message + ANIMATION[idx % len(ANIMATION)])
+        idx += 1
+        await asyncio.wait([future], timeout=FRAME_INTERVAL)
+
+    return future.result()
+
+def loading_waiter(stdscr, message, layout=None, show=None):
+    """A wait_fn for PUZZLE_CACHE.get that shows the loading animation; only called on a cache miss."""
+    return lambda future: loading_animation(stdscr, future, message, layout, show)
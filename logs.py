@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+import logging
+import logging.handlers
+
+LOG_FILE = os.path.expanduser("~/.wordgames/wordgames.log")
+MAX_BYTES = 1 << 20
+BACKUP_COUNT = 3
+# Repeats of a message from the same logger within this many seconds are counted, not written
+REPEAT_WINDOW = 60.0
+
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `fields` passed through `extra` kept as data."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        repeats = getattr(record, "repeats", 0)
+        if repeats:
+            entry["repeats"] = repeats
+        return json.dumps(entry)
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Lets the first record with a given logger and message template through, then drops
+    repeats for `window` seconds. The next one let through carries the dropped count;
+    counts nothing else picked up are handed back by `pending`, e.g. at shutdown.
+    """
+
+    def __init__(self, window=REPEAT_WINDOW):
+        super().__init__()
+        self.window = window
+        # Records come from any thread
+        self._lock = threading.Lock()
+        self._seen = {}
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            last, dropped, _ = self._seen.get(key, (None, 0, None))
+            if last is not None and now - last < self.window:
+                self._seen[key] = (last, dropped + 1, record)
+                return False
+            self._seen[key] = (now, 0, None)
+        record.repeats = dropped
+        return True
+
+    def pending(self) -> list[logging.LogRecord]:
+        """The last dropped record of each template still holding a count, carrying it; the counts are cleared."""
+        records = []
+        with self._lock:
+            for key, (last, dropped, record) in self._seen.items():
+                if dropped:
+                    record.repeats = dropped
+                    records.append(record)
+                    self._seen[key] = (last, 0, None)
+        return records
+
+
+def setup(level=logging.INFO, path=LOG_FILE, repeat_window=REPEAT_WINDOW):
+    """
+    Send log records to a rotating JSON-lines file through a queue, so logging never does
+    disk I/O on the caller's thread. Call once at startup; later calls do nothing.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, delay=True)
+    file_handler.setFormatter(JsonFormatter())
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(RepeatFilter(repeat_window))
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    _queue_handler = queue_handler
+
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+    atexit.register(stop)
+
+
+def stop():
+    """Write out everything queued, with any repeat counts not yet logged, and stop the writer thread."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    for handler_filter in _queue_handler.filters:
+        if isinstance(handler_filter, RepeatFilter):
+            for record in handler_filter.pending():
+                # Past the filter, which would drop them again
+                _queue_handler.enqueue(_queue_handler.prepare(record))
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
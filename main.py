@@ -1,14 +1,20 @@
+import logs
 import utils
 import curses
+import eventloop
 from utils import Palette
 from typing import Callable
 from dataclasses import dataclass
 
 from wordle.scene import wordle_scene
+from wordle.multi import quordle_scene, octordle_scene
 from mini.scene import mini_scene
 from connections.scene import connections_scene
 from spellingbee.scene import spellingbee_scene
 from placeholder_scene import placeholder_scene
+from stats_scene import stats_scene
+from archive_scene import archive_scene
+from bundle import GAMES as ARCHIVED_GAMES
 
 @dataclass
 class WordGame:
@@ -17,50 +23,61 @@ class WordGame:
     color: int
 
 
-def main(stdscr):
+async def main(stdscr):
 
-    curses.use_default_colors()
-    for i in range(0, curses.COLORS-1):
-            curses.init_pair(i + 1, i, -1)
-
-    curses.curs_set(0)
-    stdscr.nodelay(1)
+    utils.init_colors()
+    utils.hide_cursor()
     
     games = [
         WordGame("wordle", wordle_scene, Palette.green()),
+        WordGame("quordle", quordle_scene, Palette.green()),
+        WordGame("octordle", octordle_scene, Palette.green()),
         WordGame("connections", connections_scene, Palette.purple()),
         WordGame("mini", mini_scene, Palette.blue()),
         WordGame("strands", placeholder_scene, Palette.red()),
-        WordGame("spellingbee", spellingbee_scene, Palette.yellow())
+        WordGame("spellingbee", spellingbee_scene, Palette.yellow()),
+        WordGame("stats", stats_scene, Palette.gray()),
     ]
     
     current_option = 0
-    vbuffer = utils.vertical_buffer(len(games), utils.display_rows(stdscr))
-    hbuffer = utils.horizontal_buffer(max(len(game.name) for game in games), utils.display_cols(stdscr))
+    menu_width = max(len(game.name) for game in games)
     stdscr.clear()
     try:
         while True:
+            menu = stdscr.layout.centered(len(games), menu_width)
+            vbuffer, hbuffer = menu.y, menu.x
             for idx, option in enumerate(games):
                 if idx == current_option:
                     stdscr.addstr(vbuffer+idx, hbuffer, f"> {option.name.upper()}\n", option.color | curses.A_BOLD)
                 else:
                     stdscr.addstr(vbuffer+idx, hbuffer, f"  {option.name.upper()}\n", Palette.white())
+            if menu.bottom + 1 < stdscr.layout.rows:
+                hint = "[a]rchive" if games[current_option].name in ARCHIVED_GAMES else ""
+                stdscr.addstr(menu.bottom + 1, hbuffer, hint.ljust(menu_width + 2), Palette.gray())
             
             stdscr.refresh()
             
-            key = stdscr.getch()
+            key = await stdscr.read_key()
             
-            if key == curses.KEY_UP or key == ord('k'):
+            if key == curses.KEY_RESIZE:
+                stdscr.clear()
+            elif key == curses.KEY_UP or key == ord('k'):
                 current_option = (current_option - 1) % len(games)
             elif key == curses.KEY_DOWN or key == ord('j'):
                 current_option = (current_option + 1) % len(games)
             elif key == ord('q'):
                 break
+            elif key == ord('a') and games[current_option].name in ARCHIVED_GAMES:
+                option = games[current_option]
+                stdscr.clear()
+                await archive_scene(stdscr, option.name, option.func, option.color)
             elif key == ord('\n'):
                 stdscr.clear()
                 stdscr.refresh()
-                games[current_option].func(stdscr)
+                await games[current_option].func(stdscr)
     except KeyboardInterrupt:
         exit
 
-curses.wrapper(main)
+if __name__ == "__main__":
+    logs.setup()
+    eventloop.run(main)
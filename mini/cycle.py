@@ -4,6 +4,7 @@ from typing import Iterable
 class Cycle(Iterable):
     def __init__(self, iterable: Iterable):
         self.data = list(iterable)
+        self.positions = {item: index for index, item in enumerate(self.data)}
         self.index = 0
 
     def __len__(self):
@@ -34,8 +35,8 @@ class Cycle(Iterable):
         return self.data[-1]
 
     def select(self, item):
-        if item in self.data:
-            self.index = self.data.index(item)
+        if item in self.positions:
+            self.index = self.positions[item]
             return True
         else:
             return False
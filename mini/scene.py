@@ -1,13 +1,24 @@
 from dataclasses import dataclass
-import json
 import time
 import curses
-import textwrap
+import curses.ascii
+import asyncio
+from array import array
 from enum import StrEnum
-from typing import Iterable, Callable
+from typing import Callable
 
 import utils
+import stats
+from layout import Region
+from compositor import Compositor
 from mini.cycle import Cycle
+from journal import ArchiveJournal, MoveJournal
+from loading_scene import loading_waiter
+from puzzle_cache import PUZZLE_CACHE
+
+# Seconds between timer redraws; low-power mode wakes less often
+TICK_INTERVAL = 1
+LOW_POWER_TICK_INTERVAL = 5
 
 
 @dataclass
@@ -19,234 +30,341 @@ class CrosswordClue:
     def __str__(self):
         return f"{self.number}{'A' if self.is_across else 'D'} {self.clue}"
 
-@dataclass
-class CrosswordCell:
-    i: int
-    j: int
-    solution: str
-    number: str = " "
-    is_circled: bool = False
-    value: str = " "
-    is_filled: bool = False
-    is_out_of_bounds: bool = False
-    across_clue: CrosswordClue = None
-    down_clue: CrosswordClue = None
-
-    def __post_init__(self):
-        assert self.value is not None
-
-    def set_value(self, value: str):
-        assert len(value) == 1, "Value must be a single character"
-        assert value.isalpha() or value == " ", "Value must be an alphabetic character or a space"
-        if value == " ":
-            self.is_filled = False
-        else:
-            self.is_filled = True
-        self.value = value
-    
+# Per-cell states used to colour the grid
+BLOCK, OPEN, IN_WORD, CURSOR = range(4)
+NO_WORD = 0xFFFF
+# Rows kept for the timer above the grid and the clue below it
+TIMER_ROWS = 3
+MESSAGE_ROWS = 4
+
+
+def _scroll_axis(offset: int, visible: int, total: int, lo: int, hi: int, cursor: int) -> int:
+    # Keep lo..hi on screen, or just the cursor if the span is longer than the viewport
+    if hi - lo >= visible:
+        lo = hi = cursor
+    if lo < offset:
+        offset = lo
+    elif hi >= offset + visible:
+        offset = hi - visible + 1
+    return max(0, min(offset, total - visible))
+
 
 class Crossword:
-    def __init__(self, cells: list[list[CrosswordCell]]) -> None:
+    """
+    A crossword grid held in flat parallel arrays indexed by i * cols + j.
+
+    Each open cell maps to its across and down word, so highlighting, navigation and
+    redraws work a word at a time, and filled/correct counts make the full and solved
+    checks constant time. Grids bigger than the screen are drawn through a viewport
+    that follows the cursor's word.
+    """
+
+    def __init__(self, grid: list[list[dict]], clues: list[CrosswordClue]) -> None:
         # definition
-        self.cells = cells
-        self.rows = len(cells)
-        self.cols = len(cells[0])
-        
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+
         # validation
-        assert all(len(row) == self.cols for row in cells), "All rows must have the same length"
-        
+        assert all(len(row) == self.cols for row in grid), "All rows must have the same length"
+
+        size = self.rows * self.cols
+        self.blocks = bytearray(size)
+        self.solution = bytearray(b" " * size)
+        self.values = bytearray(b" " * size)
+        self.circled = bytearray(size)
+        self.numbers = [""] * size
+        for i, row in enumerate(grid):
+            for j, cell in enumerate(row):
+                index = i * self.cols + j
+                if cell.get("is_out_of_bounds"):
+                    self.blocks[index] = 1
+                    continue
+                self.solution[index] = ord(cell["solution"].upper())
+                self.numbers[index] = cell.get("number") or ""
+                self.circled[index] = bool(cell.get("is_circled"))
+        self.open_cells = size - sum(self.blocks)
+        self.filled = 0
+        self.correct = 0
+
+        # words as (clue, first cell index, step to the next cell, length)
+        clue_lookup = {(clue.number, clue.is_across): clue for clue in clues}
+        self.words = []
+        self.across_word = array("H", [NO_WORD]) * size
+        self.down_word = array("H", [NO_WORD]) * size
+        for is_across, lanes, lane_length, step in (
+            (True, range(0, size, self.cols), self.cols, 1),
+            (False, range(self.cols), self.rows, self.cols),
+        ):
+            cell_words = self.across_word if is_across else self.down_word
+            for lane_start in lanes:
+                length = 0
+                for k in range(lane_length + 1):
+                    index = lane_start + k * step
+                    if k < lane_length and not self.blocks[index]:
+                        length += 1
+                        continue
+                    if length:
+                        first = index - length * step
+                        for m in range(length):
+                            cell_words[first + m * step] = len(self.words)
+                        self.words.append((clue_lookup.get((self.numbers[first], is_across)), first, step, length))
+                    length = 0
+
         # state
         self.cursor_h = True
-        self.valid_cells = Cycle(
-            sorted([
-                (i, j) for i in range(self.rows)
-                for j in range(self.cols)
-                if not cells[i][j].is_out_of_bounds
-            ])
-        )
+        across_order = [divmod(index, self.cols) for index in range(size) if not self.blocks[index]]
+        self.across_cells = Cycle(across_order)
+        self.down_cells = Cycle(sorted(across_order, key=lambda cell: (cell[1], cell[0])))
+        self.valid_cells = self.across_cells
         self.cursor_row, self.cursor_col = next(self.valid_cells)
-        self.prev_cursor_row = self.cursor_row
-        self.prev_cursor_col = self.cursor_col
-        self.prev_cursor_h = self.cursor_h
-        self.prev_message = ""
+        # Words whose cells or highlighting changed since the last draw
+        self.stale_words = set()
+        self.shown_message = None
+        # viewport, in cells
+        self.top = 0
+        self.left = 0
+        # colour runs for each kind of cell segment, see _segment
+        self._segments = {}
+        self._compositor = None
+        self.shown_timer = None
 
     @property
     def is_full(self) -> bool:
-        return all(
-            cell.is_filled for row in self.cells
-            for cell in row if not cell.is_out_of_bounds
-        )
+        return self.filled == self.open_cells
     
     @property
     def is_solved(self) -> bool:
-        return all(
-            cell.is_filled and cell.value == cell.solution for row in self.cells
-            for cell in row if not cell.is_out_of_bounds
-        )
+        return self.correct == self.open_cells
 
     def set_cell(self, i: int, j: int, c: str):
         if self.is_out_of_bounds(i, j):
             return False
-        else:
-            self.cells[i][j].set_value(c.upper())
-            return True
-
-    def cursor_cell(self) -> CrosswordCell:
-        return self.cells[self.cursor_row][self.cursor_col]
+        c = c.upper()
+        assert len(c) == 1, "Value must be a single character"
+        assert c.isalpha() or c == " ", "Value must be an alphabetic character or a space"
+        index = i * self.cols + j
+        old = self.values[index]
+        new = ord(c)
+        self.filled += (new != 32) - (old != 32)
+        self.correct += (new == self.solution[index]) - (old == self.solution[index])
+        self.values[index] = new
+        return True
+
+    def word_at(self, i: int, j: int, is_across: bool) -> int:
+        return (self.across_word if is_across else self.down_word)[i * self.cols + j]
+
+    def cursor_word(self) -> int:
+        return self.word_at(self.cursor_row, self.cursor_col, self.cursor_h)
+
+    def cursor_clue(self) -> CrosswordClue:
+        return self.words[self.cursor_word()][0]
+
+    def word_bounds(self, word: int) -> tuple[int, int, int, int]:
+        """First row, last row, first column and last column of a word."""
+        _, first, step, length = self.words[word]
+        i, j = divmod(first, self.cols)
+        if step == 1:
+            return i, i, j, j + length - 1
+        return i, i + length - 1, j, j
 
     def is_filled(self, i: int, j: int) -> bool:
-        return not self.is_out_of_bounds(i, j) and self.cells[i][j].is_filled
+        return not self.is_out_of_bounds(i, j) and self.values[i * self.cols + j] != 32
 
     def is_empty(self, i: int, j: int) -> bool:
-        return not self.is_out_of_bounds(i, j) and not self.cells[i][j].is_filled
+        return not self.is_out_of_bounds(i, j) and self.values[i * self.cols + j] == 32
 
     def is_cursor_cell(self, i: int, j: int) -> bool:
         return i == self.cursor_row and j == self.cursor_col
 
     def is_cursor_lane(self, i: int, j: int) -> bool:
-        # TODO: Once cell->word mappings are defined, require that the cursor is on the same word
-        return (
-            i >= 0 and j >= 0 and i < self.rows and j < self.cols
-        ) and (
-            not self.cells[i][j].is_out_of_bounds
-        ) and (
-            (self.cursor_h and i == self.cursor_row)
-            or (not self.cursor_h and j == self.cursor_col)
-        )
+        return not self.is_out_of_bounds(i, j) and self.word_at(i, j, self.cursor_h) == self.cursor_word()
 
     def is_out_of_bounds(self, i: int, j: int) -> bool:
         return (i < 0 or j < 0 or i >= self.rows or j >= self.cols 
-                or self.cells[i][j].is_out_of_bounds)
-
-    def _check_coordinates(self, coords: list[tuple[int, int]], f: Callable[[int, int], bool], b: Callable[[Iterable[bool]], bool]):
-        return b(f(i, j) for i, j in coords)
-    
-    def check_cursor_cells(self, coords: list[tuple[int, int]], b: Callable[[Iterable[bool]], bool] = any) -> bool:
-        return self._check_coordinates(coords, self.is_cursor_cell, b)
-    
-    def check_cursor_lanes(self, coords: list[tuple[int, int]], b: Callable[[Iterable[bool]], bool] = any) -> bool:
-        return self._check_coordinates(coords, self.is_cursor_lane, b)
-    
-    def check_out_of_bounds(self, coords: list[tuple[int, int]], b: Callable[[Iterable[bool]], bool] = any) -> bool:
-        return self._check_coordinates(coords, self.is_out_of_bounds, b)
-
-    def _color_character(self, i: int, j: int, c: str, rel_coords: list[tuple[int, int]]) -> tuple[chr, int]:
-        _c = c
-        coords = [(i + di, j + dj) for di, dj in rel_coords]
-        is_white = c.isalpha() or self.check_out_of_bounds(coords)
-        is_yellow = self.check_cursor_cells(coords)
-        is_blue = self.check_cursor_lanes(coords)
-        is_out_of_bounds = self.check_out_of_bounds(coords, all)
-        
-        if is_out_of_bounds:
-            color = utils.Palette.gray()
-        elif is_yellow:
-            color = utils.Palette.yellow()
-        elif is_blue:
-            color = utils.Palette.blue()
-        elif is_white:
-            color = utils.Palette.white()
+                or self.blocks[i * self.cols + j] == 1)
+
+    def _geometry(self, layout):
+        def compute(layout):
+            visible_rows = max(1, min(self.rows, (layout.rows - TIMER_ROWS - MESSAGE_ROWS - 1) // 2))
+            visible_cols = max(1, min(self.cols, (layout.cols - 1) // 4))
+            return visible_rows, visible_cols, layout.centered(visible_rows * 2 + 1, visible_cols * 4 + 1)
+        return layout.region(("crossword", self.rows, self.cols), compute)
+
+    def geometry(self, stdscr):
+        """Visible cell rows and columns, and the screen region the visible grid is drawn in."""
+        return self._geometry(stdscr.layout)
+
+    def regions(self, layout):
+        _, _, grid = self._geometry(layout)
+        return {
+            "timer": Region(1, (layout.cols - 5) // 2, 1, 5),
+            "grid": grid,
+            "message": Region(grid.bottom + 1, 0, MESSAGE_ROWS - 1, layout.cols - 1),
+        }
+
+    def compositor(self, stdscr) -> Compositor:
+        if self._compositor is None or self._compositor.stdscr is not stdscr:
+            self._compositor = Compositor(stdscr, ("crossword", self.rows, self.cols), self.regions)
+        return self._compositor
+
+    def scroll(self, visible_rows: int, visible_cols: int) -> bool:
+        """Move the viewport so the cursor's word is on screen; returns whether it moved."""
+        first_row, last_row, first_col, last_col = self.word_bounds(self.cursor_word())
+        top = _scroll_axis(self.top, visible_rows, self.rows, first_row, last_row, self.cursor_row)
+        left = _scroll_axis(self.left, visible_cols, self.cols, first_col, last_col, self.cursor_col)
+        moved = (top, left) != (self.top, self.left)
+        self.top, self.left = top, left
+        return moved
+
+    def _states(self, i0: int, i1: int, j0: int, j1: int) -> dict[tuple[int, int], int]:
+        # The colouring state of cells i0..i1, j0..j1 and the ring around them
+        cursor_word = self.cursor_word()
+        cell_words = self.across_word if self.cursor_h else self.down_word
+        states = {}
+        for i in range(i0 - 1, i1 + 2):
+            for j in range(j0 - 1, j1 + 2):
+                if self.is_out_of_bounds(i, j):
+                    state = BLOCK
+                elif i == self.cursor_row and j == self.cursor_col:
+                    state = CURSOR
+                elif cell_words[i * self.cols + j] == cursor_word:
+                    state = IN_WORD
+                else:
+                    state = OPEN
+                states[i, j] = state
+        return states
+
+    def _segment(self, i: int, j: int, is_border: bool, states):
+        """
+        The four characters from cell (i, j)'s left border along its top border or its letter row,
+        as colour runs, and the first of them alone (for the grid's right edge). Memoised on
+        everything they depend on, so a redraw does a lookup per cell rather than work per character.
+        """
+        here, left = states[i, j], states[i, j - 1]
+        if is_border:
+            key = (True, here, left, states[i - 1, j], states[i - 1, j - 1])
+        elif 0 <= i < self.rows and 0 <= j < self.cols:
+            index = i * self.cols + j
+            key = (False, here, left, chr(self.values[index]) if not self.blocks[index] else " ", self.circled[index])
         else:
-            color = utils.Palette.gray()
-
-        return _c, color
-
-    def _character(self, i: int, j: int, is_hline: bool, is_vline: bool, is_center: bool, is_center_left: bool, is_center_right: bool) -> tuple[chr, int]:
-        if is_center:
-            cell = self.cells[i][j]
-            return self._color_character(i, j, cell.value if cell.is_filled else " ", [(0, 0)])
-        elif is_center_left:
-            cell = self.cells[i][j]
-            return self._color_character(i, j, "(" if cell.is_circled else " ", [(0, 0)])
-        elif is_center_right:
-            cell = self.cells[i][j]
-            return self._color_character(i, j, ")" if cell.is_circled else " ", [(0, 0)])
-        elif is_hline and is_vline:
-            rel_coords = [(0, 0), (0, -1), (-1, 0), (-1, -1)]
-            return self._color_character(i, j, "+", rel_coords)
-        elif is_hline:
-            rel_coords = [(0, 0), (-1, 0)]
-            return self._color_character(i, j, "-", rel_coords)
-        elif is_vline:
-            rel_coords = [(0, 0), (0, -1)]
-            return self._color_character(i, j, "|", rel_coords)
+            key = (False, here, left, " ", 0)
+
+        if key not in self._segments:
+            if is_border:
+                _, _, _, up, up_left = key
+                characters = [("+", self._color(False, (here, left, up, up_left)))]
+                characters += [("-", self._color(False, (here, up)))] * 3
+            else:
+                _, _, _, value, circled = key
+                characters = [("|", self._color(False, (here, left)))]
+                characters += [(c, self._color(c.isalpha(), (here,))) for c in ("(" if circled else " ", value, ")" if circled else " ")]
+            runs = []
+            for c, color in characters:
+                if runs and runs[-1][1] == color:
+                    runs[-1] = (runs[-1][0] + c, color)
+                else:
+                    runs.append((c, color))
+            self._segments[key] = (runs, [characters[0]])
+        return self._segments[key]
+
+    @staticmethod
+    def _color(is_letter: bool, around: tuple[int, ...]) -> int:
+        if all(state == BLOCK for state in around):
+            return utils.Palette.gray()
+        elif CURSOR in around:
+            return utils.Palette.yellow()
+        elif IN_WORD in around:
+            return utils.Palette.blue()
+        elif is_letter or BLOCK in around:
+            return utils.Palette.white()
         else:
-            rel_coords = [(0, 0)]
-            return self._color_character(i, j, " ", rel_coords)
+            return utils.Palette.gray()
+
+    def _draw_cells(self, screen, grid, i0: int, i1: int, j0: int, j1: int):
+        """Draw cells i0..i1, j0..j1 (clipped to the viewport) with their borders, one addstr per colour run."""
+        i0, i1 = max(i0, self.top), min(i1, self.top + (grid.height - 1) // 2 - 1)
+        j0, j1 = max(j0, self.left), min(j1, self.left + (grid.width - 1) // 4 - 1)
+        if i0 > i1 or j0 > j1:
+            return
+        states = self._states(i0, i1, j0, j1)
+        for y in range((i0 - self.top) * 2, (i1 - self.top) * 2 + 3):
+            i = self.top + y // 2
+            is_border = y % 2 == 0
+            runs = []
+            for j in range(j0, j1 + 2):
+                segment, edge = self._segment(i, j, is_border, states)
+                for text, color in (segment if j <= j1 else edge):
+                    if runs and runs[-1][1] == color:
+                        runs[-1][0] += text
+                    else:
+                        runs.append([text, color])
+            x = (j0 - self.left) * 4
+            for text, color in runs:
+                screen.addstr("grid", y, x, text, color)
+                x += len(text)
+
+    def draw_timer(self, screen, timer_seconds):
+        minutes, seconds = divmod(int(timer_seconds), 60)
+        timer_display = f"{minutes:02}:{seconds:02}"
+        if timer_display != self.shown_timer:
+            screen.addstr("timer", 0, 0, timer_display)
+            self.shown_timer = timer_display
+
+    def tick_display(self, stdscr, timer_seconds):
+        """Redraw just the timer; a tick leaves the grid and clue alone."""
+        screen = self.compositor(stdscr)
+        self.draw_timer(screen, timer_seconds)
+        screen.show()
 
     def update_display(self, stdscr, message: str = "", timer_seconds: int = 0, full_update: bool = False):
-        def row_to_y(col: int) -> tuple[int, int]:
-            return col * 2, (col + 1) * 2 + 1
-        
-        def col_to_x(row: int) -> tuple[int, int]:
-            return row * 4, (row + 1) * 4 + 1
-        
-        y_start = 0
-        x_start = 0
-        y_end = row_to_y(self.rows - 1)[1]
-        x_end = col_to_x(self.cols - 1)[1]
-        hbuffer = utils.horizontal_buffer(x_end, utils.display_cols(stdscr))
-        vbuffer = utils.vertical_buffer(y_end, utils.display_rows(stdscr))
+        visible_rows, visible_cols, grid = self.geometry(stdscr)
+        scrolled = self.scroll(visible_rows, visible_cols)
+        screen = self.compositor(stdscr)
 
         if full_update:
-            stdscr.clear()
+            screen.clear()
+            self.shown_timer = None
+            self.shown_message = None
 
-        minutes, seconds = divmod(timer_seconds, 60)
-        timer_display = f"{int(minutes):02}:{int(seconds):02}"
-        stdscr.addstr(1, (utils.display_cols(stdscr) - 5)//2, timer_display)
-
-        for y in range(y_start, y_end):
-            i = y // 2
-            is_hline = y % 2 == 0
-            for x in range(x_start, x_end):
-                if not full_update:
-                    cursor_row_ys = row_to_y(self.cursor_row)
-                    prev_cursor_row_ys = row_to_y(self.prev_cursor_row)
-                    cursor_col_xs = col_to_x(self.cursor_col)
-                    prev_cursor_col_xs = col_to_x(self.prev_cursor_col)
-                    is_in_update_area = (
-                        cursor_row_ys[0] <= y < cursor_row_ys[1]
-                        or prev_cursor_row_ys[0] <= y < prev_cursor_row_ys[1]
-                        or cursor_col_xs[0] <= x < cursor_col_xs[1]
-                        or prev_cursor_col_xs[0] <= x < prev_cursor_col_xs[1]
-                    )
-                    if not is_in_update_area:
-                        continue
-                    
-                j = x // 4
-                is_vline = x % 4 == 0
-                is_center = x % 4 == 2 and y % 2 == 1
-                is_center_left = x % 4 == 1 and y % 2 == 1
-                is_center_right = x % 4 == 3 and y % 2 == 1
-                try:
-                    c, color = self._character(i, j, is_hline, is_vline, is_center, is_center_left, is_center_right)
-                    stdscr.addstr(y + vbuffer, x + hbuffer, c, color)
-                except Exception as e:
-                    stdscr.addstr(y + vbuffer, x + hbuffer, "#")
-                    raise e
-
-        if message != self.prev_message:
-            text_width = x_end + hbuffer
+        self.draw_timer(screen, timer_seconds)
+
+        if full_update or scrolled:
+            self._draw_cells(screen, grid, 0, self.rows - 1, 0, self.cols - 1)
+        else:
+            # Only the words the cursor has been in since the last draw can have changed
+            for word in self.stale_words | {self.cursor_word()}:
+                self._draw_cells(screen, grid, *self.word_bounds(word))
+        self.stale_words.clear()
+
+        if message != self.shown_message:
+            self.shown_message = message
+            text_width = grid.width + grid.x
             min_lines = 3
-            wrapped_lines = textwrap.wrap(message, width=text_width)
-            wrapped_lines.extend([" ".center(text_width)] * (min_lines - len(wrapped_lines)))
-            for i, line in enumerate(wrapped_lines):
-                centered_line = ' ' * (hbuffer // 2) + line.center(text_width, ' ')
-                stdscr.addstr(
-                    y_end + vbuffer + 1 + i,
-                    0,
-                    centered_line,
-                    utils.Palette.white()
-                )
+            wrapped_lines = list(utils.wrap(message, text_width))
+            wrapped_lines.extend([""] * (min_lines - len(wrapped_lines)))
+            for i, line in enumerate(wrapped_lines[:min_lines]):
+                centered_line = ' ' * (grid.x // 2) + utils.justify(line, text_width, text_width, 'center')
+                screen.addstr("message", i, 0, centered_line, utils.Palette.white())
 
-        stdscr.refresh()
+        screen.show()
     
 
 class CrosswordController:
 
-    def __init__(self, puzzle: Crossword):
+    def __init__(self, puzzle: Crossword, journal: MoveJournal = None, elapsed: float = 0):
         self.puzzle = puzzle
-        self.start_time = time.time()
+        self.journal = journal
+        # The timer carries on from the time spent in earlier sessions
+        self.start_time = time.time() - elapsed
+        self.solved_time = None
+        # Only a solve made in this session has a meaningful time
+        self.solved_at_start = puzzle.is_solved
+        self.message = ""
+        self.nice_try_message_shown = False
+
+    def set_cell(self, i: int, j: int, c: str):
+        if self.puzzle.set_cell(i, j, c) and self.journal is not None:
+            self.journal.append("cell", i=i, j=j, value=c.upper(), elapsed=round(self.timer_seconds(), 1))
 
     def _move_cursor(self, rows, cols):
         new_coords = (self.puzzle.cursor_row + rows, self.puzzle.cursor_col + cols)
@@ -279,17 +397,8 @@ class CrosswordController:
 
     def toggle_cursor_direction(self):
         # Reset cycle direction
-        if self.puzzle.cursor_h:
-            sort_key = lambda cell: (cell[1], cell[0])
-        else:
-            sort_key = lambda cell: (cell[0], cell[1])
-        
-        self.puzzle.valid_cells = Cycle(
-            sorted(
-                self.puzzle.valid_cells,
-                key=sort_key
-            )
-        )
+        self.puzzle.valid_cells = self.puzzle.down_cells if self.puzzle.cursor_h else self.puzzle.across_cells
+        self.puzzle.valid_cells.index = 0
         
         # Toggle direction
         self.puzzle.cursor_h = not self.puzzle.cursor_h
@@ -327,10 +436,12 @@ class CrosswordController:
                 return current_cell
 
         
-        # Check there are cells to cycle through
-        no_valid_cells = not any([(i, j) != current_cell and condition(i, j) for i, j in self.puzzle.valid_cells])
-        no_empty_cells = not any([self.puzzle.is_empty(i, j) for i, j in self.puzzle.valid_cells])
-        if auto_skip and (no_valid_cells or no_empty_cells):
+        # Check there are cells to cycle through; skipping filled cells needs an empty one that qualifies
+        no_valid_cells = not any(
+            (i, j) != current_cell and condition(i, j) and self.puzzle.is_empty(i, j)
+            for i, j in self.puzzle.valid_cells
+        )
+        if auto_skip and no_valid_cells:
             return self.cycle_cell(
                 auto_skip=False,
                 condition=lambda i, j: True
@@ -346,170 +457,153 @@ class CrosswordController:
                 continue
 
     def cycle_lane(self, auto_skip: bool = True):
-        if self.puzzle.cursor_h:
-            next_lane_condition = lambda i, j: i != self.puzzle.cursor_row
-        else:
-            next_lane_condition = lambda i, j: j != self.puzzle.cursor_col
+        # Next word in the current direction, or the first one in the other after the last
+        word = self.puzzle.cursor_word()
+        is_across = self.puzzle.cursor_h
+        next_lane_condition = lambda i, j: self.puzzle.cursor_h != is_across or self.puzzle.word_at(i, j, is_across) != word
         return self.cycle_cell(
             auto_skip,
             condition=next_lane_condition,
         )
 
-    def run(self, stdscr):
-        stdscr.nodelay(True)  # Enable non-blocking input
-        nice_try_message_shown = False
-        last_update_time = time.time()
-        message = str(self.puzzle.cursor_cell().across_clue)
+    def timer_seconds(self) -> float:
+        if self.solved_time is None and self.puzzle.is_solved:
+            self.solved_time = time.time()
+            if self.journal is not None and self.journal.records_stats and not self.solved_at_start:
+                stats.record_mini(self.journal.date, self.solved_time - self.start_time)
+        return (self.solved_time or time.time()) - self.start_time
+
+    async def tick(self, stdscr):
+        interval = LOW_POWER_TICK_INTERVAL if utils.low_power() else TICK_INTERVAL
+        while True:
+            # Wake on the timer's own boundaries, so a slow tick still shows round numbers
+            await asyncio.sleep(interval - self.timer_seconds() % interval)
+            self.puzzle.tick_display(stdscr, self.timer_seconds())
+
+    def handle_key(self, key) -> bool:
+        """Apply one key to the puzzle; returns False for keys the Mini doesn't use."""
+        self.puzzle.stale_words.add(self.puzzle.cursor_word())
+
+        if key == curses.KEY_BACKSPACE or key == 127:
+            if not self.puzzle.is_empty(self.puzzle.cursor_row, self.puzzle.cursor_col):
+                self.set_cell(
+                    self.puzzle.cursor_row,
+                    self.puzzle.cursor_col,
+                    " "
+                )
+            else:
+                if self.puzzle.cursor_h:
+                    move_result = self.move_cursor_left()
+                else:
+                    move_result = self.move_cursor_up()
+                if move_result:
+                    self.set_cell(
+                        self.puzzle.cursor_row,
+                        self.puzzle.cursor_col,
+                        " "
+                    )
+        elif key == curses.KEY_ENTER or key in [10, 13]:
+            self.cycle_lane(auto_skip=True)
+        elif key == ord(" "):
+            self.cycle_cell(auto_skip=True)
+        elif curses.ascii.isalpha(key):
+            self.set_cell(
+                self.puzzle.cursor_row,
+                self.puzzle.cursor_col,
+                chr(key)
+            )
+            self.cycle_cell(auto_skip=False, stop_at_end=True)
+        elif key == curses.KEY_UP:
+            self.move_cursor_up()
+        elif key == curses.KEY_DOWN:
+            self.move_cursor_down()
+        elif key == curses.KEY_LEFT:
+            self.move_cursor_left()
+        elif key == curses.KEY_RIGHT:
+            self.move_cursor_right()
+        else:
+            return False
+        
+        if self.puzzle.is_solved:
+            self.message = "Congratulations!"
+        elif self.puzzle.is_full and not self.nice_try_message_shown:
+            self.message = "Not quite, keep trying!"
+            self.nice_try_message_shown = True
+        else:
+            self.message = str(self.puzzle.cursor_clue() or "")
+        return True
+
+    async def run(self, stdscr):
+        self.message = str(self.puzzle.cursor_clue() or "")
         
         self.puzzle.update_display(
             stdscr,
-            message=message,
-            timer_seconds=0,
+            message=self.message,
+            timer_seconds=self.timer_seconds(),
             full_update=True
         )
 
+        timer = asyncio.create_task(self.tick(stdscr))
         try:
             while True:
-                if not self.puzzle.is_solved:
-                    current_time = time.time()
-                    timer_seconds = current_time - self.start_time
-
-                # Check for input
-                key = stdscr.getch()
-                if key != -1:  # Input detected
-                    self.puzzle.prev_cursor_row = self.puzzle.cursor_row
-                    self.puzzle.prev_cursor_col = self.puzzle.cursor_col
-                    self.puzzle.prev_cursor_h = self.puzzle.cursor_h
-                    self.puzzle.prev_message = message
-
-                    if key == curses.KEY_BACKSPACE or key == 127:
-                        if not self.puzzle.is_empty(self.puzzle.cursor_row, self.puzzle.cursor_col):
-                            self.puzzle.set_cell(
-                                self.puzzle.cursor_row,
-                                self.puzzle.cursor_col,
-                                " "
-                            )
-                        else:
-                            if self.puzzle.cursor_h:
-                                move_result = self.move_cursor_left()
-                            else:
-                                move_result = self.move_cursor_up()
-                            if move_result:
-                                self.puzzle.set_cell(
-                                    self.puzzle.cursor_row,
-                                    self.puzzle.cursor_col,
-                                    " "
-                                )
-                    elif key == curses.KEY_ENTER or key in [10, 13]:
-                        self.cycle_lane(auto_skip=True)
-                    elif key == ord(" "):
-                        self.cycle_cell(auto_skip=True)
-                    elif curses.ascii.isalpha(key):
-                        self.puzzle.set_cell(
-                            self.puzzle.cursor_row,
-                            self.puzzle.cursor_col,
-                            chr(key)
-                        )
-                        self.cycle_cell(auto_skip=False, stop_at_end=True)
-                    elif key == curses.KEY_UP:
-                        self.move_cursor_up()
-                    elif key == curses.KEY_DOWN:
-                        self.move_cursor_down()
-                    elif key == curses.KEY_LEFT:
-                        self.move_cursor_left()
-                    elif key == curses.KEY_RIGHT:
-                        self.move_cursor_right()
-                    else:
-                        continue
-                    
-                    # Update display after handling input
-                    if self.puzzle.is_solved:
-                        message = "Congratulations!"
-                    elif self.puzzle.is_full and not nice_try_message_shown:
-                        message = "Not quite, keep trying!"
-                        nice_try_message_shown = True
-                    elif self.puzzle.cursor_h:
-                        message = str(self.puzzle.cursor_cell().across_clue)
-                    else:
-                        message = str(self.puzzle.cursor_cell().down_clue)
-                    
+                # Apply every key typed or pasted since the last frame, then draw once
+                keys = await stdscr.read_keys()
+                handled = [self.handle_key(key) for key in keys if key not in (-1, curses.KEY_RESIZE)]
+                if curses.KEY_RESIZE in keys or any(handled):
                     self.puzzle.update_display(
                         stdscr,
-                        message=message,
-                        timer_seconds=timer_seconds,
-                        full_update=False
+                        message=self.message,
+                        timer_seconds=self.timer_seconds(),
+                        full_update=curses.KEY_RESIZE in keys
                     )
 
-                # Update display at least once per second
-                if current_time - last_update_time >= 1:
-                    self.puzzle.update_display(
-                        stdscr,
-                        message=message,
-                        timer_seconds=timer_seconds,
-                        full_update=False
-                    )
-                    last_update_time = current_time
-
         except KeyboardInterrupt:
             stdscr.clear()
             stdscr.refresh()
             return
+        finally:
+            timer.cancel()
+            if self.journal is not None:
+                if not self.solved_at_start:
+                    # Time spent since the last move counts too
+                    self.journal.append("elapsed", seconds=round(self.timer_seconds(), 1))
+                self.journal.close()
         
 
-def read_mini_puzzle_data():
-    from mini.scrape import MINI_PUZZLE_FILENAME, write_mini_puzzle_data
-    
-    def get_clue(is_across: bool, number: str, clues: list[CrosswordClue]) -> str:
-        for clue in clues:
-            if clue.number == number and clue.is_across == is_across:
-                return clue
-        return None
+async def read_mini_puzzle_data(stdscr):
+    from mini.scrape import MINI_PUZZLE_FILENAME, fetch_mini_puzzle_data
     
-    
-    write_mini_puzzle_data() # temp
-    with open(MINI_PUZZLE_FILENAME, "r") as f:
-        data = json.load(f)
-    
-    puzzle = [[CrosswordCell(**d) for d in row] for row in data["grid"]]
-
+    data = await PUZZLE_CACHE.get(
+        MINI_PUZZLE_FILENAME,
+        fetch_mini_puzzle_data,
+        loading_waiter(stdscr, "Fetching Mini puzzle..."),
+    )
+    return mini_crossword(data)
+
+def mini_crossword(data):
     clues = [CrosswordClue(
         number=clue["number"],
         clue=clue["clue"],
         is_across=clue["direction"].lower() == "across"
     ) for clue in data["clues"]]
 
-    across_numbers = set([c.number for c in clues if c.is_across])
-    down_numbers = set([c.number for c in clues if not c.is_across])
-
-    for i in range(len(puzzle)):
-        for j in range(len(puzzle[i])):
-            cell = puzzle[i][j]
-            if cell.is_out_of_bounds:
-                continue
-            if cell.number is not None and cell.number in across_numbers:
-                last_number = cell.number
-            clue = get_clue(True, last_number, clues)
-            cell.across_clue = clue
-            puzzle[i][j] = cell
-            
-
-    for j in range(len(puzzle[0])):
-        for i in range(len(puzzle)):
-            cell = puzzle[i][j]
-            if cell.is_out_of_bounds:
-                continue
-            if cell.number is not None and cell.number in down_numbers:
-                last_number = cell.number
-            clue = get_clue(False, last_number, clues)
-            cell.down_clue = clue
-            puzzle[i][j] = cell
+    return data["date"], Crossword(data["grid"], clues)
 
-    return puzzle
-
-def mini_scene(stdscr):
+async def mini_scene(stdscr, archived=None):
     stdscr.clear()
-    puzzle = read_mini_puzzle_data()
-    crossword = Crossword(puzzle)
-    controller = CrosswordController(crossword)
-
-    controller.run(stdscr)
\ No newline at end of file
+    if archived is None:
+        date, crossword = await read_mini_puzzle_data(stdscr)
+        journal = MoveJournal("mini", date)
+    else:
+        date, crossword = mini_crossword(archived)
+        journal = ArchiveJournal("mini", archived)
+    elapsed = 0
+    for move in journal.replay():
+        if move["type"] == "cell":
+            crossword.set_cell(move["i"], move["j"], move["value"])
+            elapsed = move.get("elapsed", elapsed)
+        elif move["type"] == "elapsed":
+            elapsed = move["seconds"]
+    controller = CrosswordController(crossword, journal, elapsed)
+
+    await controller.run(stdscr)
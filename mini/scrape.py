@@ -1,8 +1,12 @@
 import os
+import re
 import json
 import time
+import logging
 import inspect
-from utils import full_page_screenshot, scrape_with_selenium
+from utils import full_page_screenshot
+from storage import write_json
+from providers import PuzzleProvider, get_provider, register_provider
 
 MINI_PUZZLE_FILENAME = os.path.expanduser("~/.wordgames/mini.json")
 SCREENSHOT_DIR = os.path.expanduser("~/Downloads/")
@@ -42,32 +46,110 @@ def reveal_mini_solution(driver):
     confirm_button.click()
 
 
-def get_mini_puzzle():
-    import bs4
+# The page's embedded state, e.g. <script>window.gameData = {...}</script>
+GAME_DATA_PATTERN = re.compile(r"window\.gameData\s*=\s*(\{.*?\})\s*;?\s*</script>", re.S)
+# Cell types in the puzzle state
+CIRCLED_CELL = 2
+
+
+def read_game_data(html):
+    match = GAME_DATA_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
+
+
+def puzzle_state(game_data):
+    """
+    The puzzle (publicationDate, and a body with cells, clues and dimensions) in the embedded state, if it's there.
+
+    This layout is assumed from NYT's puzzle JSON; no recorded page in fixtures/ carries it, so
+    it's untested against the live site and MiniProvider.parse falls back if it doesn't fit.
+    """
+    if not isinstance(game_data, dict):
+        return None
+    for state in (game_data, game_data.get("puzzle"), game_data.get("puzzleData")):
+        if isinstance(state, dict) and state.get("body"):
+            return state
+    return None
+
+
+def block_cell(i, j):
+    return {
+        "solution": None,
+        "number": None,
+        "is_circled": False,
+        "i": i,
+        "j": j,
+        "is_out_of_bounds": True,
+    }
 
-    url = "https://www.nytimes.com/crosswords/game/mini"
 
-    use_cached = False
+def parse_puzzle_state(state):
+    body = state["body"][0]
+    width, height = body["dimensions"]["width"], body["dimensions"]["height"]
+    grid = [[None] * width for _ in range(height)]
+    for index, cell in enumerate(body["cells"]):
+        i, j = divmod(index, width)
+        if not cell.get("answer"):
+            grid[i][j] = block_cell(i, j)
+        else:
+            grid[i][j] = {
+                "solution": cell["answer"][0],
+                "number": cell.get("label", ""),
+                "is_circled": cell.get("type") == CIRCLED_CELL,
+                "i": i,
+                "j": j,
+            }
+
+    clues = [
+        {
+            "number": clue["label"],
+            "clue": "".join(part.get("plain", "") for part in clue["text"]),
+            "direction": clue["direction"],
+        }
+        for clue in body["clues"]
+    ]
+    return state["publicationDate"], grid, clues
 
-    html = scrape_with_selenium(
-        url,
-        driver_actions=reveal_mini_solution,
-    )
+
+def read_puzzle_state(game_data):
+    """The puzzle in the embedded state as (date, grid, clues), or None if it's missing or laid out unexpectedly."""
+    state = puzzle_state(game_data)
+    if state is None:
+        logging.info("No puzzle in the Mini page's embedded state")
+        return None
+    try:
+        return parse_puzzle_state(state)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        logging.warning("Unexpected puzzle layout in the Mini page's embedded state: %r", e)
+        return None
+
+
+def parse_rendered_grid(html):
+    import bs4
 
     soup = bs4.BeautifulSoup(html, "html.parser")
 
-    raw_date = soup.find("div", attrs={"class": "xwd__details--date"}).contents[0].strip().split(", ")[1]
-    current_year = time.strftime("%Y")
-    raw_date_with_year = f"{raw_date}, {current_year}"
-    date = time.strftime("%Y-%m-%d", time.strptime(raw_date_with_year, "%B %d, %Y"))
+    # "Wednesday, July 2, 2025"; older pages omit the year
+    raw_date = soup.find("div", attrs={"class": "xwd__details--date"}).contents[0].strip().split(", ", 1)[1]
+    if not raw_date[-4:].isdigit():
+        raw_date = f"{raw_date}, {time.strftime('%Y')}"
+    date = time.strftime("%Y-%m-%d", time.strptime(raw_date, "%B %d, %Y"))
     
     g_elements = soup.find_all("g", attrs={"class": "xwd__cell"})
 
     def parse_cell(g):
         texts = g.find_all("text", attrs={"data-testid": "cell-text"})
         number = texts[0].text if len(texts) > 1 else ""
-        letter = texts[-1].text.strip()[0] if texts else ""
-        
+        # An unrevealed cell has no letter, only its number if it has one
+        letter = texts[-1].text.strip()[:1] if texts else ""
+        if not letter.isalpha():
+            letter = ""
+    
         return {
             "class": g.rect.get("class"),
             "x": float(g.rect.get("x")),
@@ -79,23 +161,16 @@ def get_mini_puzzle():
 
     cells = [parse_cell(g) for g in g_elements]
 
-    cols = sorted(list(set(c["x"] for c in cells)))
-    rows = sorted(list(set(c["y"] for c in cells)))
+    cols = {x: j for j, x in enumerate(sorted(set(c["x"] for c in cells)))}
+    rows = {y: i for i, y in enumerate(sorted(set(c["y"] for c in cells)))}
     grid = [[None for _ in cols] for _ in rows]
 
     for cell in cells:
-        row = rows.index(cell["y"])
-        col = cols.index(cell["x"])
+        row = rows[cell["y"]]
+        col = cols[cell["x"]]
 
         if "xwd__cell--block" in cell["class"]:
-            grid[row][col] = {
-                "solution": None,
-                "number": None,
-                "is_circled": False,
-                "i": row,
-                "j": col,
-                "is_out_of_bounds": True,
-            }
+            grid[row][col] = block_cell(row, col)
         else:
             grid[row][col] = {
                 "solution": cell["letter"],
@@ -105,8 +180,10 @@ def get_mini_puzzle():
                 "j": col,
             }
 
+    if any(not cell["solution"] for row in grid for cell in row if not cell.get("is_out_of_bounds")):
+        raise ValueError("The Mini's rendered grid hasn't been revealed, so it has no answers to read")
+
     clue_lists = soup.find_all("div", attrs={"class": "xwd__clue-list--wrapper"})
-    clues = soup.find_all("li", attrs={"class": "xwd__clue--li"})
     clues = []
 
     for clue_list in clue_lists:
@@ -121,13 +198,40 @@ def get_mini_puzzle():
 
     return date, grid, clues
 
-def write_mini_puzzle_data():
+
+@register_provider
+class MiniProvider(PuzzleProvider):
+    name = "mini"
+    base_url = "https://www.nytimes.com"
+    requires_browser = True
+
+    def path(self, date):
+        return "/crosswords/game/mini"
+
+    def driver_actions(self, driver):
+        # A readable embedded state already holds the solution; otherwise parse reads the grid, which must be revealed
+        if read_puzzle_state(driver.execute_script("return window.gameData || null")) is None:
+            reveal_mini_solution(driver)
+
+    def parse(self, html, date):
+        puzzle = read_puzzle_state(read_game_data(html))
+        if puzzle is not None:
+            return puzzle
+        if "xwd__cell" not in html:
+            # e.g. the page as served over plain HTTP, before any script has drawn the grid
+            raise ValueError("No Mini puzzle in the page: no usable embedded state and no rendered grid")
+        return parse_rendered_grid(html)
+
+def get_mini_puzzle():
+    return get_provider("mini").get()
+
+def fetch_mini_puzzle_data():
     date, grid, clues = get_mini_puzzle()
-    json_data = {
+    return {
         "date": date,
         "grid": grid,
         "clues": clues,
     }
-    with open(MINI_PUZZLE_FILENAME, "w") as f:
-        json.dump(json_data, f, indent=4)
 
+def write_mini_puzzle_data():
+    write_json(MINI_PUZZLE_FILENAME, fetch_mini_puzzle_data())
@@ -1,15 +1,15 @@
-from utils import vertical_buffer, horizontal_buffer, display_cols, display_rows
+import curses
 
-def placeholder_scene(stdscr):
-    stdscr.nodelay(True)
+async def placeholder_scene(stdscr):
     stdscr.clear()
     content = "Coming soon!"
     while True:
-        vbuffer = vertical_buffer(1, display_rows(stdscr))
-        hbuffer = horizontal_buffer(len(content) + 1, display_cols(stdscr))
-        stdscr.addstr(vbuffer, hbuffer, content)
+        region = stdscr.layout.centered(1, len(content) + 1)
+        stdscr.addstr(region.y, region.x, content)
         stdscr.refresh()
-        key = stdscr.getch()
-        if key == ord('q'):
+        key = await stdscr.read_key()
+        if key == curses.KEY_RESIZE:
+            stdscr.clear()
+        elif key == ord('q'):
             stdscr.clear()
             break
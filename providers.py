@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import config
+
+HTTP_TIMEOUT = 10
+
+_providers = {}
+
+
+class PuzzleProvider:
+    """
+    Fetches one game's daily puzzle page and parses it.
+
+    Subclasses set `name`, `base_url` and `requires_browser`, and implement `path` and `parse`.
+    Passing a base_url (or setting `provider_url` in the config) points the provider at another
+    origin, such as the local fixture server; pages from there are fetched over plain HTTP.
+    So are browser pages in low-power mode, where parse must make do with the served HTML.
+    """
+    name: str = None
+    base_url: str = None
+    requires_browser = False
+
+    def __init__(self, base_url=None):
+        self.is_override = base_url is not None
+        if self.is_override:
+            self.base_url = base_url.rstrip("/")
+
+    def path(self, date: datetime) -> str:
+        raise NotImplementedError
+
+    def parse(self, html: str, date: datetime):
+        raise NotImplementedError
+
+    def driver_actions(self, driver):
+        pass
+
+    def url(self, date: datetime = None) -> str:
+        return self.base_url + self.path(date or datetime.now())
+
+    def uses_browser(self) -> bool:
+        from utils import low_power
+        return self.requires_browser and not self.is_override and not low_power()
+
+    def fetch_html(self, url: str) -> str:
+        if self.uses_browser():
+            from utils import scrape_with_selenium
+            return scrape_with_selenium(url, driver_actions=self.driver_actions)
+
+        import requests
+        response = requests.get(url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+    def get(self, date: datetime = None):
+        date = date or datetime.now()
+        return self.parse(self.fetch_html(self.url(date)), date)
+
+
+def register_provider(cls):
+    """Class decorator making cls the provider for cls.name."""
+    _providers[cls.name] = cls
+    return cls
+
+
+def get_provider(name: str, base_url: str = None) -> PuzzleProvider:
+    return _providers[name](base_url or config.get("provider_url"))
@@ -0,0 +1,128 @@
+import os
+import time
+import logging
+import asyncio
+import threading
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import bundle
+import journal
+from storage import read_json, write_json, file_lock
+
+CACHE_DIR = os.path.expanduser("~/.wordgames")
+
+# Keys that belong to the player rather than the puzzle; a refetch of the same day keeps them.
+PROGRESS_KEYS = ("guesses", "is_finished")
+
+# A current cached puzzle is revalidated in the background at most this often (seconds).
+REVALIDATE_AFTER = 60 * 60
+
+# Fetches and revalidations block on the network, so they share a few long-lived threads;
+# one per game is enough, since each file has at most one fetch in flight.
+FETCH_WORKERS = 4
+_fetcher = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="puzzle-fetch")
+
+
+def today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def game_name(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def is_current(data):
+    return data is not None and data.get("date") == today()
+
+
+def is_fresh(data):
+    return is_current(data) and time.time() - data.get("fetched_at", 0) <= REVALIDATE_AFTER
+
+
+class PuzzleCache:
+    """
+    Stale-while-revalidate loader for the daily puzzle files in ~/.wordgames.
+
+    Today's cached puzzle is served straight from disk, concurrent fetches of the same
+    file share one request (across processes too, via a lock file), and a failed fetch
+    falls back to the last good copy. Days found in an installed bundle are never fetched.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+
+    def fetch(self, filename, fetch_fn) -> Future:
+        """Start fetch_fn in the background, or join the fetch already running for filename."""
+        with self._lock:
+            future = self._in_flight.get(filename)
+            if future is None:
+                future = Future()
+                # Shared by every waiter, so one waiter giving up mustn't cancel it,
+                # even while it's still queued for a worker
+                future.set_running_or_notify_cancel()
+                self._in_flight[filename] = future
+                _fetcher.submit(self._run, filename, fetch_fn, future)
+            return future
+
+    def _run(self, filename, fetch_fn, future):
+        try:
+            with file_lock(filename + ".fetch"):
+                # Another process may have fetched while we waited for the lock
+                cached = read_json(filename)
+                data = cached if is_fresh(cached) else self._store(filename, self._load(filename, fetch_fn))
+        except Exception as e:
+            logging.warning("Fetch for %s failed: %r", filename, e)
+            with self._lock:
+                self._in_flight.pop(filename, None)
+            future.set_exception(e)
+        else:
+            with self._lock:
+                self._in_flight.pop(filename, None)
+            future.set_result(data)
+
+    def _load(self, filename, fetch_fn):
+        # An installed bundle's copy of today's puzzle saves going to the network
+        bundled = bundle.find_puzzle(game_name(filename), today())
+        return bundled if bundled is not None else fetch_fn()
+
+    def _store(self, filename, data):
+        with file_lock(filename):
+            cached = read_json(filename)
+            if cached is not None and cached.get("date") == data.get("date"):
+                for key in PROGRESS_KEYS:
+                    if key in cached:
+                        data[key] = cached[key]
+            elif cached is not None:
+                # A new day: fold the finished puzzle and its move journal into the history archive
+                journal.compact(game_name(filename), cached)
+            data["fetched_at"] = time.time()
+            write_json(filename, data)
+        return data
+
+    async def get(self, filename, fetch_fn, wait_fn=None):
+        """
+        Return today's puzzle for filename.
+
+        A current cached copy is returned immediately (and revalidated in the background
+        once it is older than REVALIDATE_AFTER). Otherwise the fetch is awaited, through
+        wait_fn if given (e.g. a loading animation), and the last good copy is returned
+        if it fails.
+        """
+        cached = read_json(filename)
+        if is_current(cached):
+            if not is_fresh(cached):
+                self.fetch(filename, fetch_fn)
+            return cached
+
+        future = asyncio.wrap_future(self.fetch(filename, fetch_fn))
+        try:
+            return await (wait_fn(future) if wait_fn else future)
+        except Exception:
+            if cached is None:
+                raise
+            return cached
+
+
+PUZZLE_CACHE = PuzzleCache()
@@ -0,0 +1,439 @@
+import curses
+import asyncio
+import argparse
+
+import logs
+import journal
+from layout import Layout
+from eventloop import read_burst
+from theme import PAIR_COLORS
+
+# Telnet protocol bytes
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+ECHO, SGA, NAWS = 1, 3, 31
+
+CTRL_C = 3
+ESCAPE_SEQUENCES = {
+    b"[A": curses.KEY_UP,
+    b"[B": curses.KEY_DOWN,
+    b"[C": curses.KEY_RIGHT,
+    b"[D": curses.KEY_LEFT,
+    b"OA": curses.KEY_UP,
+    b"OB": curses.KEY_DOWN,
+    b"OC": curses.KEY_RIGHT,
+    b"OD": curses.KEY_LEFT,
+}
+
+# Client output beyond this is dropped and replaced by a full repaint on the next refresh.
+MAX_BUFFERED_OUTPUT = 256 * 1024
+
+# Window sizes reported by clients beyond this are ignored
+MAX_SIZE = 1000
+
+BLANK = (" ", 0)
+
+
+class SessionClosed(Exception):
+    pass
+
+
+class InputDecoder:
+    """Turns raw telnet client bytes into curses key codes and window size reports."""
+
+    def __init__(self):
+        self.pending = b""
+
+    def feed(self, data: bytes) -> tuple[list[int], tuple[int, int]]:
+        keys = []
+        size = None
+        data = self.pending + data
+        self.pending = b""
+        i = 0
+        while i < len(data):
+            b = data[i]
+            if b == IAC:
+                if i + 1 >= len(data):
+                    break
+                command = data[i + 1]
+                if command in (DO, DONT, WILL, WONT):
+                    if i + 2 >= len(data):
+                        break
+                    i += 3
+                elif command == SB:
+                    end = data.find(bytes([IAC, SE]), i)
+                    if end < 0:
+                        break
+                    if data[i + 2] == NAWS and end - i >= 7:
+                        cols = data[i + 3] << 8 | data[i + 4]
+                        rows = data[i + 5] << 8 | data[i + 6]
+                        size = (rows, cols)
+                    i = end + 2
+                elif command == IAC:
+                    keys.append(IAC)
+                    i += 2
+                else:
+                    i += 2
+                continue
+            if b == 0x1b and data[i + 1:i + 2] in (b"[", b"O"):
+                if i + 2 >= len(data):
+                    break
+                sequence = data[i + 1:i + 3]
+                if sequence in ESCAPE_SEQUENCES:
+                    keys.append(ESCAPE_SEQUENCES[sequence])
+                    i += 3
+                    continue
+            if b == 13:
+                keys.append(10)
+                # Telnet sends CR LF or CR NUL for Enter
+                if data[i + 1:i + 2] in (b"\n", b"\0"):
+                    i += 1
+            elif b == 8:
+                keys.append(127)
+            elif b != 0:
+                keys.append(b)
+            i += 1
+        self.pending = data[i:]
+        return keys, size
+
+
+def sgr(attr: int) -> str:
+    codes = ["0"]
+    if attr & curses.A_BOLD:
+        codes.append("1")
+    if attr & curses.A_DIM:
+        codes.append("2")
+    if attr & curses.A_REVERSE:
+        codes.append("7")
+    pair = (attr & curses.A_COLOR) >> 8
+    if pair in PAIR_COLORS:
+        codes.append(f"38;5;{PAIR_COLORS[pair]}")
+    return f"\x1b[{';'.join(codes)}m"
+
+
+def render_diff(previous, frame) -> str:
+    """ANSI output that turns a client showing `previous` (None for unknown) into `frame`."""
+    out = []
+    if previous is None:
+        out.append("\x1b[0m\x1b[H\x1b[2J")
+    attr = None
+    for y, row in enumerate(frame):
+        old_row = previous[y] if previous is not None else None
+        if old_row == row:
+            continue
+        x = 0
+        while x < len(row):
+            cell = row[x]
+            if (old_row[x] if old_row is not None else BLANK) == cell:
+                x += 1
+                continue
+            out.append(f"\x1b[{y + 1};{x + 1}H")
+            while x < len(row) and (old_row[x] if old_row is not None else BLANK) != row[x]:
+                ch, cell_attr = row[x]
+                if cell_attr != attr:
+                    out.append(sgr(cell_attr))
+                    attr = cell_attr
+                out.append(ch)
+                x += 1
+    if attr is not None:
+        out.append("\x1b[0m")
+    return "".join(out)
+
+
+class RemoteWindow:
+    """A rectangle of a RemoteScreen's cells drawn in its own coordinates, like a curses derwin."""
+
+    def __init__(self, screen, y, x, rows, cols):
+        self.screen = screen
+        self.y, self.x = y, x
+        self.rows, self.cols = rows, cols
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def erase(self):
+        for y in range(self.y, self.y + self.rows):
+            self.screen.cells[y][self.x:self.x + self.cols] = [BLANK] * self.cols
+            self.screen.touched.add(y)
+
+    def clear(self):
+        self.erase()
+
+    def _row(self, y):
+        self.screen.touched.add(self.y + y)
+        return self.screen.cells[self.y + y]
+
+    def addstr(self, y, x, text, attr=0):
+        if not (0 <= y < self.rows and 0 <= x < self.cols):
+            raise curses.error("addstr() returned ERR")
+        row = self._row(y)
+        for ch in text:
+            if ch == "\n":
+                row[self.x + x:self.x + self.cols] = [BLANK] * (self.cols - x)
+                y, x = y + 1, 0
+                if y >= self.rows:
+                    return
+                row = self._row(y)
+                continue
+            if x >= self.cols:
+                y, x = y + 1, 0
+                if y >= self.rows:
+                    raise curses.error("addstr() returned ERR")
+                row = self._row(y)
+            row[self.x + x] = (ch, attr)
+            x += 1
+
+    def insstr(self, y, x, text, attr=0):
+        if not (0 <= y < self.rows and 0 <= x < self.cols):
+            raise curses.error("insstr() returned ERR")
+        row = self._row(y)
+        start, end = self.x + x, self.x + self.cols
+        row[start:end] = ([(ch, attr) for ch in text] + row[start:end])[:end - start]
+
+    def noutrefresh(self):
+        # The cells are the screen's own, so there is nothing to copy
+        pass
+
+
+class RemoteScreen:
+    """
+    The subset of the curses window API the scenes use, drawn into a cell buffer
+    and sent to a remote terminal as ANSI diffs on refresh() or doupdate().
+    """
+
+    def __init__(self, session, rows=24, cols=80):
+        self.session = session
+        self.rows, self.cols = rows, cols
+        self.layout = Layout(rows, cols)
+        self.cells = self._blank()
+        self.whole = RemoteWindow(self, 0, 0, rows, cols)
+        # Rows written since the last frame; only these are compared with what was sent
+        self.touched = set()
+        self.sent = None
+        self.keys = asyncio.Queue()
+        self.pending_size = None
+        # Set when a Ctrl-C ends a burst of keys; the next read raises it
+        self.interrupted = False
+
+    def _blank(self):
+        return [[BLANK] * self.cols for _ in range(self.rows)]
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def keypad(self, flag):
+        pass
+
+    def clear(self):
+        self.erase()
+        self.invalidate()
+
+    def erase(self):
+        self.cells = self._blank()
+        self.touched = set(range(self.rows))
+
+    def derwin(self, rows, cols, y, x):
+        if not (0 <= y and 0 <= x and rows > 0 and cols > 0 and y + rows <= self.rows and x + cols <= self.cols):
+            raise curses.error("derwin() returned NULL")
+        return RemoteWindow(self, y, x, rows, cols)
+
+    def addstr(self, y, x, text, attr=0):
+        self.whole.addstr(y, x, text, attr)
+
+    def insstr(self, y, x, text, attr=0):
+        self.whole.insstr(y, x, text, attr)
+
+    def noutrefresh(self):
+        pass
+
+    def doupdate(self):
+        if self.sent is None:
+            frame = [row[:] for row in self.cells]
+        else:
+            frame = list(self.sent)
+            for y in self.touched:
+                frame[y] = self.cells[y][:]
+        self.touched.clear()
+        output = render_diff(self.sent, frame)
+        self.sent = frame
+        if output:
+            self.session.send(output.encode())
+
+    def refresh(self):
+        self.doupdate()
+
+    def invalidate(self):
+        """Repaint everything on the next refresh."""
+        self.sent = None
+
+    def resize(self, rows, cols):
+        """Report a new client size; like curses, it takes effect when read_key returns KEY_RESIZE."""
+        self.pending_size = (rows, cols)
+        self.keys.put_nowait(curses.KEY_RESIZE)
+
+    def key_pending(self) -> bool:
+        return self.interrupted or not self.keys.empty()
+
+    async def read_keys(self) -> list[int]:
+        return await read_burst(self)
+
+    async def read_key(self, timeout=None) -> int:
+        """Wait for the next key, or return -1 after timeout seconds."""
+        if self.interrupted:
+            self.interrupted = False
+            raise KeyboardInterrupt()
+        try:
+            key = await asyncio.wait_for(self.keys.get(), timeout)
+        except asyncio.TimeoutError:
+            return -1
+        if key is None:
+            raise SessionClosed()
+        if key == CTRL_C:
+            raise KeyboardInterrupt()
+        if key == curses.KEY_RESIZE:
+            if self.pending_size is None:
+                # Already applied by an earlier KEY_RESIZE in the same burst
+                return await self.read_key(timeout)
+            self.rows, self.cols = self.pending_size
+            self.layout = Layout(self.rows, self.cols)
+            self.whole = RemoteWindow(self, 0, 0, self.rows, self.cols)
+            self.pending_size = None
+            self.erase()
+            self.invalidate()
+        return key
+
+    def close(self):
+        self.keys.put_nowait(None)
+
+
+class Session:
+    """One connected terminal: its own screen and scene state, with buffered output."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.screen = RemoteScreen(self)
+        self.decoder = InputDecoder()
+        self.output = bytearray()
+        self.output_ready = asyncio.Event()
+        self.closed = False
+
+    def send(self, data: bytes):
+        """Queue output for the client without waiting for it to be written."""
+        if len(self.output) + len(data) > MAX_BUFFERED_OUTPUT:
+            # The client isn't keeping up: drop the backlog and send a full frame next time
+            self.output.clear()
+            self.screen.invalidate()
+            return
+        self.output += data
+        self.output_ready.set()
+
+    async def write_output(self):
+        while not self.closed or self.output:
+            await self.output_ready.wait()
+            self.output_ready.clear()
+            if self.output:
+                data = bytes(self.output)
+                self.output.clear()
+                self.writer.write(data)
+                await self.writer.drain()
+
+    async def read_input(self):
+        while True:
+            data = await self.reader.read(1024)
+            if not data:
+                break
+            keys, size = self.decoder.feed(data)
+            if size is not None and 0 < size[0] <= MAX_SIZE and 0 < size[1] <= MAX_SIZE:
+                self.screen.resize(*size)
+            for key in keys:
+                self.screen.keys.put_nowait(key)
+        self.screen.close()
+
+
+class GameServer:
+    """
+    Hosts the games for many terminals on one asyncio loop.
+
+    Each connection runs its own scene (the main menu by default) as a coroutine against a RemoteScreen.
+    Sessions share the process-wide puzzle cache, so each day's scrape happens once.
+    """
+
+    def __init__(self, scene=None, host="127.0.0.1", port=2323, max_sessions=512):
+        if scene is None:
+            from main import main as scene
+        self.scene = scene
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.sessions: set[Session] = set()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        self.server.close()
+        for session in self.sessions:
+            session.screen.close()
+
+    async def run_scene(self, screen):
+        journal.JOURNALING.set(False)
+        try:
+            await self.scene(screen)
+        except (SessionClosed, KeyboardInterrupt):
+            # Raised from read_key when the client disconnects or presses Ctrl-C outside a scene
+            pass
+
+    async def handle(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"Server full, try again later.\r\n")
+            writer.close()
+            return
+        session = Session(reader, writer)
+        self.sessions.add(session)
+
+        writer.write(bytes([IAC, WILL, ECHO, IAC, WILL, SGA, IAC, DO, NAWS]))
+        writer.write(b"\x1b[?1049h\x1b[?25l")
+
+        output = asyncio.create_task(session.write_output())
+        reader_task = asyncio.create_task(session.read_input())
+        try:
+            # Each connection is its own task, so the JOURNALING set in run_scene stays local to it
+            await self.run_scene(session.screen)
+        finally:
+            reader_task.cancel()
+            session.closed = True
+            session.output += b"\x1b[0m\x1b[?25h\x1b[?1049l"
+            session.output_ready.set()
+            try:
+                await output
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.sessions.discard(session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host the word games for telnet clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2323)
+    parser.add_argument("--max-sessions", type=int, default=512)
+    args = parser.parse_args()
+    logs.setup()
+
+    async def serve():
+        server = await GameServer(host=args.host, port=args.port, max_sessions=args.max_sessions).start()
+        print(f"Serving word games on telnet://{args.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -6,6 +6,10 @@ import english_dictionary.scripts.read_pickle as dictionary
 from dataclasses import dataclass
 
 import utils
+import stats
+from layout import Region
+from compositor import Compositor
+from journal import ArchiveJournal, MoveJournal
 from spellingbee.scrape import load_spellingbee_data
 
 
@@ -20,6 +24,17 @@ GRID_CHARACTER_COLOR_MAPPING = [
 ]
 
 
+def _grid_color(p: int) -> str:
+    for start, end, span_color in GRID_CHARACTER_COLOR_MAPPING:
+        if start <= p < end:
+            return span_color
+    return "white"
+
+
+# The color name of each grid character, worked out once
+GRID_COLORS = [[_grid_color(i * GRID_WIDTH + j) for j in range(GRID_WIDTH)] for i in range(GRID_HEIGHT)]
+
+
 def get_rank(score: int, max_score: int) -> str:
     percentage = score / max_score
     if percentage < 0.02:
@@ -44,6 +59,56 @@ def get_rank(score: int, max_score: int) -> str:
         return "Queen Bee"
 
 
+def grid_offsets(layout) -> tuple[int, int]:
+    def compute(layout):
+        grid = layout.centered(GRID_HEIGHT, GRID_WIDTH)
+        # Sit a little above centre to leave room for the input and messages
+        return math.floor(grid.y * 0.8), grid.x
+    return layout.region("spellingbee", compute)
+
+
+def regions(layout) -> dict[str, Region]:
+    vertical_offset, horizontal_offset = grid_offsets(layout)
+    return {
+        "hive": Region(vertical_offset, horizontal_offset, GRID_HEIGHT, GRID_WIDTH),
+        "input": Region(vertical_offset + GRID_HEIGHT + 1, 0, 1, layout.cols),
+        "message": Region(vertical_offset + GRID_HEIGHT + 3, 0, 1, layout.cols),
+        "score": Region(vertical_offset + GRID_HEIGHT + 4, 0, 1, layout.cols),
+    }
+
+
+def compositor(stdscr) -> Compositor:
+    return Compositor(stdscr, "spellingbee", regions)
+
+
+def draw_grid(screen: Compositor, outer_letters: list[str], center_letter: chr):
+    grid = GRID_TEMPLATE
+    for i in range(6):
+        grid = grid.replace(str(i+1), outer_letters[i].upper() if i < len(outer_letters) else " ")
+    grid = grid.replace('7', center_letter.upper() or " ")
+    grid_lines = grid.split("\n")
+    for i in range(GRID_HEIGHT):
+        for j in range(GRID_WIDTH):
+            screen.addstr("hive", i, j, grid_lines[i][j], utils.Palette.from_name(GRID_COLORS[i][j]))
+
+
+def show_message(screen: Compositor, message: str, color=None):
+    screen.addstr("message", 0, 0, utils.center_text(screen.stdscr, message), color or utils.Palette.white())
+
+
+def draw_empty_grid(stdscr):
+    screen = compositor(stdscr)
+    screen.clear()
+    draw_grid(screen, [], "")
+    screen.show()
+
+
+def show_loading(stdscr, text: str):
+    screen = compositor(stdscr)
+    show_message(screen, text)
+    screen.show()
+
+
 @dataclass
 class GuessResult:
     word: str
@@ -70,6 +135,8 @@ class SpellingBeeGame:
         self.message = f"Welcome to Spelling Bee!"
         self.input_buffer = ""
         self.guesses = []
+        self.screen = None
+        self.shown_score = None
 
     @property
     def rank(self) -> str:
@@ -138,28 +205,17 @@ class SpellingBeeGame:
         return word
 
     def update_display(self, stdscr, highlight: bool = False, full_update: bool = False, guess_submitted: bool = False, reshuffle: bool = False):
+        if self.screen is None or self.screen.stdscr is not stdscr:
+            self.screen = compositor(stdscr)
+        screen = self.screen
         if full_update:
-            stdscr.clear()
+            screen.clear()
+            self.shown_score = None
         
-        vertical_offset = math.floor(utils.vertical_buffer(GRID_HEIGHT, utils.display_rows(stdscr)) * 0.8)
-        horizontal_offset = utils.horizontal_buffer(GRID_WIDTH, utils.display_cols(stdscr))
-        
-        if full_update or reshuffle:
-            grid = GRID_TEMPLATE
+        if reshuffle:
             random.shuffle(self.outer_letters)
-            for i, letter in enumerate(self.outer_letters):
-                grid = grid.replace(str(i+1), letter.upper())
-            grid = grid.replace('7', self.center_letter.upper())
-            grid_lines = grid.split("\n")
-            for i in range(GRID_HEIGHT):
-                for j in range(GRID_WIDTH):
-                    chr_color = 'white'
-                    for start, end, span_color in GRID_CHARACTER_COLOR_MAPPING:
-                        p = i * GRID_WIDTH + j
-                        if p >= start and p < end:
-                            chr_color = span_color
-                            break
-                    stdscr.addstr(vertical_offset + i, horizontal_offset + j, grid_lines[i][j], utils.Palette.from_name(chr_color))
+        if full_update or reshuffle:
+            draw_grid(screen, self.outer_letters, self.center_letter)
 
         current_input = utils.center_text(stdscr, self.input_buffer.upper())
         for i in range(len(current_input)):
@@ -170,24 +226,29 @@ class SpellingBeeGame:
                 color = utils.Palette.yellow()
             else:
                 color = utils.Palette.white()
-            stdscr.addstr(vertical_offset + GRID_HEIGHT + 1, i, c, color)
+            screen.addstr("input", 0, i, c, color)
 
         if full_update or guess_submitted:
             score_display = f"{self.score / self.max_score:.2%} / {self.rank} / {self.score} pts"
             message_color = utils.Palette.yellow() if highlight else utils.Palette.white()
-            stdscr.addstr(vertical_offset + GRID_HEIGHT + 3, 0, utils.center_text(stdscr, self.message), message_color)
-            stdscr.addstr(vertical_offset + GRID_HEIGHT + 4, 0, utils.center_text(stdscr, score_display), utils.Palette.gray())
+            show_message(screen, self.message, message_color)
+            if score_display != self.shown_score:
+                screen.addstr("score", 0, 0, utils.center_text(stdscr, score_display), utils.Palette.gray())
+                self.shown_score = score_display
         
-        stdscr.refresh()
+        screen.show()
 
 
-def spellingbee_scene(stdscr):
-    curses.curs_set(0)
-    stdscr.nodelay(1)
-    stdscr.timeout(100)
+async def spellingbee_scene(stdscr, archived=None):
+    utils.hide_cursor()
     stdscr.clear()
 
-    spellingbee_data = load_spellingbee_data(stdscr)
+    # Draw the empty hive straight away if the words have to be fetched
+    spellingbee_data = archived or await load_spellingbee_data(
+        stdscr,
+        layout=lambda: draw_empty_grid(stdscr),
+        show=lambda text: show_loading(stdscr, text),
+    )
     solution_words = spellingbee_data["spellingbee_words"]
     center_letter = spellingbee_data["center_letter"]
     letters = spellingbee_data["letters"]
@@ -197,31 +258,52 @@ def spellingbee_scene(stdscr):
         center_letter=center_letter,
         solution_words=solution_words,
     )
+
+    journal = MoveJournal("spellingbee", spellingbee_data["date"]) if archived is None else ArchiveJournal("spellingbee", archived)
+    for move in journal.replay():
+        if move["type"] == "guess":
+            game.guess(move["word"])
+    if game.guesses:
+        game.message = f"Welcome back! {len(game.guesses)} words found so far."
     
     game.update_display(stdscr, full_update=True)
 
     try:
         while True:
-            key = stdscr.getch()
-            if key == curses.KEY_BACKSPACE or key == 127:
-                game.input_buffer = game.input_buffer[:-1]
-                game.update_display(stdscr)
-            elif key == curses.KEY_ENTER or key in [10, 13]:
-                word = game.guess(game.input_buffer)
-                is_correct_pangram = word in game.guesses and game.is_pangram(word)
-                game.update_display(stdscr, guess_submitted=True, highlight=is_correct_pangram)
-            elif key == ord('1'):
-                game.update_display(stdscr, reshuffle=True)
-            elif key == ord('2'):
-                game.message = f"Words: {len(game.guesses)}/{len(game.solution_words)}, Score: {game.score}/{game.max_score}"
-                game.update_display(stdscr, guess_submitted=True)
-            elif key == ord('3'):
-                game.message = f"Pangrams: {game.pangrams_found}/{game.max_pangrams}, Perfect pangrams: {game.perfect_pangrams_found}/{game.max_perfect_pangrams}"
-                game.update_display(stdscr, guess_submitted=True)
-            elif curses.ascii.isalpha(key):
-                game.input_buffer += chr(key).lower()
-                game.update_display(stdscr)
+            # Apply every key typed or pasted since the last frame, then draw once
+            redraw = full_update = guess_submitted = reshuffle = highlight = False
+            for key in await stdscr.read_keys():
+                if key == curses.KEY_RESIZE:
+                    full_update = True
+                elif key == curses.KEY_BACKSPACE or key == 127:
+                    game.input_buffer = game.input_buffer[:-1]
+                elif key == curses.KEY_ENTER or key in [10, 13]:
+                    words_found = len(game.guesses)
+                    word = game.guess(game.input_buffer)
+                    if len(game.guesses) > words_found:
+                        journal.append("guess", word=word)
+                    guess_submitted = True
+                    highlight = word in game.guesses and game.is_pangram(word)
+                elif key == ord('1'):
+                    reshuffle = True
+                elif key == ord('2'):
+                    game.message = f"Words: {len(game.guesses)}/{len(game.solution_words)}, Score: {game.score}/{game.max_score}"
+                    guess_submitted, highlight = True, False
+                elif key == ord('3'):
+                    game.message = f"Pangrams: {game.pangrams_found}/{game.max_pangrams}, Perfect pangrams: {game.perfect_pangrams_found}/{game.max_perfect_pangrams}"
+                    guess_submitted, highlight = True, False
+                elif curses.ascii.isalpha(key):
+                    game.input_buffer += chr(key).lower()
+                else:
+                    continue
+                redraw = True
+            if redraw:
+                game.update_display(stdscr, highlight=highlight, full_update=full_update, guess_submitted=guess_submitted, reshuffle=reshuffle)
     except KeyboardInterrupt:
         stdscr.clear()
         stdscr.refresh()
         return
+    finally:
+        if game.guesses and journal.records_stats:
+            stats.record_spellingbee(journal.date, game.rank, game.score)
+        journal.close()
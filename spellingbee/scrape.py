@@ -3,18 +3,13 @@ import os
 import json
 import logging
 
-from loading_scene import run_loading_animation
-from utils import scrape_with_selenium
+from loading_scene import loading_waiter
+from puzzle_cache import PUZZLE_CACHE
+from providers import PuzzleProvider, get_provider, register_provider
 
 SPELLINGBEE_FILENAME = os.path.expanduser("~/.wordgames/spellingbee.json")
-SPELLINGBEE_LOG = os.path.expanduser("~/.wordgames/spellingbee.log")
 
-# Set up logging
-logging.basicConfig(
-    filename=SPELLINGBEE_LOG,
-    level=logging.INFO,
-    format='%(asctime)s - %(message)s'
-)
+logger = logging.getLogger(__name__)
 
 def is_valid_spellingbee_word(word):
     is_valid_format = len(word) > 3 and word.isalpha() 
@@ -22,66 +17,41 @@ def is_valid_spellingbee_word(word):
     # Scraped page contains non-words like cdEklow that need to be removed
     # These are always the 7 letters with one emphasized by case
     is_non_word = word != word.lower() and len(set(word)) == 7
-    if not is_non_word:
-        logging.info(f"Removed non-word: {word}")
+    if is_non_word:
+        logger.info("Removed non-word: %s", word)
 
     return is_valid_format and not is_non_word
 
+@register_provider
+class SpellingBeeProvider(PuzzleProvider):
+    name = "spellingbee"
+    base_url = "https://www.nytimes.com"
+    requires_browser = True
+
+    def path(self, date):
+        return "/puzzles/spelling-bee"
+
+    def parse(self, html, date):
+        import bs4
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        game_data_raw = soup.find(
+            "div",
+            attrs={
+                "id": "js-hook-pz-moment__game"
+            },
+            recursive=True
+        ).script.text.replace("window.gameData = ", "").replace(";", "")
+        
+        game_data = json.loads(game_data_raw)
+
+        date = game_data["today"]["printDate"]
+        center_letter = game_data["today"]["centerLetter"]
+        spellingbee_words = game_data["today"]["answers"]
+
+        return center_letter, spellingbee_words, date
+
 def get_spellingbee_words():
-    import bs4
-    url = "https://www.nytimes.com/puzzles/spelling-bee"
-
-    # Use scrape_with_selenium to fetch the page source
-    html = scrape_with_selenium(url)
-    # Temporary to avoid rate limiting
-    # with open(os.path.expanduser("~/Downloads/spellingbee.html"), "r") as f:
-    #     html = f.read()
-
-    soup = bs4.BeautifulSoup(html, "html.parser")
-    game_data_raw = soup.find(
-        "div",
-        attrs={
-            "id": "js-hook-pz-moment__game"
-        },
-        recursive=True
-    ).script.text.replace("window.gameData = ", "").replace(";", "")
-    
-    game_data = json.loads(game_data_raw)
-
-    date = game_data["today"]["printDate"]
-    center_letter = game_data["today"]["centerLetter"]
-    spellingbee_words = game_data["today"]["answers"]
-
-    return center_letter, spellingbee_words, date
-
-def update_spellingbee_data(spellingbee_words, center_letter, date):
-    letters = set(center_letter)
-    for word in spellingbee_words:
-        letters.update(word)
-    spellingbee_data = {
-        "spellingbee_words": spellingbee_words,
-        "letters": ''.join(letters),
-        "center_letter": center_letter,
-        "date": date,
-        "guesses": [],
-    }
-    
-    if not os.path.exists(os.path.dirname(SPELLINGBEE_FILENAME)):
-        os.makedirs(os.path.dirname(SPELLINGBEE_FILENAME))
-    
-    if not os.path.exists(SPELLINGBEE_FILENAME):
-        with open(SPELLINGBEE_FILENAME, "w") as f:
-            json.dump(spellingbee_data, f)
-    else:
-        with open(SPELLINGBEE_FILENAME, "r") as f:
-            try:
-                data = json.load(f)
-                if data["date"] != spellingbee_data["date"]:
-                    with open(SPELLINGBEE_FILENAME, "w") as g:
-                        json.dump(spellingbee_data, g)
-            except json.JSONDecodeError:
-                with open(SPELLINGBEE_FILENAME, "w") as g:
-                    json.dump(spellingbee_data, g)
+    return get_provider("spellingbee").get()
 
 def validate_spellingbee_words(spellingbee_words, center_letter):
     letters = set(center_letter)
@@ -92,18 +62,24 @@ def validate_spellingbee_words(spellingbee_words, center_letter):
     if len(letters) != 7:
         raise ValueError("solution contains wrong number of letters: {}".format(letters))
 
-def load_spellingbee_data(stdscr):
-    stdscr.clear()
-
-    center_letter, spellingbee_words, date = run_loading_animation(stdscr, get_spellingbee_words, "Fetching SpellingBee words...", min_time=0.5)
-    try:
-        validate_spellingbee_words(spellingbee_words, center_letter)
-    except ValueError as e:
-        import pdb; pdb.set_trace()
+def fetch_spellingbee_data():
+    center_letter, spellingbee_words, date = get_spellingbee_words()
+    validate_spellingbee_words(spellingbee_words, center_letter)
 
-    update_spellingbee_data(spellingbee_words, center_letter, date)
-
-    with open(SPELLINGBEE_FILENAME, "r") as f:
-        spellingbee_data = json.load(f)
+    letters = set(center_letter)
+    for word in spellingbee_words:
+        letters.update(word)
+    return {
+        "spellingbee_words": spellingbee_words,
+        "letters": ''.join(letters),
+        "center_letter": center_letter,
+        "date": date,
+        "guesses": [],
+    }
 
-    return spellingbee_data
+async def load_spellingbee_data(stdscr, layout=None, show=None):
+    return await PUZZLE_CACHE.get(
+        SPELLINGBEE_FILENAME,
+        fetch_spellingbee_data,
+        loading_waiter(stdscr, "Fetching SpellingBee words...", layout, show),
+    )
@@ -0,0 +1,101 @@
+import os
+from datetime import date as Date, timedelta
+
+import journal
+from storage import read_json, write_json, file_lock
+
+STATS_FILE = os.path.expanduser("~/.wordgames/stats.json")
+
+# How many recent Spelling Bee ranks and Mini times are kept for the dashboard
+HISTORY_LENGTH = 14
+
+
+def load_stats() -> dict:
+    return read_json(STATS_FILE) or {}
+
+
+def _is_next_day(previous, date):
+    return previous is not None and Date.fromisoformat(previous) + timedelta(days=1) == Date.fromisoformat(date)
+
+
+def _update(game, date, update):
+    """
+    Apply update(game_stats) once per game per date, under the stats lock.
+
+    The aggregates in stats.json are only ever adjusted by one finished game, so reading
+    them (and opening the dashboard) never depends on how much history there is.
+    """
+    if not journal.JOURNALING.get():
+        return
+    with file_lock(STATS_FILE):
+        stats = load_stats()
+        game_stats = stats.setdefault(game, {"played": 0})
+        if game_stats.get("last_date") is not None and game_stats["last_date"] >= date:
+            return
+        game_stats["played"] += 1
+        update(game_stats)
+        game_stats["last_date"] = date
+        write_json(STATS_FILE, stats)
+
+
+def _record_result(game_stats, date, won):
+    game_stats["won"] = game_stats.get("won", 0) + won
+    if won:
+        streak = game_stats.get("streak", 0) if _is_next_day(game_stats.get("last_won_date"), date) else 0
+        game_stats["streak"] = streak + 1
+        game_stats["max_streak"] = max(game_stats.get("max_streak", 0), game_stats["streak"])
+        game_stats["last_won_date"] = date
+    else:
+        game_stats["streak"] = 0
+
+
+def _increment(counts, key):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def record_wordle(date, won, guesses):
+    def update(game_stats):
+        _record_result(game_stats, date, won)
+        _increment(game_stats.setdefault("distribution", {}), str(guesses) if won else "X")
+    _update("wordle", date, update)
+
+
+def record_connections(date, won, mistakes):
+    def update(game_stats):
+        _record_result(game_stats, date, won)
+        _increment(game_stats.setdefault("mistakes", {}), str(mistakes))
+    _update("connections", date, update)
+
+
+def record_mini(date, seconds):
+    def update(game_stats):
+        _record_result(game_stats, date, True)
+        game_stats["total_seconds"] = game_stats.get("total_seconds", 0) + seconds
+        game_stats["best_seconds"] = min(game_stats.get("best_seconds", seconds), seconds)
+        recent = game_stats.setdefault("recent_seconds", [])
+        recent.append([date, round(seconds)])
+        del recent[:-HISTORY_LENGTH]
+    _update("mini", date, update)
+
+
+def record_spellingbee(date, rank, score):
+    """Spelling Bee has no end, so a day's rank is recorded when the player leaves it."""
+    if not journal.JOURNALING.get():
+        return
+    with file_lock(STATS_FILE):
+        stats = load_stats()
+        game_stats = stats.setdefault("spellingbee", {"played": 0})
+        history = game_stats.setdefault("rank_history", [])
+        if history and history[-1][0] == date:
+            # Same day, later visit: replace the day's rank rather than counting it again
+            _, previous_rank, _ = history.pop()
+            game_stats["ranks"][previous_rank] -= 1
+        elif history and history[-1][0] > date:
+            return
+        else:
+            game_stats["played"] += 1
+        _increment(game_stats.setdefault("ranks", {}), rank)
+        history.append([date, rank, score])
+        del history[:-HISTORY_LENGTH]
+        game_stats["last_date"] = date
+        write_json(STATS_FILE, stats)
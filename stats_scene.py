@@ -0,0 +1,83 @@
+import curses
+
+from stats import load_stats
+from utils import Palette, display_cols, display_rows
+
+BAR_WIDTH = 30
+
+
+def percent(part, whole):
+    return f"{part / whole:.0%}" if whole else "-"
+
+
+def minutes(seconds):
+    seconds = round(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def summary(name, game_stats):
+    played = game_stats.get("played", 0)
+    line = f"{name:<13} played {played:<4} won {percent(game_stats.get('won', 0), played):<5}"
+    if "streak" in game_stats:
+        line += f" streak {game_stats['streak']} (best {game_stats.get('max_streak', 0)})"
+    return line
+
+
+def stats_lines(stats) -> list[tuple[str, int]]:
+    lines = [("STATS", Palette.white() | curses.A_BOLD), ("", Palette.white())]
+
+    wordle = stats.get("wordle", {})
+    lines.append((summary("WORDLE", wordle), Palette.green()))
+    distribution = wordle.get("distribution", {})
+    most = max(distribution.values(), default=0)
+    for guesses in ["1", "2", "3", "4", "5", "6", "X"]:
+        count = distribution.get(guesses, 0)
+        bar = "#" * (count * BAR_WIDTH // most if most else 0)
+        lines.append((f"  {guesses} {bar} {count}", Palette.gray()))
+
+    connections = stats.get("connections", {})
+    mistakes = connections.get("mistakes", {})
+    lines.append((summary("CONNECTIONS", connections), Palette.purple()))
+    lines.append(("  mistakes " + "  ".join(f"{n}:{mistakes.get(str(n), 0)}" for n in range(5)), Palette.gray()))
+
+    mini = stats.get("mini", {})
+    lines.append((summary("MINI", mini), Palette.blue()))
+    if mini.get("won"):
+        recent = " ".join(minutes(seconds) for _, seconds in mini.get("recent_seconds", [])[-5:])
+        lines.append((f"  best {minutes(mini['best_seconds'])}  avg {minutes(mini['total_seconds'] / mini['won'])}  recent {recent}", Palette.gray()))
+    else:
+        lines.append(("  no solves yet", Palette.gray()))
+
+    spellingbee = stats.get("spellingbee", {})
+    lines.append((f"{'SPELLINGBEE':<13} played {spellingbee.get('played', 0)}", Palette.yellow()))
+    history = spellingbee.get("rank_history", [])
+    if history:
+        lines.append(("  recent " + ", ".join(rank for _, rank, _ in history[-4:]), Palette.gray()))
+    else:
+        lines.append(("  no days yet", Palette.gray()))
+
+    lines += [("", Palette.white()), ("[q]uit", Palette.gray())]
+    return lines
+
+
+def draw_stats(stdscr, stats):
+    lines = stats_lines(stats)
+    cols = display_cols(stdscr)
+    region = stdscr.layout.centered(len(lines), max(len(text) for text, _ in lines))
+    stdscr.clear()
+    for i, (text, color) in enumerate(lines[:display_rows(stdscr) - region.y]):
+        stdscr.addstr(region.y + i, region.x, text[:cols - region.x - 1], color)
+    stdscr.refresh()
+
+
+async def stats_scene(stdscr):
+    # stats.json holds running totals, so this is one small read however long you've played
+    stats = load_stats()
+    draw_stats(stdscr, stats)
+    while True:
+        key = await stdscr.read_key()
+        if key == curses.KEY_RESIZE:
+            draw_stats(stdscr, stats)
+        elif key == ord('q'):
+            stdscr.clear()
+            break
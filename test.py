@@ -29,11 +29,857 @@ def test_mini():
     scrape.write_mini_puzzle_data()
     print(grid)
     print(clues)
-    
+
+def test_mini_parse():
+    import json
+    import time
+    from mini import scrape
+    with open("fixtures/mini.html", "r") as f:
+        html = f.read()
+    # The recorded page's embedded state has no puzzle, so this reads the rendered grid
+    assert scrape.puzzle_state(scrape.read_game_data(html)) is None
+    start = time.perf_counter()
+    date, grid, clues = scrape.MiniProvider().parse(html, datetime.now())
+    rendered = time.perf_counter() - start
+
+    # The same puzzle as embedded state, which the parser should prefer and read identically
+    state = {
+        "publicationDate": date,
+        "body": [{
+            "dimensions": {"width": len(grid[0]), "height": len(grid)},
+            "cells": [
+                {} if cell.get("is_out_of_bounds") else
+                {"answer": cell["solution"], "label": cell["number"], "type": 2 if cell["is_circled"] else 1}
+                for row in grid for cell in row
+            ],
+            "clues": [
+                {"label": clue["number"], "direction": clue["direction"], "text": [{"plain": clue["clue"]}]}
+                for clue in clues
+            ],
+        }],
+    }
+    embedded_html = html.replace('window.gameData = {"filename":"mini"', 'window.gameData = {"puzzle":' + json.dumps(state) + ',"filename":"mini"')
+    start = time.perf_counter()
+    assert scrape.MiniProvider().parse(embedded_html, datetime.now()) == (date, grid, clues)
+    embedded = time.perf_counter() - start
+
+    # The state layout is assumed, not recorded; one that doesn't fit falls back to the rendered grid
+    mismatched_html = html.replace('window.gameData = {"filename":"mini"', 'window.gameData = {"puzzle":{"body":[{"cells":[]}]},"filename":"mini"')
+    assert scrape.MiniProvider().parse(mismatched_html, datetime.now()) == (date, grid, clues)
+    # An unrevealed grid has numbers but no letters; reading it would make a wrong puzzle
+    import bs4
+    soup = bs4.BeautifulSoup(mismatched_html, "html.parser")
+    for cell in soup.find_all("g", attrs={"class": "xwd__cell"}):
+        texts = cell.find_all("text", attrs={"data-testid": "cell-text"})
+        if texts and texts[-1].text.strip().isalpha():
+            texts[-1].decompose()
+    try:
+        scrape.MiniProvider().parse(str(soup), datetime.now())
+        raise AssertionError("parsed an unrevealed grid")
+    except ValueError:
+        pass
+    # A page served without its rendered grid, as over plain HTTP in low-power mode, is a clear error
+    try:
+        scrape.MiniProvider().parse(html.replace("xwd__cell", "cell"), datetime.now())
+        raise AssertionError("parsed a page without a puzzle")
+    except ValueError:
+        pass
+    print(f"{date}: {len(clues)} clues; rendered grid {rendered * 1000:.1f}ms, embedded state {embedded * 1000:.2f}ms")
+
+def _crossword_grid(size, seed=0):
+    import random
+    rng = random.Random(seed)
+    blocks = set()
+    for _ in range(size * size // 7):
+        i, j = rng.randrange(size), rng.randrange(size)
+        blocks |= {(i, j), (size - 1 - i, size - 1 - j)}
+    grid, clues = [], []
+    for i in range(size):
+        row = []
+        for j in range(size):
+            if (i, j) in blocks:
+                row.append({"solution": None, "number": None, "is_out_of_bounds": True})
+                continue
+            number = ""
+            for direction, before, after in (("Across", (i, j - 1), (i, j + 1)), ("Down", (i - 1, j), (i + 1, j))):
+                if (min(before) < 0 or before in blocks) and max(after) < size and after not in blocks:
+                    number = number or str(len({clue["number"] for clue in clues}) + 1)
+                    clues.append({"number": number, "clue": f"{direction} {number}", "direction": direction})
+            row.append({"solution": rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ"), "number": number, "is_circled": False})
+        grid.append(row)
+    return grid, clues
+
+def test_mini_grid(keystrokes=3000):
+    import time
+    import random
+    import curses
+    from statistics import median
+    from layout import Layout
+    from mini.scrape import MiniProvider
+    from server import RemoteScreen
+    from mini.scene import Crossword, CrosswordClue, CrosswordController
+
+    class Sink:
+        # Stands in for a server session; RemoteScreen raises on any write off the screen
+        def __init__(self):
+            self.output = []
+        def send(self, data):
+            self.output.append(data.decode())
+
+    with open("fixtures/mini.html", "r") as f:
+        _, mini_grid, mini_clues = MiniProvider().parse(f.read(), datetime.now())
+    rng = random.Random(0)
+    keys = [ord(c) for c in "abcdefghijklmnopqrstuvwxyz"] * 2 + [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT, 10, 32, 127]
+    for name, (grid, clues), (rows, cols) in [
+        ("mini", (mini_grid, mini_clues), (24, 80)),
+        ("15x15", _crossword_grid(15), (24, 80)),
+        ("21x21", _crossword_grid(21), (24, 80)),
+        ("21x21", _crossword_grid(21), (60, 120)),
+    ]:
+        crossword = Crossword(grid, [CrosswordClue(c["number"], c["clue"], c["direction"] == "Across") for c in clues])
+        controller = CrosswordController(crossword)
+        session = Sink()
+        stdscr = RemoteScreen(session, rows, cols)
+        crossword.update_display(stdscr, full_update=True)
+        latencies = []
+        for _ in range(keystrokes):
+            start = time.perf_counter()
+            controller.handle_key(rng.choice(keys))
+            crossword.update_display(stdscr, controller.message)
+            latencies.append(time.perf_counter() - start)
+            visible_rows, visible_cols, _ = crossword.geometry(stdscr)
+            assert crossword.top <= crossword.cursor_row < crossword.top + visible_rows
+            assert crossword.left <= crossword.cursor_col < crossword.left + visible_cols
+        assert crossword.filled == sum(crossword.values[k] != 32 for k in range(len(crossword.values)) if not crossword.blocks[k])
+        # A timer tick sends the timer's changed digits and nothing else
+        x = (cols - 5) // 2 + 1
+        session.output.clear()
+        crossword.tick_display(stdscr, 61)
+        assert session.output == [f"\x1b[2;{x + 1}H\x1b[0m1\x1b[2;{x + 4}H1\x1b[0m"], session.output
+        session.output.clear()
+        crossword.tick_display(stdscr, 61.5)
+        assert session.output == [], session.output
+        latencies.sort()
+        print(f"{name} on {rows}x{cols}: median {median(latencies) * 1000:.3f}ms, p99 {latencies[int(keystrokes * 0.99)] * 1000:.3f}ms per key")
+
+def test_mini_resume():
+    import os
+    import json
+    import time
+    import asyncio
+    import tempfile
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import stats
+    import journal
+    from storage import write_json
+    from puzzle_cache import today
+    from server import RemoteScreen, CTRL_C
+    from mini.scrape import MINI_PUZZLE_FILENAME
+    from mini.scene import mini_scene
+
+    class Sink:
+        def send(self, data):
+            pass
+
+    grid, clues = _crossword_grid(5)
+    write_json(MINI_PUZZLE_FILENAME, {"date": today(), "grid": grid, "clues": clues, "fetched_at": time.time()})
+    # An earlier session filled every cell but the first and spent two minutes on it
+    cells = [(i, j, cell["solution"]) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell["solution"]]
+    os.makedirs(journal.JOURNAL_DIR, exist_ok=True)
+    with open(journal.journal_path("mini"), "w") as f:
+        for n, (i, j, value) in enumerate(cells[1:]):
+            f.write(json.dumps({"date": today(), "type": "cell", "i": i, "j": j, "value": value, "elapsed": n}) + "\n")
+        f.write(json.dumps({"date": today(), "type": "elapsed", "seconds": 120}) + "\n")
+
+    async def play():
+        screen = RemoteScreen(Sink())
+        for key in [ord(cells[0][2].lower()), CTRL_C]:
+            screen.keys.put_nowait(key)
+        await mini_scene(screen)
+
+    asyncio.run(play())
+    # The solve time includes the earlier session, not just the keystroke that finished it
+    (date, seconds), = stats.load_stats()["mini"]["recent_seconds"]
+    assert date == today() and 120 <= seconds < 125, seconds
+    assert journal.read_moves("mini")[-1]["type"] == "elapsed"
+    print(f"Resumed Mini solved in {seconds}s across sessions")
+
+def test_connections_engine(games=100000):
+    import time
+    from connections.engine import Board, Guess, simulate
+    word_categories = [i // 4 for i in range(16)]
+    board = Board(word_categories)
+    board.select([0, 1, 2, 3])
+    assert board.guess() == Guess.CORRECT
+    board.select([4, 5, 6, 8])
+    assert board.guess() == Guess.ONE_AWAY
+    board.select([4, 5, 6, 8])
+    assert board.guess() == Guess.REPEATED
+    assert board.hint() == 4
+
+    start = time.perf_counter()
+    result = simulate(word_categories, games, seed=0)
+    elapsed = time.perf_counter() - start
+    print(result)
+    print(f"{games / elapsed:.0f} simulated games/s")
+
+def test_wordle_multi(games=200):
+    import time
+    import random
+    from statistics import median
+    from layout import Layout
+    from wordle.engine import MultiBoard, score, load_words, GREEN, YELLOW, GRAY
+    from wordle.multi import MultiBoardView
+    assert score("crane", "nanny") == (GRAY, YELLOW, GRAY, GREEN, GRAY)
+    assert score("abbey", "babes") == (YELLOW, YELLOW, GREEN, GREEN, GRAY)
+
+    class CountingScreen:
+        layout = Layout(24, 80)
+        writes = 0
+        def addstr(self, y, x, text, attr=0):
+            self.writes += 1
+        def clear(self):
+            pass
+        def refresh(self):
+            pass
+
+    rng = random.Random(0)
+    answers, words = load_words("answers.txt"), load_words("words.txt")
+    stdscr = CountingScreen()
+    latencies, writes = [], []
+    for _ in range(games):
+        game = MultiBoard(rng.sample(answers, 8), 13)
+        view = MultiBoardView(game)
+        view.draw(stdscr, "", full_update=True)
+        while not (game.is_win or game.is_lose):
+            word = rng.choice(game.secrets if rng.random() < 0.5 else words)
+            if word in game.guesses:
+                continue
+            stdscr.writes = 0
+            start = time.perf_counter()
+            game.guess(word)
+            view.show_message(stdscr, "")
+            latencies.append(time.perf_counter() - start)
+            writes.append(stdscr.writes)
+    print(f"{len(latencies)} guesses on 8 boards: median {median(latencies) * 1000:.3f}ms, p99 {sorted(latencies)[int(len(latencies) * 0.99)] * 1000:.3f}ms per Enter")
+    print(f"{sum(writes) / len(writes):.1f} addstr calls per Enter")
+
+def test_multi_journal(days=30):
+    import os
+    import json
+    import asyncio
+    import tempfile
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import journal
+    from storage import read_json
+    from puzzle_cache import today
+    from server import RemoteScreen, CTRL_C
+    from wordle.engine import daily_secrets
+    from wordle.multi import quordle_scene
+
+    class Sink:
+        def send(self, data):
+            pass
+
+    # A month of Quordle moves, with today's last, as left by playing every day
+    dates = [f"2024-03-{day:02d}" for day in range(1, days + 1)] + [today()]
+    os.makedirs(journal.JOURNAL_DIR, exist_ok=True)
+    with open(journal.journal_path("quordle"), "w") as f:
+        for date in dates:
+            f.write(json.dumps({"date": date, "type": "guess", "word": "crane"}) + "\n")
+
+    async def play():
+        screen = RemoteScreen(Sink())
+        for key in [*b"slate\n", CTRL_C]:
+            screen.keys.put_nowait(key)
+        await quordle_scene(screen)
+
+    asyncio.run(play())
+    # Opening the scene archives the earlier days and leaves only today's moves
+    assert [move["word"] for move in journal.read_moves("quordle")] == ["crane", "slate"]
+    snapshot = read_json(journal.history_path("quordle", dates[0]))
+    assert snapshot["secrets"] == daily_secrets(dates[0], 4) and len(snapshot["moves"]) == 1
+    assert len(os.listdir(os.path.join(journal.HISTORY_DIR, "quordle"))) == days
+    print(f"{days} earlier days archived; journal keeps {len(journal.read_moves('quordle'))} moves")
+
+def test_wordle_candidates(games=300):
+    import time
+    import random
+    from wordle.engine import Candidates, hard_mode_violation, score, load_words
+    assert hard_mode_violation([("crane", score("crate", "crane"))], "trace") == "1st letter must be C"
+    assert hard_mode_violation([("slate", score("early", "slate"))], "baker") == "Guess must contain L"
+    assert hard_mode_violation([("slate", score("early", "slate"))], "alley") == ""
+
+    rng = random.Random(0)
+    answers, words = load_words("answers.txt"), load_words("words.txt")
+    elapsed, updates = 0, 0
+    for _ in range(games):
+        secret = rng.choice(answers)
+        candidates, remaining = Candidates(), list(answers)
+        for _ in range(6):
+            guess = rng.choice(words)
+            clue = score(secret, guess)
+            start = time.perf_counter()
+            candidates.update(guess, clue)
+            elapsed += time.perf_counter() - start
+            updates += 1
+            remaining = [word for word in remaining if score(word, guess) == clue]
+            assert list(candidates) == remaining, (secret, guess)
+    print(f"{elapsed / updates * 1e6:.1f}us per candidate update over {len(answers)} answers")
+
+def test_connections_index():
+    import os
+    import tempfile
+    # Keep the archive and index out of the real ~/.wordgames
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import journal
+    from connections import index
+
+    def puzzle(date, words):
+        colors = ["yellow", "green", "blue", "purple"]
+        return {
+            "date": date,
+            "categories": {color: f"{color} {date}" for color in colors},
+            "words": {color: words[i * 4:(i + 1) * 4] for i, color in enumerate(colors)},
+        }
+
+    words = [f"w{i}" for i in range(16)]
+    journal.compact("connections", puzzle("2025-01-01", words))
+    journal.compact("connections", puzzle("2025-01-02", words[4:] + words[:4]))
+    word_index = index.WordIndex.load()
+    assert [a[0] for a in word_index.lookup("W0")] == ["2025-01-01", "2025-01-02"]
+    assert word_index.lookup("w0", before="2025-01-02") == [["2025-01-01", "yellow", "yellow 2025-01-01"]]
+    assert len(word_index.red_herrings()) == 16
+
+    # Rebuilt from history/ when the index file is lost
+    os.remove(index.INDEX_FILE)
+    assert index.WordIndex.load().words == word_index.words
+    print("Done")
+
+def test_archive(days=400):
+    import os
+    import time
+    import tempfile
+    from datetime import timedelta
+    from concurrent.futures import wait
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import bundle
+    import journal
+    from storage import read_json
+    from archive import PuzzleArchive, PREFETCH_DAYS
+
+    first = datetime(2024, 1, 1)
+    dates = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    # Older days come from a bundle, recent ones from history/
+    path = os.path.join(tempfile.mkdtemp(), "old.wgb")
+    bundle.write_bundle(path, {("wordle", date): {"date": date, "wordle_answer": "crane", "guesses": []} for date in dates[:days // 2]})
+    bundle.install(path)
+    for date in dates[days // 2:]:
+        journal.compact("wordle", {"date": date, "wordle_answer": "crane", "guesses": []})
+
+    archive = PuzzleArchive("wordle")
+    assert archive.month(2024, 1).result() == dates[:31]
+    assert archive.month(2024, 7).result() == [date for date in dates if date.startswith("2024-07")]
+
+    # Walking through the days only ever hands back futures; the reads happen behind
+    worst = 0
+    for date in dates[1:60]:
+        start = time.perf_counter()
+        selected = archive.select(date)
+        worst = max(worst, time.perf_counter() - start)
+        wait([selected] + [archive.puzzle(d) for d in archive.neighbours(date)])
+    neighbours = archive.neighbours(dates[59])
+    assert neighbours == dates[59 - PREFETCH_DAYS:59] + dates[60:60 + PREFETCH_DAYS]
+    assert all(archive.puzzle(d).done() for d in neighbours)
+
+    # Moves on an archived day go back into its history snapshot, not today's journal
+    snapshot = archive.select(dates[0]).result()
+    played = journal.ArchiveJournal("wordle", snapshot)
+    start = time.perf_counter()
+    for word in ["slate", "brine"] * 100:
+        played.append("guess", word=word)
+    per_move = (time.perf_counter() - start) / 200
+    # On disk straight away, so a crash before close keeps them for the next open
+    assert [move["word"] for move in journal.ArchiveJournal("wordle", snapshot).replay()][:2] == ["slate", "brine"]
+    played.close()
+    assert len(read_json(journal.history_path("wordle", dates[0]))["moves"]) == 200
+    assert not os.path.exists(played.path) and not os.path.exists(journal.journal_path("wordle"))
+
+    # Winning an archived day doesn't count towards the live stats
+    import asyncio
+    import stats
+    from server import RemoteScreen, CTRL_C
+    from wordle.scene import wordle_scene
+
+    class Sink:
+        def send(self, data):
+            pass
+
+    async def play():
+        screen = RemoteScreen(Sink())
+        for key in [*b"crane\n", CTRL_C]:
+            screen.keys.put_nowait(key)
+        await wordle_scene(screen, archived=archive.select(dates[-1]).result())
+
+    asyncio.run(play())
+    assert read_json(journal.history_path("wordle", dates[-1]))["moves"][0]["word"] == "crane"
+    assert "wordle" not in stats.load_stats()
+
+    # Today belongs to the live game, so the browser stops at yesterday
+    from puzzle_cache import today
+    from archive_scene import ArchiveBrowser
+    browser = ArchiveBrowser(None, "wordle", 0)
+    browser.move(days=7)
+    browser.move(months=1)
+    assert browser.selected < datetime.strptime(today(), "%Y-%m-%d").date()
+    print(f"{days} days archived; slowest select {worst * 1e6:.0f}us; {per_move * 1e6:.0f}us per archived move")
+
+def test_blocked_resources():
+    import json
+    import re
+    import logging
+    from utils import BLOCKED_URL_PATTERNS, log_network_summary
+
+    def blocked(url):
+        # Network.setBlockedURLs patterns match the whole URL; * is the only wildcard, so ? is literal
+        return any(re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) for pattern in BLOCKED_URL_PATTERNS)
+
+    assert blocked("https://static01.nyt.com/images/x.png")
+    assert blocked("https://static01.nyt.com/images/x.jpg?quality=75&auto=webp&w=600")
+    assert blocked("https://g1.nyt.com/fonts/family/cheltenham.woff2?v=3")
+    assert not blocked("https://www.nytimes.com/puzzles/spelling-bee")
+    assert not blocked("https://www.nytimes.com/games-assets/v2/mini.js?v=2")
+    assert not blocked("https://www.nytimes.com/static/x.icons.js")
+    assert not blocked("https://www.nytimes.com/a.ttfloader.js?v=1")
+
+    def event(method, **params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    class Driver:
+        def get_log(self, kind):
+            return [event("Network.requestWillBeSent")] * 5 + [
+                event("Network.loadingFinished", encodedDataLength=2048),
+                event("Network.loadingFailed", type="Image", blockedReason="inspector"),
+                event("Network.loadingFailed", type="Image", errorText="net::ERR_BLOCKED_BY_CLIENT"),
+                event("Network.loadingFailed", type="Font", errorText="net::ERR_NAME_NOT_RESOLVED"),
+                event("Network.loadingFailed", type="XHR", errorText="net::ERR_CONNECTION_RESET"),
+            ]
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logging.getLogger().addHandler(handler)
+    logging.getLogger().setLevel(logging.INFO)
+    log_network_summary(Driver(), "https://www.nytimes.com/crosswords/game/mini", 1.5)
+    logging.getLogger().removeHandler(handler)
+    fields = records[-1].fields
+    assert (fields["requests"], fields["bytes_loaded"], fields["blocked"]) == (5, 2048, 3)
+    assert fields["blocked_by_type"] == {"Image": 2, "Font": 1}
+    print(records[-1].getMessage())
+
+def test_bundle(days=3000):
+    import os
+    import time
+    import asyncio
+    import tempfile
+    from datetime import timedelta
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import bundle
+    from puzzle_cache import PUZZLE_CACHE, today
+
+    first = datetime(2017, 1, 1)
+    dates = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)] + [today()]
+    puzzles = {}
+    for date in dates:
+        puzzles["wordle", date] = bundle.puzzle_record({"date": date, "word": date[-5:], "guesses": ["crane"], "fetched_at": 1})
+        puzzles["spellingbee", date] = {"date": date, "center": "a", "outer": list("bcdefg"), "answers": [f"word{i}" for i in range(40)], "guesses": []}
+    assert puzzles["wordle", dates[0]] == {"date": dates[0], "word": dates[0][-5:], "guesses": []}
+    path = os.path.join(tempfile.mkdtemp(), "puzzles.wgb")
+    bundle.write_bundle(path, puzzles)
+    installed = bundle.install(path)
+
+    with bundle.Bundle(installed) as b:
+        assert len(list(b)) == len(puzzles) and b.get("mini", dates[0]) is None
+        start = time.perf_counter()
+        for date in dates:
+            assert b.get("spellingbee", date) == puzzles["spellingbee", date]
+        elapsed = (time.perf_counter() - start) / len(dates)
+
+    def offline():
+        raise RuntimeError("fetched a bundled puzzle")
+    filename = os.path.join(bundle.CACHE_DIR, "wordle.json")
+    assert asyncio.run(PUZZLE_CACHE.get(filename, offline))["word"] == today()[-5:]
+
+    # Installing over a bundle a game has mapped leaves its copy readable (in place, a
+    # smaller file would truncate the mapping under it)
+    with bundle.Bundle(installed) as mapped:
+        bundle.write_bundle(path, {key: puzzles[key] for key in list(puzzles)[:10]})
+        bundle.install(path)
+        assert mapped.get("spellingbee", dates[-1]) == puzzles["spellingbee", dates[-1]]
+    bundle.write_bundle(path, puzzles)
+    bundle.install(path)
+
+    # A truncated bundle is refused when it's opened, and skipped by the loaders
+    with open(path, "rb") as f:
+        data = f.read()
+    for size in [bundle.HEADER.size + 5, bundle.HEADER.size + bundle.ENTRY.size * 100, len(data) - 1]:
+        damaged = os.path.join(tempfile.mkdtemp(), "damaged.wgb")
+        with open(damaged, "wb") as f:
+            f.write(data[:size])
+        try:
+            bundle.Bundle(damaged)
+            raise AssertionError(f"opened a bundle cut to {size} bytes")
+        except ValueError:
+            pass
+    os.replace(damaged, os.path.join(bundle.BUNDLE_DIR, "damaged.wgb"))
+    assert bundle.find_puzzle("wordle", dates[0]) == puzzles["wordle", dates[0]]
+    os.remove(os.path.join(bundle.BUNDLE_DIR, "damaged.wgb"))
+
+    # Reinstalling a bundle, or removing it, unmaps the copy that was open
+    old = bundle.installed_bundles()[0]
+    os.utime(installed, (time.time() + 10, time.time() + 10))
+    assert bundle.installed_bundles()[0] is not old and old._map.closed
+    current = bundle.installed_bundles()[0]
+    os.remove(installed)
+    assert bundle.installed_bundles() == [] and current._map.closed
+    print(f"{len(puzzles)} puzzles in {os.path.getsize(path) / 1024:.0f} KiB; {elapsed * 1e6:.1f}us per single-day load")
+
+def test_stats():
+    import os
+    import tempfile
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import journal
+    import stats
+
+    stats.record_wordle("2025-01-01", True, 3)
+    stats.record_wordle("2025-01-01", True, 3)  # the same day only counts once
+    stats.record_wordle("2025-01-02", True, 4)
+    stats.record_wordle("2025-01-04", True, 2)
+    wordle = stats.load_stats()["wordle"]
+    assert (wordle["played"], wordle["streak"], wordle["max_streak"]) == (3, 1, 2)
+    assert wordle["distribution"] == {"3": 1, "4": 1, "2": 1}
+
+    stats.record_spellingbee("2025-01-01", "Good", 10)
+    stats.record_spellingbee("2025-01-01", "Great", 40)
+    spellingbee = stats.load_stats()["spellingbee"]
+    assert spellingbee["played"] == 1 and spellingbee["ranks"] == {"Good": 0, "Great": 1}
+
+    journal.JOURNALING.set(False)
+    stats.record_connections("2025-01-01", True, 1)
+    assert "connections" not in stats.load_stats()
+    print("Done")
+
+def test_key_bursts(paste_keys=200):
+    import os
+    import time
+    import curses
+    import asyncio
+    import tempfile
+    os.environ["HOME"] = tempfile.mkdtemp()
+    import journal
+    from storage import write_json
+    from puzzle_cache import today
+    from server import RemoteScreen, CTRL_C
+    from wordle.scrape import WORDLE_FILENAME
+    from wordle.scene import wordle_scene
+
+    class Sink:
+        def __init__(self):
+            self.frames = 0
+        def send(self, data):
+            self.frames += 1
+
+    async def bursts():
+        screen = RemoteScreen(Sink())
+        for key in b"abc":
+            screen.keys.put_nowait(key)
+        screen.resize(30, 90)
+        for key in [*b"de", CTRL_C, *b"f"]:
+            screen.keys.put_nowait(key)
+        # A resize ends a burst, and a Ctrl-C is raised after the keys typed before it
+        assert await screen.read_keys() == [*b"abc", curses.KEY_RESIZE]
+        assert await screen.read_keys() == [*b"de"]
+        try:
+            await screen.read_keys()
+            raise AssertionError("Ctrl-C was dropped")
+        except KeyboardInterrupt:
+            pass
+        assert await screen.read_keys() == [*b"f"]
+
+    async def frame(screen, keys):
+        # Queue keys as one burst and wait for the scene to draw them
+        frames = screen.session.frames
+        start = time.perf_counter()
+        for key in keys:
+            screen.keys.put_nowait(key)
+        while screen.session.frames == frames:
+            await asyncio.sleep(0)
+        return screen.session.frames - frames, time.perf_counter() - start
+
+    async def paste():
+        write_json(WORDLE_FILENAME, {"date": today(), "wordle_answer": "crane", "guesses": [], "fetched_at": time.time()})
+        screen = RemoteScreen(Sink())
+        scene = asyncio.create_task(wordle_scene(screen))
+        while screen.session.frames == 0:
+            await asyncio.sleep(0)
+        _, single = await frame(screen, b"s")
+        typing = [*b"late"] + [127, *b"e"] * ((paste_keys - 4) // 2)
+        frames, burst = await frame(screen, typing)
+        assert frames == 1, frames
+        # Guesses pasted in one go are applied, and journaled, in the order they were typed
+        frames, _ = await frame(screen, b"\nxxxxx\n\x7f\x7f\x7f\x7f\x7fbrine\ncrane\nlater\n")
+        assert frames == 1, frames
+        screen.keys.put_nowait(CTRL_C)
+        await scene
+        assert [move["word"] for move in journal.read_moves("wordle")] == ["slate", "brine", "crane"]
+        print(f"1 key: {single * 1000:.2f}ms; {len(typing)}-key paste: {burst * 1000:.2f}ms in 1 frame")
+
+    asyncio.run(bursts())
+    asyncio.run(paste())
+
+def _low_power_footprint(fixture_url):
+    # Run in a fresh interpreter by test_low_power, so the numbers are this process's alone
+    import sys
+    import json
+    import time
+    import asyncio
+    import resource
+    start = time.perf_counter()
+    import main
+    import utils
+    from providers import get_provider
+    from loading_scene import loading_animation
+    _import_providers()
+    import_ms = (time.perf_counter() - start) * 1000
+
+    browser = {}
+    for name in ["spellingbee", "mini"]:
+        # The production provider (no override), pointed at the fixtures. The Mini's is a saved,
+        # already rendered page, so it parses here where the live page over plain HTTP may not.
+        provider = get_provider(name)
+        provider.base_url = fixture_url
+        browser[name] = provider.uses_browser()
+        if browser[name]:
+            # What scrape_with_selenium loads before it starts Chrome, which can't run here
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            webdriver.Chrome
+        else:
+            assert provider.get(datetime(2025, 7, 2))
+
+    frames = []
+    asyncio.run(loading_animation(None, asyncio.sleep(1), "Fetching...", layout=lambda: None, show=frames.append))
+    print(json.dumps({
+        "low_power": utils.low_power(),
+        "browser": browser,
+        "selenium": "selenium.webdriver.chrome.webdriver" in sys.modules,
+        "import_ms": import_ms,
+        "loading_frames": len(frames),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+def test_low_power():
+    import os
+    import sys
+    import json
+    import tempfile
+    import subprocess
+    from fixture_server import FixtureServer
+    from mini.scene import LOW_POWER_TICK_INTERVAL, TICK_INTERVAL
+
+    def run(low_power):
+        env = dict(os.environ, HOME=tempfile.mkdtemp(), WORDGAMES_LOW_POWER=low_power)
+        env.pop("WORDGAMES_PROVIDER_URL", None)
+        code = f"from test import _low_power_footprint; _low_power_footprint({server.url!r})"
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.splitlines()[-1])
+
+    with FixtureServer() as server:
+        normal, low = run("0"), run("1")
+    assert normal["browser"] == {"spellingbee": True, "mini": True} and normal["selenium"]
+    assert low["browser"] == {"spellingbee": False, "mini": False} and not low["selenium"]
+    assert low["loading_frames"] == 1 and normal["loading_frames"] >= 5
+    print(f"normal: imports {normal['import_ms']:.0f}ms, peak RSS {normal['max_rss_kb'] / 1024:.1f} MiB before Chrome starts, "
+          f"{normal['loading_frames']} loading frames/s, {60 // TICK_INTERVAL} timer redraws/min")
+    print(f"low power: imports {low['import_ms']:.0f}ms, peak RSS {low['max_rss_kb'] / 1024:.1f} MiB with both puzzles fetched, "
+          f"{low['loading_frames']} loading frame, {60 // LOW_POWER_TICK_INTERVAL} timer redraws/min")
+
+def test_logging(records=20000):
+    import os
+    import json
+    import time
+    import logging
+    import tempfile
+    import logs
+    path = os.path.join(tempfile.mkdtemp(), "wordgames.log")
+    logs.setup(path=path, repeat_window=1.0)
+    logger = logging.getLogger("spellingbee.scrape")
+
+    start = time.perf_counter()
+    for i in range(records):
+        logger.info("Removed non-word: %s", f"word{i}")
+    elapsed = time.perf_counter() - start
+    time.sleep(max(0, 1.0 - elapsed))
+    logger.info("Removed non-word: %s", "last")
+    logging.getLogger("utils").info("Scraped %s", "url", extra={"fields": {"requests": 3}})
+    # Repeats nothing else is logged after are still counted, once logging stops
+    for i in range(5):
+        logger.info("Removed non-word: %s", f"tail{i}")
+    logs.stop()
+
+    with open(path, "r") as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry["message"] for entry in entries] == ["Removed non-word: word0", "Removed non-word: last", "Scraped url", "Removed non-word: tail4"]
+    assert entries[0]["logger"] == "spellingbee.scrape" and "repeats" not in entries[0]
+    assert entries[1]["repeats"] == records - 1
+    assert entries[2]["requests"] == 3
+    assert entries[3]["repeats"] == 5
+    print(f"{records} repeated records in {elapsed * 1000:.1f}ms ({elapsed / records * 1e6:.2f}us each), {len(entries)} lines written")
+
+def test_wrap(cases=20000):
+    import random
+    import textwrap
+    from utils import wrap, display_width
+    random.seed(0)
+    # Single-spaced, hyphen-free text with an indent that fits: the same lines as textwrap,
+    # less the trailing space textwrap leaves before a broken word
+    for _ in range(cases):
+        indent = random.choice([0, 0, 2, 4])
+        words = ["".join(random.choice("abcdefghij") for _ in range(random.randint(1, 14))) for _ in range(random.randint(0, 12))]
+        text = " " * indent + " ".join(words)
+        width = random.randint(indent + 1, 24)
+        expected = [line.rstrip() or line for line in textwrap.wrap(text, width, break_on_hyphens=False)]
+        assert list(wrap(text, width)) == expected, (text, width)
+    # Where it differs on purpose
+    assert wrap("a   b\tc", 10) == ("a b c",)
+    assert wrap("well-known fact", 6) == ("well-k", "nown", "fact")
+    # Wide characters take two columns
+    assert wrap("字字字 ab", 4) == ("字字", "字", "ab")
+    assert all(display_width(line) <= 4 for line in wrap("字字字字字 字", 4))
+    print(f"{cases} random cases match textwrap")
+
+def _import_providers():
+    import wordle.scrape, connections.scrape, spellingbee.scrape, mini.scrape
+
+def test_providers():
+    from providers import get_provider
+    from fixture_server import FixtureServer
+    _import_providers()
+    date = datetime(2025, 7, 2)
+    with FixtureServer() as server:
+        assert get_provider("wordle", server.url).get(date) == "crane"
+
+        categories, words = get_provider("connections", server.url).get(date)
+        assert categories["yellow"] == "Fish"
+        assert words["purple"] == ["basket", "foot", "hand", "snow"]
+
+        center_letter, answers, print_date = get_provider("spellingbee", server.url).get(date)
+        assert (center_letter, print_date) == ("a", "2025-07-02")
+        assert "playact" in answers
+
+        mini_date, grid, clues = get_provider("mini", server.url).get(date)
+        assert mini_date == "2025-07-02"
+        assert len(grid) == 5 and all(len(row) == 5 for row in grid)
+        assert len(clues) == 10
+
+    print("Done")
+
+def test_providers_load(requests_per_provider=2000, workers=32):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from providers import get_provider
+    from fixture_server import FixtureServer
+    _import_providers()
+    date = datetime(2025, 7, 2)
+    with FixtureServer() as server:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for name in ["wordle", "connections", "spellingbee", "mini"]:
+                provider = get_provider(name, server.url)
+                count = requests_per_provider if name != "mini" else requests_per_provider // 20
+                start = time.perf_counter()
+                results = list(executor.map(lambda _: provider.get(date), range(count)))
+                elapsed = time.perf_counter() - start
+                assert all(r == results[0] for r in results)
+                print(f"{name}: {count} requests in {elapsed:.2f}s ({count / elapsed:.0f} req/s)")
+
+async def _read_until(reader, marker, received, offset):
+    while (found := received.find(marker, offset)) < 0:
+        data = await reader.read(65536)
+        if not data:
+            raise ConnectionError(f"Connection closed before {marker!r}")
+        received += data
+    return found + len(marker)
+
+async def _server_session(port, latencies, received_bytes):
+    import time
+    import asyncio
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    received = bytearray()
+    offset = await _read_until(reader, b"WORDLE", received, 0)
+    writer.write(b"\r")
+    offset = await _read_until(reader, b"Welcome to Wordle!", received, offset)
+    start = time.perf_counter()
+    writer.write(b"slate\r")
+    offset = await _read_until(reader, b"guesses remaining", received, offset)
+    latencies.append(time.perf_counter() - start)
+    writer.write(b"\x03")
+    await _read_until(reader, b"WORDLE", received, offset)
+    writer.write(b"q")
+    while data := await reader.read(65536):
+        received += data
+    received_bytes.append(len(received))
+    writer.close()
+
+def test_server_load(sessions=200):
+    import os
+    import time
+    import asyncio
+    import tempfile
+    from statistics import median
+    # Keep the shared cache and journals out of the real ~/.wordgames
+    os.environ["HOME"] = tempfile.mkdtemp()
+    from fixture_server import FixtureServer
+    from server import GameServer
+
+    async def run(fixture_url):
+        os.environ["WORDGAMES_PROVIDER_URL"] = fixture_url
+        server = await GameServer(port=0, max_sessions=sessions).start()
+        latencies, received_bytes = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(_server_session(server.port, latencies, received_bytes) for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+        server.close()
+        print(f"{sessions} sessions in {elapsed:.2f}s")
+        print(f"Guess latency: median {median(latencies) * 1000:.1f}ms, p95 {sorted(latencies)[int(sessions * 0.95)] * 1000:.1f}ms")
+        print(f"Output per session: {sum(received_bytes) / sessions / 1024:.1f} KiB")
+
+    with FixtureServer() as fixtures:
+        asyncio.run(run(fixtures.url))
+
+
 if __name__ == "__main__":
     tests = {
+        "archive": test_archive,
+        "blocked_resources": test_blocked_resources,
+        "bundle": test_bundle,
         "connections": test_connections,
+        "connections_engine": test_connections_engine,
+        "connections_index": test_connections_index,
+        "key_bursts": test_key_bursts,
+        "logging": test_logging,
+        "low_power": test_low_power,
         "mini": test_mini,
+        "mini_grid": test_mini_grid,
+        "mini_parse": test_mini_parse,
+        "mini_resume": test_mini_resume,
+        "multi_journal": test_multi_journal,
+        "providers": test_providers,
+        "providers_load": test_providers_load,
+        "server_load": test_server_load,
+        "stats": test_stats,
+        "wordle_candidates": test_wordle_candidates,
+        "wordle_multi": test_wordle_multi,
+        "wrap": test_wrap,
     }
 
     parser = argparse.ArgumentParser(description="Run test functions.")
@@ -0,0 +1,77 @@
+import curses
+
+NAMES = ("purple", "yellow", "green", "blue", "red", "white", "gray")
+
+# Foreground colors by terminal capability. Each name gets its own pair, numbered from 1 in NAMES order.
+COLORS_256 = {
+    "purple": 170,
+    "yellow": 227,
+    "green": 43,
+    "blue": 26,
+    "red": 203,
+    "white": 253,
+    "gray": 240,
+}
+COLORS_16 = {
+    "purple": curses.COLOR_MAGENTA + 8,
+    "yellow": curses.COLOR_YELLOW + 8,
+    "green": curses.COLOR_GREEN,
+    "blue": curses.COLOR_BLUE + 8,
+    "red": curses.COLOR_RED + 8,
+    "white": curses.COLOR_WHITE,
+    "gray": curses.COLOR_BLACK + 8,
+}
+COLORS_8 = {
+    "purple": curses.COLOR_MAGENTA,
+    "yellow": curses.COLOR_YELLOW,
+    "green": curses.COLOR_GREEN,
+    "blue": curses.COLOR_BLUE,
+    "red": curses.COLOR_RED,
+    "white": curses.COLOR_WHITE,
+    "gray": curses.COLOR_WHITE,
+}
+# 8 colors has no gray, so it's dimmed white
+EXTRA_ATTRS_8 = {"gray": curses.A_DIM}
+
+PAIRS = {name: pair for pair, name in enumerate(NAMES, 1)}
+
+
+def pair_attr(pair):
+    # What curses.color_pair returns, without needing an initialized terminal (e.g. in the server)
+    return (pair << 8) & curses.A_COLOR
+
+
+# Attributes for each color name; fixed up once by init() for low-color terminals
+ATTRS = {name: pair_attr(pair) for name, pair in PAIRS.items()}
+
+# The 256-color foreground of each pair, for the server's ANSI output
+PAIR_COLORS = {pair: COLORS_256[name] for name, pair in PAIRS.items()}
+
+_initialized = False
+
+
+def init():
+    """Set up the color pairs for the current terminal. Only the first call does anything."""
+    global _initialized
+    if _initialized:
+        return
+    _initialized = True
+    try:
+        if not curses.has_colors():
+            return
+        try:
+            curses.use_default_colors()
+            background = -1
+        except curses.error:
+            background = curses.COLOR_BLACK
+        if curses.COLORS >= 256:
+            colors, extra = COLORS_256, {}
+        elif curses.COLORS >= 16:
+            colors, extra = COLORS_16, {}
+        else:
+            colors, extra = COLORS_8, EXTRA_ATTRS_8
+        for name, pair in PAIRS.items():
+            curses.init_pair(pair, colors[name], background)
+            ATTRS[name] = pair_attr(pair) | extra.get(name, 0)
+    except curses.error:
+        pass
@@ -1,11 +1,31 @@
 import re
+import json
+import time
 import curses
 import os
+import logging
+import functools
+import collections
+import unicodedata
 import platform
-from selenium import webdriver
+
+import theme
+import config
+from theme import ATTRS
 
 WIDTH = 50
 
+# Subresources the scrapers never read, blocked before Chrome requests them. Patterns match
+# the whole URL, so each extension is matched at the end or before a query string (x.png?w=600),
+# never mid-path, where it would catch scripts like x.icons.js.
+BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "woff", "woff2", "ttf", "otf",
+    "mp4", "webm", "m3u8", "mp3",
+]
+BLOCKED_URL_PATTERNS = [pattern for extension in BLOCKED_EXTENSIONS for pattern in (f"*.{extension}", f"*.{extension}?*")]
+BLOCKED_ERRORS = ("net::ERR_BLOCKED_BY_CLIENT", "net::ERR_NAME_NOT_RESOLVED")
+
 
 def is_termux():
     """Detect if running in Termux/Android environment"""
@@ -29,15 +49,70 @@ def is_termux():
     return False
 
 
+@functools.cache
+def low_power() -> bool:
+    """
+    Whether to run light: no headless Chrome, fewer redraws and no loading animation.
+    The low_power setting decides; left unset, it's on under Termux.
+    """
+    if config.get("low_power") is None:
+        return is_termux()
+    return config.get_flag("low_power")
+
+
+def host_resolver_rules(allowed_hosts):
+    """Chrome --host-resolver-rules that fail DNS for every host except allowed_hosts and their subdomains."""
+    excludes = [f"EXCLUDE {pattern}" for host in allowed_hosts for pattern in (host, f"*.{host}")]
+    return ", ".join(["MAP * ~NOTFOUND"] + excludes)
+
+
+def log_network_summary(driver, url, elapsed):
+    """
+    Log the requests the page made, the bytes it loaded and the blocked requests by resource
+    type. Chrome never learns the size of a blocked response, so those counts stand in for
+    the bytes saved.
+    """
+    requests = loaded = 0
+    blocked = collections.Counter()
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            requests += 1
+        elif method == "Network.loadingFinished":
+            loaded += params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and (params.get("blockedReason") or params.get("errorText") in BLOCKED_ERRORS):
+            blocked[params.get("type", "Other")] += 1
+    by_type = ", ".join(f"{count} {resource_type}" for resource_type, count in blocked.most_common()) or "none"
+    logging.info(
+        "Scraped %s in %.1fs: %d requests, %.0f KiB loaded, %d requests blocked (%s; their sizes are unknown, so the counts stand in for bytes saved)",
+        url, elapsed, requests, loaded / 1024, sum(blocked.values()), by_type,
+        extra={"fields": {
+            "url": url, "seconds": round(elapsed, 3), "requests": requests, "bytes_loaded": loaded,
+            "blocked": sum(blocked.values()), "blocked_by_type": dict(blocked),
+        }},
+    )
+
+
 def scrape_with_selenium(url, driver_actions=None):
     from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
     
+    block_resources = config.get_flag("scrape_block_resources")
     chrome_options = Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    if block_resources:
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument(f'--host-resolver-rules={host_resolver_rules(config.get_list("scrape_allowed_hosts"))}')
     
     if is_termux():
         # Termux/Android specific configuration
@@ -55,40 +130,128 @@ def scrape_with_selenium(url, driver_actions=None):
         
         # Let selenium find chromedriver in PATH
         driver = webdriver.Chrome(options=chrome_options)
+
+    if block_resources:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except WebDriverException as e:
+            logging.warning("Couldn't block resources for %s: %s", url, e.msg)
         
-    driver.get(url)
-    if driver_actions:
-        driver_actions(driver)
-    html = driver.page_source
-    driver.quit()
-    return html
+    try:
+        start = time.perf_counter()
+        driver.get(url)
+        log_network_summary(driver, url, time.perf_counter() - start)
+        if driver_actions:
+            driver_actions(driver)
+        return driver.page_source
+    finally:
+        driver.quit()
+
+
+def init_colors():
+    theme.init()
+
+
+def hide_cursor():
+    try:
+        curses.curs_set(0)
+    except curses.error:
+        pass
 
 
 def strip_ansi(s):
     return re.sub(r'\x1b[^m]*m', '', s)
      
 
+# Text layout is cached by its arguments, so redrawing the same frame doesn't redo it
+TEXT_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def display_width(s):
+    """Terminal columns taken by s: wide East Asian characters count twice, combining marks not at all."""
+    width = 0
+    for c in strip_ansi(s):
+        if unicodedata.combining(c):
+            continue
+        width += 2 if unicodedata.east_asian_width(c) in "WF" else 1
+    return width
+
+
+def _pad(text_width, width, justify):
+    """Spaces to put (left, right) of text_width columns to fill width, placed like str.ljust/rjust/center."""
+    margin = max(0, width - text_width)
+    if justify == 'left':
+        return 0, margin
+    if justify == 'right':
+        return margin, 0
+    left = margin // 2 + (margin & width & 1)
+    return left, margin - left
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
 def justify(s, block=15, width=WIDTH, justify='left'):
-    _justify = {
-        'left': str.ljust,
-        'right': str.rjust,
-        'center': str.center
-    }[justify]
-    reference = strip_ansi(s)
-    justified = _justify(reference, block or 0, ' ')
-    centered = justified.center(width, ' ')
-    result = centered.replace(reference, s)
-    return result
+    text_width = display_width(s)
+    left, right = _pad(text_width, block or 0, justify)
+    outer_left, outer_right = _pad(left + text_width + right, width, 'center')
+    return ' ' * (outer_left + left) + s + ' ' * (right + outer_right)
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def wrap(text, width):
+    """
+    Wrap text to width display columns; returns a tuple of lines.
+
+    Like textwrap.wrap it keeps the first line's indentation and breaks words too long for a
+    line, but it collapses runs of whitespace between words to one space, never splits at
+    hyphens, and never ends a line with a space. It also drops an indent wider than the line.
+    """
+    lines = []
+    # Like textwrap, keep the indentation at the start of the paragraph if the first word fits after it
+    line = text[:len(text) - len(text.lstrip())]
+    line_width = display_width(line)
+    has_words = False
+    for word in text.split():
+        while word:
+            separator = 1 if has_words else 0
+            word_width = display_width(word)
+            if line_width + separator + word_width <= width:
+                line += " " * separator + word
+                line_width += separator + word_width
+                has_words = True
+                break
+            if word_width > width:
+                # Too long for any line: break it to fill what's left of this one
+                space_left = width - line_width - separator
+                head, head_width = "", 0
+                for c in word:
+                    if head_width + display_width(c) > space_left:
+                        break
+                    head += c
+                    head_width += display_width(c)
+                if not head and not has_words and not line:
+                    head, head_width = word[0], display_width(word[0])
+                if head:
+                    line += " " * separator + head
+                    has_words = True
+                    word = word[len(head):]
+            if has_words:
+                lines.append(line)
+            line, line_width, has_words = "", 0, False
+    if has_words:
+        lines.append(line)
+    return tuple(lines)
 
 def center_text(stdscr, text):
     return justify(text, justify='center', width=display_cols(stdscr))
 
 def display_rows(stdscr):
-    return min(stdscr.getmaxyx()[0], 24)
+    return stdscr.layout.rows
     
 
 def display_cols(stdscr):
-    return min(stdscr.getmaxyx()[1], 60)
+    return stdscr.layout.cols
 
 
 def vertical_buffer(content_rows, display_rows):
@@ -103,38 +266,38 @@ class Palette:
 
     @staticmethod
     def from_name(name):
-        return getattr(Palette, name)()
+        return ATTRS[name]
 
     @staticmethod
     def purple():
-        return curses.color_pair(170)
+        return ATTRS["purple"]
 
     @staticmethod
     def yellow():
-        return curses.color_pair(227)
+        return ATTRS["yellow"]
 
     @staticmethod
     def green():
-        return curses.color_pair(43)
+        return ATTRS["green"]
 
     @staticmethod
     def blue():
-        return curses.color_pair(26)
+        return ATTRS["blue"]
 
     @staticmethod
     def red():
-        return curses.color_pair(203)
+        return ATTRS["red"]
 
     @staticmethod
     def white():
-        return curses.color_pair(253)
+        return ATTRS["white"]
 
     @staticmethod
     def gray():
-        return curses.color_pair(240)
+        return ATTRS["gray"]
 
 
-def full_page_screenshot(driver: webdriver.Chrome, path: str = '/tmp/screenshot.png') -> None:
+def full_page_screenshot(driver: "webdriver.Chrome", path: str = '/tmp/screenshot.png') -> None:
     # Ref: https://stackoverflow.com/a/52572919/
     original_size = driver.get_window_size()
     required_width = driver.execute_script('return document.body.parentNode.scrollWidth')
@@ -0,0 +1,58 @@
+import os
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from wordle.engine import OPENING_GUESS, answer_masks, load_words, solve
+
+CHUNKSIZE = 64
+
+
+def warm_up():
+    # Build the answer bitsets once per worker rather than inside the first game
+    answer_masks()
+
+
+def play(secret, opening=OPENING_GUESS):
+    guesses = solve(secret, opening)
+    return secret, len(guesses) if guesses[-1] == secret else None
+
+
+def run(secrets, opening=OPENING_GUESS, workers=None):
+    """Solve every secret across a process pool; returns ({guesses or "X": games}, [failed secrets])."""
+    distribution = Counter()
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as pool:
+        for secret, guesses in pool.map(play, secrets, [opening] * len(secrets), chunksize=CHUNKSIZE):
+            if guesses is None:
+                distribution["X"] += 1
+                failures.append(secret)
+            else:
+                distribution[guesses] += 1
+    return distribution, failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play the Wordle solver against every answer and report throughput.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes to spread games over")
+    parser.add_argument("--opening", default=OPENING_GUESS, help="First guess for every game")
+    parser.add_argument("--limit", type=int, help="Only play the first N answers")
+    args = parser.parse_args()
+
+    secrets = list(load_words("answers.txt"))[:args.limit]
+    start = time.perf_counter()
+    distribution, failures = run(secrets, args.opening, args.workers)
+    elapsed = time.perf_counter() - start
+
+    solved = len(secrets) - len(failures)
+    # Nothing solved (e.g. --limit 0) leaves every bar empty
+    most = max(distribution.values(), default=0) or 1
+    for guesses in [1, 2, 3, 4, 5, 6, "X"]:
+        count = distribution.get(guesses, 0)
+        print(f"{guesses} {'#' * (count * 40 // most):<40} {count}")
+    if solved:
+        mean = sum(guesses * count for guesses, count in distribution.items() if guesses != "X") / solved
+        print(f"Mean {mean:.3f} guesses over {solved} solved")
+    print(f"Failures: {len(failures)}" + (f" ({', '.join(failures)})" if failures else ""))
+    print(f"{len(secrets)} games in {elapsed:.2f}s on {args.workers} workers: {len(secrets) / elapsed:.0f} games/s")
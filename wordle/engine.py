@@ -0,0 +1,217 @@
+import os
+import random
+from functools import lru_cache
+
+WORDLE_DIR = os.path.dirname(__file__)
+
+GRAY, YELLOW, GREEN = 0, 1, 2
+WORD_LENGTH = 5
+
+
+def score(secret: str, guess: str) -> tuple[int, ...]:
+    """The clue for guess against secret: GREEN, YELLOW or GRAY for each letter."""
+    result = [GRAY] * WORD_LENGTH
+    unmatched = []
+    for i in range(WORD_LENGTH):
+        if guess[i] == secret[i]:
+            result[i] = GREEN
+        else:
+            unmatched.append(secret[i])
+    for i in range(WORD_LENGTH):
+        if result[i] == GRAY and guess[i] in unmatched:
+            result[i] = YELLOW
+            unmatched.remove(guess[i])
+    return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def load_words(name: str) -> tuple[str, ...]:
+    with open(os.path.join(WORDLE_DIR, name), "r") as f:
+        return tuple(s.strip() for s in f if s.strip())
+
+
+@lru_cache(maxsize=None)
+def valid_guesses() -> frozenset[str]:
+    return frozenset(load_words("words.txt")) | frozenset(load_words("answers.txt"))
+
+
+def daily_secrets(date: str, boards: int) -> list[str]:
+    """The same distinct answers for everyone on a given day and board count."""
+    return random.Random(f"{date}/{boards}").sample(load_words("answers.txt"), boards)
+
+
+class MultiBoard:
+    """
+    Several Wordle boards played with the same guesses.
+
+    The keyboard keeps, for each letter, a bitmask of the boards where it's been seen,
+    found in the word, or placed, so one guess updates every board's key state with a
+    few ORs. Solved boards stop taking rows.
+    """
+
+    def __init__(self, secrets: list[str], max_guesses: int):
+        self.secrets = [s.lower() for s in secrets]
+        self.max_guesses = max_guesses
+        self.guesses: list[str] = []
+        # rows[b] holds (guess, clue) for each guess board b has taken
+        self.rows: list[list[tuple[str, tuple[int, ...]]]] = [[] for _ in secrets]
+        self.solved = 0
+        self.seen: dict[str, int] = {}
+        self.present: dict[str, int] = {}
+        self.placed: dict[str, int] = {}
+
+    @property
+    def all_boards(self) -> int:
+        return (1 << len(self.secrets)) - 1
+
+    @property
+    def is_win(self) -> bool:
+        return self.solved == self.all_boards
+
+    @property
+    def is_lose(self) -> bool:
+        return not self.is_win and len(self.guesses) >= self.max_guesses
+
+    def is_solved(self, board: int) -> bool:
+        return bool(self.solved >> board & 1)
+
+    def guess(self, word: str) -> list[int]:
+        """Score word on every unsolved board; returns the boards that took a row."""
+        self.guesses.append(word)
+        scored = []
+        for board, secret in enumerate(self.secrets):
+            bit = 1 << board
+            if self.solved & bit:
+                continue
+            clue = score(secret, word)
+            self.rows[board].append((word, clue))
+            scored.append(board)
+            for letter, state in zip(word, clue):
+                self.seen[letter] = self.seen.get(letter, 0) | bit
+                if state != GRAY:
+                    self.present[letter] = self.present.get(letter, 0) | bit
+                if state == GREEN:
+                    self.placed[letter] = self.placed.get(letter, 0) | bit
+            if word == secret:
+                self.solved |= bit
+        return scored
+
+    def key_state(self, letter: str, board: int) -> int:
+        """GREEN, YELLOW or GRAY for letter on board, or -1 if it hasn't been tried there."""
+        bit = 1 << board
+        if self.placed.get(letter, 0) & bit:
+            return GREEN
+        if self.present.get(letter, 0) & bit:
+            return YELLOW
+        if self.seen.get(letter, 0) & bit:
+            return GRAY
+        return -1
+
+
+@lru_cache(maxsize=None)
+def answer_masks() -> tuple[list[dict[str, int]], dict[str, list[int]]]:
+    """
+    Bitsets over answers.txt (bit i is answer i): the answers with each letter at each
+    position, and the answers with at least n of each letter (index n, from 0).
+    """
+    at = [{} for _ in range(WORD_LENGTH)]
+    at_least = {}
+    for i, word in enumerate(load_words("answers.txt")):
+        bit = 1 << i
+        for pos, letter in enumerate(word):
+            at[pos][letter] = at[pos].get(letter, 0) | bit
+        for letter in set(word):
+            counts = at_least.setdefault(letter, [0])
+            for n in range(1, word.count(letter) + 1):
+                if n == len(counts):
+                    counts.append(0)
+                counts[n] |= bit
+    everything = (1 << len(load_words("answers.txt"))) - 1
+    for counts in at_least.values():
+        counts[0] = everything
+    return at, at_least
+
+
+class Candidates:
+    """The answers still consistent with every clue so far, as a bitset over answers.txt."""
+
+    def __init__(self):
+        self.mask = (1 << len(load_words("answers.txt"))) - 1
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __iter__(self):
+        words = load_words("answers.txt")
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield words[low.bit_length() - 1]
+            mask ^= low
+
+    def update(self, guess: str, clue: tuple[int, ...]):
+        # A few big-int ANDs per letter, however many answers are left
+        at, at_least = answer_masks()
+        mask = self.mask
+        found, grays = {}, set()
+        for pos, (letter, state) in enumerate(zip(guess, clue)):
+            if state == GREEN:
+                mask &= at[pos].get(letter, 0)
+            else:
+                mask &= ~at[pos].get(letter, 0)
+            if state == GRAY:
+                grays.add(letter)
+            else:
+                found[letter] = found.get(letter, 0) + 1
+        for letter in set(guess):
+            counts = at_least.get(letter, [mask])
+            n = found.get(letter, 0)
+            mask &= counts[n] if n < len(counts) else 0
+            # A gray copy means the answer has exactly the copies that were found
+            if letter in grays and n + 1 < len(counts):
+                mask &= ~counts[n + 1]
+        self.mask = mask
+
+
+def hard_mode_violation(clues: list[tuple[str, tuple[int, ...]]], guess: str) -> str:
+    """Why guess breaks hard mode given the earlier (guess, clue) pairs, or "" if it doesn't."""
+    ordinals = ["1st", "2nd", "3rd", "4th", "5th"]
+    for word, clue in clues:
+        for pos, (letter, state) in enumerate(zip(word, clue)):
+            if state == GREEN and guess[pos] != letter:
+                return f"{ordinals[pos]} letter must be {letter.upper()}"
+        for letter in set(word):
+            needed = sum(1 for l, s in zip(word, clue) if l == letter and s != GRAY)
+            if guess.count(letter) < needed:
+                return f"Guess must contain {letter.upper()}"
+    return ""
+
+
+OPENING_GUESS = "salet"
+# Beyond this many candidates, scoring every pair costs more than a better guess saves
+SEARCH_LIMIT = 60
+
+
+def best_guess(candidates: list[str]) -> str:
+    """The candidate that splits the others into the most distinct clues."""
+    if len(candidates) <= 2 or len(candidates) > SEARCH_LIMIT:
+        return candidates[0]
+    return max(candidates, key=lambda guess: len({score(word, guess) for word in candidates}))
+
+
+def solve(secret: str, opening: str = OPENING_GUESS, max_guesses: int = 6) -> list[str]:
+    """Play secret with the candidate-narrowing solver; returns the guesses made."""
+    candidates = Candidates()
+    guesses = []
+    guess = opening
+    while len(guesses) < max_guesses:
+        guesses.append(guess)
+        clue = score(secret, guess)
+        if guess == secret:
+            break
+        candidates.update(guess, clue)
+        remaining = list(candidates)
+        if not remaining:
+            break
+        guess = best_guess(remaining)
+    return guesses
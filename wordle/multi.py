@@ -0,0 +1,195 @@
+import curses
+import curses.ascii
+import datetime
+
+import utils
+from journal import MoveJournal, compact_before
+from layout import Region
+from wordle.engine import GRAY, YELLOW, GREEN, MultiBoard, daily_secrets, valid_guesses
+
+KEY_ROWS = ["qwertyuiop", "asdfghjkl", "zxcvbnm"]
+BOARD_WIDTH = 5
+BOARD_GAP = 2
+SOLVED = -2
+STATE_COLORS = {
+    -1: utils.Palette.white,
+    GRAY: utils.Palette.gray,
+    YELLOW: utils.Palette.yellow,
+    GREEN: utils.Palette.green,
+}
+
+
+def geometry(layout, boards, max_guesses):
+    """Board origins, keyboard region and message row for this many boards on this screen."""
+    per_row = max(1, min(boards, (layout.cols + BOARD_GAP) // (BOARD_WIDTH + BOARD_GAP)))
+    board_rows = -(-boards // per_row)
+    boards_width = per_row * (BOARD_WIDTH + BOARD_GAP) - BOARD_GAP
+    boards_height = board_rows * (max_guesses + 1) - 1
+    # Each key is a block of one cell per board, two rows high, like Quordle's quadrants
+    key_width = -(-boards // 2)
+    keyboard_width = len(KEY_ROWS[0]) * (key_width + 1) - 1
+    width = max(boards_width, keyboard_width)
+    height = boards_height + 1 + 2 * len(KEY_ROWS) + 2
+    area = layout.centered(height, width)
+
+    left = area.x + (width - boards_width) // 2
+    origins = [
+        (area.y + (b // per_row) * (max_guesses + 1), left + (b % per_row) * (BOARD_WIDTH + BOARD_GAP))
+        for b in range(boards)
+    ]
+    keyboard = Region(area.y + boards_height + 1, area.x + (width - keyboard_width) // 2, 2 * len(KEY_ROWS), keyboard_width)
+    return origins, keyboard, keyboard.bottom + 1
+
+
+class MultiBoardView:
+    """
+    Draws a MultiBoard, remembering what each board row, key and the message line
+    currently show so a redraw only writes the ones that changed.
+    """
+
+    def __init__(self, game: MultiBoard):
+        self.game = game
+        self.message = ""
+        self.drawn = {}
+
+    def geometry(self, stdscr):
+        boards, max_guesses = len(self.game.secrets), self.game.max_guesses
+        return stdscr.layout.region(("multi", boards, max_guesses), lambda layout: geometry(layout, boards, max_guesses))
+
+    def row_content(self, board, row, buffer):
+        rows = self.game.rows[board]
+        if row < len(rows):
+            return rows[row]
+        if row == len(rows) and not self.game.is_solved(board) and not self.game.is_lose:
+            return buffer, None
+        return None
+
+    def key_content(self, letter):
+        return tuple(
+            SOLVED if self.game.is_solved(b) else self.game.key_state(letter, b)
+            for b in range(len(self.game.secrets))
+        )
+
+    def changed(self, key, content):
+        if self.drawn.get(key, ()) == content:
+            return False
+        self.drawn[key] = content
+        return True
+
+    def draw(self, stdscr, buffer, full_update=False):
+        if full_update:
+            stdscr.clear()
+            self.drawn.clear()
+        origins, keyboard, message_y = self.geometry(stdscr)
+        rows, cols = stdscr.layout.rows, stdscr.layout.cols
+
+        for board, (y, x) in enumerate(origins):
+            for row in range(self.game.max_guesses):
+                content = self.row_content(board, row, buffer)
+                if y + row >= rows - 1 or x + BOARD_WIDTH >= cols or not self.changed((board, row), content):
+                    continue
+                if content is None:
+                    stdscr.addstr(y + row, x, " " * BOARD_WIDTH)
+                elif content[1] is None:
+                    stdscr.addstr(y + row, x, content[0].upper().ljust(BOARD_WIDTH), utils.Palette.white())
+                else:
+                    word, clue = content
+                    for i, (letter, state) in enumerate(zip(word, clue)):
+                        stdscr.addstr(y + row, x + i, letter.upper(), STATE_COLORS[state]())
+
+        key_width = -(-len(self.game.secrets) // 2)
+        for i, letters in enumerate(KEY_ROWS):
+            y = keyboard.y + 2 * i
+            indent = i * (key_width + 1) // 2
+            for j, letter in enumerate(letters):
+                content = self.key_content(letter)
+                x = keyboard.x + indent + j * (key_width + 1)
+                if y + 1 >= rows - 1 or x + key_width >= cols or not self.changed(letter, content):
+                    continue
+                for b, state in enumerate(content):
+                    ch = " " if state == SOLVED else letter.upper()
+                    stdscr.addstr(y + b // key_width, x + b % key_width, ch, STATE_COLORS.get(state, utils.Palette.white)())
+
+        if message_y < rows and self.changed("message", self.message):
+            stdscr.addstr(message_y, 0, utils.justify(self.message, utils.display_width(self.message), cols - 1)[:cols - 1], utils.Palette.white())
+
+        stdscr.refresh()
+
+    def show_message(self, stdscr, message, buffer=""):
+        self.message = message
+        self.draw(stdscr, buffer)
+
+
+def check_invalid_guess(game, guess):
+    if len(guess) != BOARD_WIDTH:
+        return "Guesses must be five letters"
+    if guess not in valid_guesses():
+        return "Not a valid word!"
+    if guess in game.guesses:
+        return "Already guessed that word!"
+    return ""
+
+
+def result_message(game):
+    if game.is_win:
+        return f"You win! {len(game.guesses)}/{game.max_guesses}"
+    if game.is_lose:
+        return "Out of guesses! Answers: " + " ".join(s.upper() for s in game.secrets)
+    return ""
+
+
+async def multi_wordle_scene(stdscr, name, boards, max_guesses):
+    utils.hide_cursor()
+    date = datetime.datetime.now().strftime("%Y-%m-%d")
+    game = MultiBoard(daily_secrets(date, boards), max_guesses)
+    journal = MoveJournal(name, date)
+    if journal.enabled:
+        # Nothing fetches these puzzles, so their journal is compacted here rather than by the puzzle cache
+        compact_before(name, date, lambda day: {"secrets": daily_secrets(day, boards)})
+    for move in journal.replay():
+        if move["type"] == "guess" and not (game.is_win or game.is_lose):
+            game.guess(move["word"])
+
+    view = MultiBoardView(game)
+    view.message = result_message(game) or f"Welcome to {name.capitalize()}! Solve {boards} words in {max_guesses} guesses."
+    view.draw(stdscr, "", full_update=True)
+
+    input_buffer = ""
+    try:
+        while True:
+            key = await stdscr.read_key()
+            if key == curses.KEY_RESIZE:
+                view.draw(stdscr, input_buffer, full_update=True)
+                continue
+            if game.is_win or game.is_lose:
+                continue
+            if key == curses.KEY_BACKSPACE or key == 127:
+                input_buffer = input_buffer[:-1]
+                view.draw(stdscr, input_buffer)
+            elif key == curses.KEY_ENTER or key in [10, 13]:
+                invalid = check_invalid_guess(game, input_buffer)
+                if invalid:
+                    view.show_message(stdscr, invalid, input_buffer)
+                    continue
+                game.guess(input_buffer)
+                journal.append("guess", word=input_buffer)
+                input_buffer = ""
+                solved = bin(game.solved).count("1")
+                view.show_message(stdscr, result_message(game) or f"{solved}/{boards} solved. {max_guesses - len(game.guesses)} guesses remaining.")
+            elif curses.ascii.isalpha(key) and len(input_buffer) < BOARD_WIDTH:
+                input_buffer += chr(key).lower()
+                view.draw(stdscr, input_buffer)
+    except KeyboardInterrupt:
+        stdscr.clear()
+        stdscr.refresh()
+        return
+    finally:
+        journal.close()
+
+
+async def quordle_scene(stdscr):
+    await multi_wordle_scene(stdscr, "quordle", 4, 9)
+
+
+async def octordle_scene(stdscr):
+    await multi_wordle_scene(stdscr, "octordle", 8, 13)
@@ -3,25 +3,58 @@ import curses
 import curses.ascii
 
 import utils
+import stats
+import config
+from layout import Region
+from compositor import Compositor
+from journal import ArchiveJournal, MoveJournal
+from wordle.engine import GRAY, YELLOW, GREEN, Candidates, hard_mode_violation, score
 from wordle.scrape import load_wordle_data
 
 WORDLE_DIR = os.path.dirname(__file__)    
 KEYBOARD = "q w e r t y u i o p\na s d f g h j k l  \n  z x c v b n m      ".split("\n")
+CLUE_COLORS = {GRAY: utils.Palette.gray, YELLOW: utils.Palette.yellow, GREEN: utils.Palette.green}
+
+
+def regions(layout) -> dict[str, Region]:
+    board = layout.centered(17, 5)
+    return {
+        "board": Region(board.y, board.x, 11, 5),
+        "keyboard": Region(board.y + 12, layout.centered(17, len(KEYBOARD[0])).x, len(KEYBOARD), len(KEYBOARD[0])),
+        "message": Region(board.y + 16, 0, 1, layout.cols),
+    }
 
 
 class WordleGame:
-    def __init__(self, secret, guesses):
-        self.secret = secret.lower()
-        self.guesses = guesses
-        self.count = len(guesses)
+    def __init__(self, secret, guesses, hard_mode=False):
+        self.hard_mode = hard_mode
+        self.load(secret, guesses)
         self.message = "Welcome to Wordle!"
         self.green_letters = set()
         self.yellow_letters = set()
         self.guessed_letters = set()
+        self.screen = None
         # load words
         with open(os.path.join(WORDLE_DIR, "words.txt"), "r") as f:
             self.word_list = [s.strip() for s in f.readlines()]
 
+    def load(self, secret, guesses):
+        self.secret = secret.lower()
+        self.guesses = guesses
+        self.count = len(guesses)
+        self.candidates = Candidates()
+        for guess in guesses:
+            self.candidates.update(guess, score(self.secret, guess))
+
+    def add_guess(self, guess):
+        self.guesses.append(guess)
+        self.count += 1
+        self.candidates.update(guess, score(self.secret, guess))
+
+    def candidates_message(self):
+        remaining = len(self.candidates)
+        return f"{remaining} possible answer{'' if remaining == 1 else 's'} left."
+
     def is_win(self):
         return len(self.guesses) > 0 and self.guesses[-1] == self.secret
 
@@ -37,105 +70,142 @@ class WordleGame:
         
         if guess in self.guesses:
             return "Already guessed that word!"
+
+        if self.hard_mode:
+            return hard_mode_violation([(g, score(self.secret, g)) for g in self.guesses], guess)
         
         return ""
     
     def generate_clue(self, secret: str, guess: str) -> list[tuple[chr, int]]:
-        clue = [(c, utils.Palette.gray()) for c in guess]
-        sl = [c for c in secret]
-        for i in range(0, len(secret)):
-            self.guessed_letters.add(guess[i])
-            if secret[i] == guess[i]:
-                clue[i] = (guess[i], utils.Palette.green())
-                self.green_letters.add(secret[i])
-                sl.pop(sl.index(secret[i]))
-        for i in range(0, len(guess)):
-            if guess[i] in sl and guess[i] != secret[i]:
-                clue[i] = (guess[i], utils.Palette.yellow())
-                sl.pop(sl.index(guess[i]))
-                self.yellow_letters.add(guess[i])
-        
+        clue = []
+        for letter, state in zip(guess, score(secret, guess)):
+            self.guessed_letters.add(letter)
+            if state == GREEN:
+                self.green_letters.add(letter)
+            elif state == YELLOW:
+                self.yellow_letters.add(letter)
+            clue.append((letter, CLUE_COLORS[state]()))
         return clue
     
+    def compositor(self, stdscr) -> Compositor:
+        if self.screen is None or self.screen.stdscr is not stdscr:
+            self.screen = Compositor(stdscr, "wordle", regions)
+        return self.screen
+
     def update_display(self, stdscr, buffer, full_update=False):
-        hbuffer = utils.horizontal_buffer(5, utils.display_cols(stdscr))
-        vbuffer = utils.vertical_buffer(17, utils.display_rows(stdscr))
-        hbuffer_keyboard = utils.horizontal_buffer(len(KEYBOARD[0]), utils.display_cols(stdscr))
+        screen = self.compositor(stdscr)
         
         if full_update:
-            stdscr.clear()
+            screen.clear()
         
         if full_update:
             for i in range(0, self.count):
                 clue = self.generate_clue(self.secret, self.guesses[i])
                 for idx in range(len(clue)):
                     letter, color = clue[idx]
-                    stdscr.addstr(vbuffer+i*2, hbuffer+idx, letter.upper(), color)
+                    screen.addstr("board", i*2, idx, letter.upper(), color)
         
         for i in range(5):
             if i < len(buffer):
-                stdscr.addstr(vbuffer+self.count*2, hbuffer+i, buffer[i].upper(), utils.Palette.white())
+                screen.addstr("board", self.count*2, i, buffer[i].upper(), utils.Palette.white())
             else:
-                stdscr.addstr(vbuffer+self.count*2, hbuffer+i, " ", utils.Palette.white())
-
-        for i in range(len(KEYBOARD)):
-            for j in range(len(KEYBOARD[i])):
-                if KEYBOARD[i][j] in self.green_letters:
-                    color = utils.Palette.green()
-                elif KEYBOARD[i][j] in self.yellow_letters:
-                    color = utils.Palette.yellow()
-                elif KEYBOARD[i][j] in self.guessed_letters:
-                    color = utils.Palette.gray()
-                else:
-                    color = utils.Palette.white()
-                stdscr.addstr(vbuffer+12+i, hbuffer_keyboard+j, KEYBOARD[i][j].upper(), color)
+                screen.addstr("board", self.count*2, i, " ", utils.Palette.white())
+
+        # The keyboard only changes with a guess, which always redraws everything
+        if full_update:
+            for i in range(len(KEYBOARD)):
+                for j in range(len(KEYBOARD[i])):
+                    if KEYBOARD[i][j] in self.green_letters:
+                        color = utils.Palette.green()
+                    elif KEYBOARD[i][j] in self.yellow_letters:
+                        color = utils.Palette.yellow()
+                    elif KEYBOARD[i][j] in self.guessed_letters:
+                        color = utils.Palette.gray()
+                    else:
+                        color = utils.Palette.white()
+                    screen.addstr("keyboard", i, j, KEYBOARD[i][j].upper(), color)
 
         if full_update:
-            stdscr.addstr(vbuffer+16, 0, utils.justify(self.message, len(self.message), utils.display_cols(stdscr)), utils.Palette.white())
+            self.draw_message(screen)
         
-        stdscr.refresh()
+        screen.show()
+
+    def draw_message(self, screen):
+        screen.addstr("message", 0, 0, utils.justify(self.message, len(self.message), utils.display_cols(screen.stdscr)), utils.Palette.white())
+
+    def show_message(self, stdscr, message):
+        self.message = message
+        screen = self.compositor(stdscr)
+        self.draw_message(screen)
+        screen.show()
 
-def wordle_scene(stdscr):
-    curses.curs_set(0)
-    stdscr.nodelay(1)
-    stdscr.timeout(100)
+async def wordle_scene(stdscr, archived=None):
+    utils.hide_cursor()
     stdscr.clear()
 
-    wordle_data = load_wordle_data(stdscr)
+    # Draw the empty board straight away if the answer has to be fetched
+    game = WordleGame("", [], hard_mode=config.get_flag("wordle_hard_mode"))
+    if archived is None:
+        wordle_data = await load_wordle_data(
+            stdscr,
+            layout=lambda: game.update_display(stdscr, "", full_update=True),
+            show=lambda text: game.show_message(stdscr, text),
+        )
+        journal = MoveJournal("wordle", wordle_data["date"])
+    else:
+        wordle_data = archived
+        journal = ArchiveJournal("wordle", archived)
+    guesses = wordle_data["guesses"] + [move["word"] for move in journal.replay() if move["type"] == "guess"]
 
-    game = WordleGame(wordle_data["wordle_answer"], wordle_data["guesses"])
+    game.load(wordle_data["wordle_answer"], guesses)
+    game.message = "Welcome to Wordle!" + (" (hard mode)" if game.hard_mode else "")
+    if game.is_win():
+        game.message = "You win!"
+    elif game.is_lose():
+        game.message = "Out of guesses! Answer was: " + game.secret.upper()
     
     game.update_display(stdscr, "", full_update=True)
 
     input_buffer = ""
     try:
         while True:
-            key = stdscr.getch()
-            if not game.is_win() and not game.is_lose():
+            # Apply every key typed or pasted since the last frame, then draw once
+            redraw = full_update = False
+            for key in await stdscr.read_keys():
+                if key == curses.KEY_RESIZE:
+                    redraw = full_update = True
+                    continue
+                if game.is_win() or game.is_lose():
+                    continue
                 if key == curses.KEY_BACKSPACE or key == 127:
                     input_buffer = input_buffer[:-1]
-                    game.update_display(stdscr, input_buffer, full_update=True)
+                    redraw = full_update = True
                 elif key == curses.KEY_ENTER or key in [10, 13]:
+                    redraw = full_update = True
                     if game.check_invalid_guess(input_buffer):
                         game.message = game.check_invalid_guess(input_buffer)
-                        game.update_display(stdscr, input_buffer, full_update=True)
                     else:
-                        game.guesses.append(input_buffer)
-                        game.count += 1
+                        game.add_guess(input_buffer)
+                        journal.append("guess", word=input_buffer)
                         input_buffer = ""
                         if game.is_win():
                             game.message = "You win!"
-                            game.update_display(stdscr, "", full_update=True)
+                            if journal.records_stats:
+                                stats.record_wordle(journal.date, True, game.count)
                         elif game.is_lose():
                             game.message = "Out of guesses! Answer was: " + game.secret.upper()
-                            game.update_display(stdscr, "", full_update=True)
+                            if journal.records_stats:
+                                stats.record_wordle(journal.date, False, game.count)
                         else:
-                            game.message = f"Incorrect. {6 - game.count} guesses remaining."
-                            game.update_display(stdscr, "", full_update=True)
+                            game.message = f"Incorrect. {6 - game.count} guesses remaining. " + game.candidates_message()
                 elif curses.ascii.isalpha(key) and len(input_buffer) < 5:
                     input_buffer += chr(key).lower()
-                    game.update_display(stdscr, input_buffer, full_update=False)
+                    redraw = True
+            if redraw:
+                game.update_display(stdscr, input_buffer, full_update=full_update)
     except KeyboardInterrupt:
         stdscr.clear()
         stdscr.refresh()
         return
+    finally:
+        journal.close()
@@ -1,56 +1,46 @@
 import os
-import json
 import datetime
 
-from loading_scene import run_loading_animation
+from loading_scene import loading_waiter
+from puzzle_cache import PUZZLE_CACHE
+from providers import PuzzleProvider, get_provider, register_provider
 
 WORDLE_FILENAME = os.path.expanduser("~/.wordgames/wordle.json")
 
-def get_wordle_answer():
-    import bs4
-    import requests
-    month = datetime.datetime.now().strftime("%B").lower()
-    day = str(int(datetime.datetime.now().strftime("%d")))
-    year = datetime.datetime.now().strftime("%Y")
+@register_provider
+class WordleProvider(PuzzleProvider):
+    name = "wordle"
+    base_url = "https://mashable.com"
 
-    url = f"https://mashable.com/article/wordle-today-answer-{month}-{day}-{year}"
+    def path(self, date):
+        month = date.strftime("%B").lower()
+        day = str(int(date.strftime("%d")))
+        year = date.strftime("%Y")
+        return f"/article/wordle-today-answer-{month}-{day}-{year}"
 
-    response = requests.get(url)
+    def parse(self, html, date):
+        import bs4
+        soup = bs4.BeautifulSoup(html, "html.parser")
 
-    soup = bs4.BeautifulSoup(response.text, "html.parser")
+        wordle_answer = soup.find(name="strong", recursive=True).text.strip().replace(".", "").lower()
 
-    wordle_answer = soup.find(name="strong", recursive=True).text.strip().replace(".", "").lower()
+        assert len(wordle_answer) == 5, f"Wordle answer is not 5 letters, got {wordle_answer}"
 
-    assert len(wordle_answer) == 5, f"Wordle answer is not 5 letters, got {wordle_answer}"
+        return wordle_answer
 
-    return wordle_answer
+def get_wordle_answer():
+    return get_provider("wordle").get()
 
-def update_wordle_data(wordle_answer):
-    wordle_data = {
-        "wordle_answer": wordle_answer,
+def fetch_wordle_data():
+    return {
+        "wordle_answer": get_wordle_answer(),
         "date": datetime.datetime.now().strftime("%Y-%m-%d"),
         "guesses": [],
     }
-    
-    if not os.path.exists(os.path.dirname(WORDLE_FILENAME)):
-        os.makedirs(os.path.dirname(WORDLE_FILENAME))
-    
-    if not os.path.exists(WORDLE_FILENAME):
-        with open(WORDLE_FILENAME, "w") as f:
-            json.dump(wordle_data, f)
-    else:
-        with open(WORDLE_FILENAME, "r") as f:
-            data = json.load(f)
-            if data["date"] != wordle_data["date"]:
-                with open(WORDLE_FILENAME, "w") as f:
-                    json.dump(wordle_data, f)
-
-def load_wordle_data(stdscr):
-    stdscr.clear()
-    wordle_answer = run_loading_animation(stdscr, get_wordle_answer, "Fetching Wordle answer...")
-    update_wordle_data(wordle_answer)
-
-    with open(WORDLE_FILENAME, "r") as f:
-        wordle_data = json.load(f)
-
-    return wordle_data
+
+async def load_wordle_data(stdscr, layout=None, show=None):
+    return await PUZZLE_CACHE.get(
+        WORDLE_FILENAME,
+        fetch_wordle_data,
+        loading_waiter(stdscr, "Fetching Wordle answer...", layout, show),
+    )